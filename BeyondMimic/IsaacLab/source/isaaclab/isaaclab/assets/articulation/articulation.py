@@ -184,6 +184,21 @@ class Articulation(AssetBase):
         self._external_torque_b[env_ids] = 0.0
         self._external_wrench_positions_b[env_ids] = 0.0
 
+    def reset_masked(self, env_mask: torch.Tensor):
+        # reset actuators
+        # note: implicit actuators have no state, the others are reset by indices
+        stateful_actuators = [a for a in self.actuators.values() if not isinstance(a, ImplicitActuator)]
+        if len(stateful_actuators) > 0:
+            env_ids = env_mask.nonzero(as_tuple=False).squeeze(-1)
+            if len(env_ids) > 0:
+                for actuator in stateful_actuators:
+                    actuator.reset(env_ids)
+        # reset external wrench
+        mask = env_mask[:, None, None]
+        self._external_force_b.masked_fill_(mask, 0.0)
+        self._external_torque_b.masked_fill_(mask, 0.0)
+        self._external_wrench_positions_b.masked_fill_(mask, 0.0)
+
     def write_data_to_sim(self):
         """Write external wrenches and joint commands to the simulation.
 
@@ -218,6 +218,19 @@ class AssetBase(ABC):
         """
         raise NotImplementedError
 
+    def reset_masked(self, env_mask: torch.Tensor):
+        """Resets all internal buffers of the environments selected by a mask.
+
+        The default implementation calls :meth:`reset` with the indices of the selected environments, which
+        synchronizes with the device. Assets that can reset their buffers with masked writes override it.
+
+        Args:
+            env_mask: The mask of the instances to reset. Shape is (num_instances,).
+        """
+        env_ids = env_mask.nonzero(as_tuple=False).squeeze(-1)
+        if len(env_ids) > 0:
+            self.reset(env_ids)
+
     @abstractmethod
     def write_data_to_sim(self):
         """Writes data to the simulator."""
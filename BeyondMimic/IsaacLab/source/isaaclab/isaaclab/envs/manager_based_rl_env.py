@@ -214,20 +214,11 @@ class ManagerBasedRLEnv(ManagerBasedEnv, gym.Env):
             self.recorder_manager.record_post_step()
 
         # -- reset envs that terminated/timed-out and log the episode information
-        reset_env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        if len(reset_env_ids) > 0:
-            # trigger recorder terms for pre-reset calls
-            self.recorder_manager.record_pre_reset(reset_env_ids)
-
-            self._reset_idx(reset_env_ids)
-
-            # if sensors are added to the scene, make sure we render to reflect changes in reset
-            if self.sim.has_rtx_sensors() and self.cfg.num_rerenders_on_reset > 0:
-                for _ in range(self.cfg.num_rerenders_on_reset):
-                    self.sim.render()
-
-            # trigger recorder terms for post-reset calls
-            self.recorder_manager.record_post_reset(reset_env_ids)
+        if self.cfg.masked_reset:
+            self._reset_masked(self.reset_buf)
+        else:
+            # note: this synchronizes with the device at every step, see ManagerBasedRLEnvCfg.masked_reset
+            self._reset_terminated_idx(self.reset_buf.nonzero(as_tuple=False).squeeze(-1))
 
         # -- update command
         self.command_manager.compute(dt=self.step_dt)
@@ -347,6 +338,71 @@ class ManagerBasedRLEnv(ManagerBasedEnv, gym.Env):
         self.observation_space = gym.vector.utils.batch_space(self.single_observation_space, self.num_envs)
         self.action_space = gym.vector.utils.batch_space(self.single_action_space, self.num_envs)
 
+    def _reset_terminated_idx(self, reset_env_ids: torch.Tensor):
+        """Reset the terminated environments based on their indices, with the recorder calls and renders.
+
+        Args:
+            reset_env_ids: The indices of the environments to reset. Nothing is done if empty.
+        """
+        if len(reset_env_ids) > 0:
+            # trigger recorder terms for pre-reset calls
+            self.recorder_manager.record_pre_reset(reset_env_ids)
+
+            self._reset_idx(reset_env_ids)
+
+            # if sensors are added to the scene, make sure we render to reflect changes in reset
+            if self.sim.has_rtx_sensors() and self.cfg.num_rerenders_on_reset > 0:
+                for _ in range(self.cfg.num_rerenders_on_reset):
+                    self.sim.render()
+
+            # trigger recorder terms for post-reset calls
+            self.recorder_manager.record_post_reset(reset_env_ids)
+
+    def _reset_masked(self, env_mask: torch.Tensor):
+        """Reset the environments selected by a mask without synchronizing with the device.
+
+        This is called at every step if :attr:`ManagerBasedRLEnvCfg.masked_reset` is True. The scene and the managers
+        are reset with their masked implementations. The recorder terms, the reset events, the curriculum terms and
+        the renders of RTX sensors require the indices of the environments. If any of them is configured, the
+        indices are gathered and the environments are reset as in the default mode.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+        """
+        if (
+            len(self.recorder_manager.active_terms) > 0
+            or "reset" in self.event_manager.available_modes
+            or len(self.curriculum_manager.active_terms) > 0
+            or (self.sim.has_rtx_sensors() and self.cfg.num_rerenders_on_reset > 0)
+        ):
+            self._reset_terminated_idx(env_mask.nonzero(as_tuple=False).squeeze(-1))
+            return
+
+        # reset the internal buffers of the scene elements
+        self.scene.reset_masked(env_mask)
+
+        # iterate over all managers and reset them, in the same order as in _reset_idx
+        log = dict()
+        log.update(self.observation_manager.reset_masked(env_mask))
+        log.update(self.action_manager.reset_masked(env_mask))
+        log.update(self.reward_manager.reset_masked(env_mask))
+        log.update(self.curriculum_manager.reset_masked(env_mask))
+        log.update(self.command_manager.reset_masked(env_mask))
+        log.update(self.event_manager.reset_masked(env_mask))
+        log.update(self.termination_manager.reset_masked(env_mask))
+        log.update(self.recorder_manager.reset_masked(env_mask))
+        # keep the logged values of the last reset if no environment is reset, as in the default mode
+        # note: before the first reset, the values are the means over no environment, i.e. zero
+        previous_log = self.extras.get("log", dict())
+        any_reset = env_mask.any()
+        for key, value in log.items():
+            if isinstance(value, torch.Tensor) and isinstance(previous_log.get(key), torch.Tensor):
+                log[key] = torch.where(any_reset, value, previous_log[key])
+        self.extras["log"] = log
+
+        # reset the episode length buffer
+        self.episode_length_buf.masked_fill_(env_mask, 0)
+
     def _reset_idx(self, env_ids: Sequence[int]):
         """Reset environments based on specified indices.
 
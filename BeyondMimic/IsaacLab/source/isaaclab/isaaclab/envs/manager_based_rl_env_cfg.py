@@ -54,6 +54,18 @@ class ManagerBasedRLEnvCfg(ManagerBasedEnvCfg):
     then the episode length in steps is 100.
     """
 
+    masked_reset: bool = False
+    """Whether to reset the terminated environments with masked writes instead of indexed ones. Defaults to False.
+
+    By default, :meth:`ManagerBasedRLEnv.step` gathers the indices of the environments to reset, which synchronizes
+    with the device at every step. If True, the managers and the scene are reset with the boolean reset mask at every
+    step instead: the new values are computed for all environments and merged with :func:`torch.where`. Managers,
+    terms and scene entities that do not support masked resets fall back to indices, which synchronizes again.
+
+    The masked writes are done at every step, also if no environment terminated. This trades the synchronization
+    for the cost of writing all environments, which pays off with many environments or when capturing the step.
+    """
+
     # environment settings
     rewards: object = MISSING
     """Reward settings.
@@ -179,6 +179,9 @@ class JointAction(ActionTerm):
     def reset(self, env_ids: Sequence[int] | None = None) -> None:
         self._raw_actions[env_ids] = 0.0
 
+    def reset_masked(self, env_mask: torch.Tensor) -> None:
+        self._raw_actions.masked_fill_(env_mask.unsqueeze(1), 0.0)
+
 
 class JointPositionAction(JointAction):
     """Joint action term that applies the processed actions to the articulation's joints as position commands."""
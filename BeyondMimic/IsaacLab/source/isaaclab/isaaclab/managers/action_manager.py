@@ -368,6 +368,24 @@ class ActionManager(ManagerBase):
         # nothing to log here
         return {}
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, torch.Tensor]:
+        """Resets the action history of the environments selected by a mask.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+
+        Returns:
+            An empty dictionary.
+        """
+        # reset the action history
+        self._prev_action.masked_fill_(env_mask.unsqueeze(1), 0.0)
+        self._action.masked_fill_(env_mask.unsqueeze(1), 0.0)
+        # reset all action terms
+        for term in self._terms.values():
+            term.reset_masked(env_mask)
+        # nothing to log here
+        return {}
+
     def process_action(self, action: torch.Tensor):
         """Processes the actions sent to the environment.
 
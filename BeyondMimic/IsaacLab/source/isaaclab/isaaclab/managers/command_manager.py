@@ -53,6 +53,8 @@ class CommandTerm(ManagerTermBase):
         self.time_left = torch.zeros(self.num_envs, device=self.device)
         # -- counter for the number of times the command has been resampled within the current episode
         self.command_counter = torch.zeros(self.num_envs, device=self.device, dtype=torch.long)
+        # -- lower bound of the time left of all envs, kept on the host to skip the resampling check
+        self._time_left_bound = 0.0
 
         # add handle for debug visualization (this is set to a valid handle inside set_debug_vis)
         self._debug_vis_handle = None
@@ -117,7 +119,7 @@ class CommandTerm(ManagerTermBase):
         # return success
         return True
 
-    def reset(self, env_ids: Sequence[int] | None = None) -> dict[str, float]:
+    def reset(self, env_ids: Sequence[int] | None = None) -> dict[str, torch.Tensor]:
         """Reset the command generator and log metrics.
 
         This function resets the command counter and resamples the command. It should be called
@@ -137,7 +139,8 @@ class CommandTerm(ManagerTermBase):
         extras = {}
         for metric_name, metric_value in self.metrics.items():
             # compute the mean metric value
-            extras[metric_name] = torch.mean(metric_value[env_ids]).item()
+            # note: kept on the device to not synchronize at every reset
+            extras[metric_name] = torch.mean(metric_value[env_ids])
             # reset the metric value
             metric_value[env_ids] = 0.0
 
@@ -148,6 +151,34 @@ class CommandTerm(ManagerTermBase):
 
         return extras
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, torch.Tensor]:
+        """Reset the command generator for the environments selected by a mask and log metrics.
+
+        Same as :meth:`reset`, but the metrics, the counter and the time left are updated with masked operations.
+        The command is resampled with :meth:`_resample_command_masked`.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+
+        Returns:
+            A dictionary containing the information to log under the "{name}" key.
+        """
+        # add logging metrics
+        extras = {}
+        num_resets = env_mask.sum().clamp(min=1)
+        for metric_name, metric_value in self.metrics.items():
+            # compute the mean metric value over the selected envs
+            extras[metric_name] = (metric_value * env_mask).sum() / num_resets
+            # reset the metric value
+            metric_value.masked_fill_(env_mask, 0.0)
+
+        # set the command counter to zero
+        self.command_counter.masked_fill_(env_mask, 0)
+        # resample the command
+        self._resample_masked(env_mask)
+
+        return extras
+
     def compute(self, dt: float):
         """Compute the command.
 
@@ -158,10 +189,14 @@ class CommandTerm(ManagerTermBase):
         self._update_metrics()
         # reduce the time left before resampling
         self.time_left -= dt
+        self._time_left_bound -= dt
         # resample the command if necessary
-        resample_env_ids = (self.time_left <= 0.0).nonzero().flatten()
-        if len(resample_env_ids) > 0:
-            self._resample(resample_env_ids)
+        # note: the check synchronizes with the device, so it is skipped while no env can be due
+        if self._time_left_bound <= 0.0:
+            resample_env_ids = (self.time_left <= 0.0).nonzero().flatten()
+            if len(resample_env_ids) > 0:
+                self._resample(resample_env_ids)
+            self._time_left_bound = self.time_left.min().item()
         # update the command
         self._update_command()
 
@@ -181,11 +216,28 @@ class CommandTerm(ManagerTermBase):
         if len(env_ids) != 0:
             # resample the time left before resampling
             self.time_left[env_ids] = self.time_left[env_ids].uniform_(*self.cfg.resampling_time_range)
+            self._time_left_bound = min(self._time_left_bound, self.cfg.resampling_time_range[0])
             # resample the command
             self._resample_command(env_ids)
             # increment the command counter
             self.command_counter[env_ids] += 1
 
+    def _resample_masked(self, env_mask: torch.Tensor):
+        """Resample the command and time for the environments selected by a mask.
+
+        Args:
+            env_mask: The mask of the environments to resample. Shape is (num_envs,).
+        """
+        # resample the time left before resampling
+        # note: the host-side bound is lowered without checking whether any env is selected
+        time_left = torch.empty_like(self.time_left).uniform_(*self.cfg.resampling_time_range)
+        torch.where(env_mask, time_left, self.time_left, out=self.time_left)
+        self._time_left_bound = min(self._time_left_bound, self.cfg.resampling_time_range[0])
+        # resample the command
+        self._resample_command_masked(env_mask)
+        # increment the command counter
+        self.command_counter += env_mask
+
     """
     Implementation specific functions.
     """
@@ -200,6 +252,16 @@ class CommandTerm(ManagerTermBase):
         """Resample the command for the specified environments."""
         raise NotImplementedError
 
+    def _resample_command_masked(self, env_mask: torch.Tensor):
+        """Resample the command for the environments selected by a mask.
+
+        The default implementation calls :meth:`_resample_command` with the indices of the selected environments,
+        which synchronizes with the device. Terms should override it to resample without synchronization.
+        """
+        env_ids = env_mask.nonzero(as_tuple=False).squeeze(-1)
+        if len(env_ids) > 0:
+            self._resample_command(env_ids)
+
     @abstractmethod
     def _update_command(self):
         """Update the command based on the current state."""
@@ -357,6 +419,24 @@ class CommandManager(ManagerBase):
         # return logged information
         return extras
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, torch.Tensor]:
+        """Reset the command terms for the environments selected by a mask and log their metrics.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+
+        Returns:
+            A dictionary containing the information to log under the "Metrics/{term_name}/{metric_name}" key.
+        """
+        extras = {}
+        for name, term in self._terms.items():
+            # reset the command term
+            metrics = term.reset_masked(env_mask)
+            for metric_name, metric_value in metrics.items():
+                extras[f"Metrics/{name}/{metric_name}"] = metric_value
+        # return logged information
+        return extras
+
     def compute(self, dt: float):
         """Updates the commands.
 
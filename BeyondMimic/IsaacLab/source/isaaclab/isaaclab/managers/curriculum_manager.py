@@ -121,6 +121,12 @@ class CurriculumManager(ManagerBase):
         # return logged information
         return extras
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, float]:
+        # nothing to log or reset without terms
+        if len(self._term_names) == 0:
+            return {}
+        return super().reset_masked(env_mask)
+
     def compute(self, env_ids: Sequence[int] | None = None):
         """Update the curriculum terms.
 
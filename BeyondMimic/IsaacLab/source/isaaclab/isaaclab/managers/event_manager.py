@@ -149,6 +149,23 @@ class EventManager(ManagerBase):
         # nothing to log here
         return {}
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, float]:
+        # call all terms that are classes
+        for mode_cfg in self._mode_class_term_cfgs.values():
+            for term_cfg in mode_cfg:
+                term_cfg.func.reset_masked(env_mask)
+        # reset the time left of the interval based events, see reset
+        if "interval" in self._mode_term_cfgs:
+            for index, term_cfg in enumerate(self._mode_term_cfgs["interval"]):
+                if not term_cfg.is_global_time:
+                    lower, upper = term_cfg.interval_range_s
+                    time_left = self._interval_term_time_left[index]
+                    sampled_interval = torch.rand_like(time_left) * (upper - lower) + lower
+                    torch.where(env_mask, sampled_interval, time_left, out=time_left)
+
+        # nothing to log here
+        return {}
+
     def apply(
         self,
         mode: str,
@@ -22,6 +22,8 @@ from .manager_term_cfg import ManagerTermBaseCfg
 from .scene_entity_cfg import SceneEntityCfg
 
 if TYPE_CHECKING:
+    import torch
+
     from isaaclab.envs import ManagerBasedEnv
 
 # import logger
@@ -100,6 +102,22 @@ class ManagerTermBase(ABC):
         """
         pass
 
+    def reset_masked(self, env_mask: torch.Tensor) -> None:
+        """Resets the manager term for the environments selected by a mask.
+
+        The default implementation calls :meth:`reset` with the indices of the selected environments, which
+        synchronizes with the device. It is skipped if the term does not override :meth:`reset`. Terms that can
+        reset their buffers with masked writes should override this method.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+        """
+        if type(self).reset is ManagerTermBase.reset:
+            return
+        env_ids = env_mask.nonzero(as_tuple=False).squeeze(-1)
+        if len(env_ids) > 0:
+            self.reset(env_ids=env_ids)
+
     def serialize(self) -> dict:
         """General serialization call. Includes the configuration dict."""
         return {"cfg": class_to_dict(self.cfg)}
@@ -217,6 +235,26 @@ class ManagerBase(ABC):
         """
         return {}
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, float | torch.Tensor]:
+        """Resets the manager for the environments selected by a mask and returns logging information.
+
+        This is used by the environments that reset without synchronizing with the device, see
+        :attr:`~isaaclab.envs.ManagerBasedRLEnvCfg.masked_reset`. The default implementation calls :meth:`reset`
+        with the indices of the selected environments, which synchronizes with the device. Managers that can reset
+        their buffers with masked writes should override this method.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+
+        Returns:
+            Dictionary containing the logging information. Masked implementations return it even if no
+            environment is selected, in which case the environment discards it.
+        """
+        env_ids = env_mask.nonzero(as_tuple=False).squeeze(-1)
+        if len(env_ids) == 0:
+            return {}
+        return self.reset(env_ids)
+
     def find_terms(self, name_keys: str | Sequence[str]) -> list[str]:
         """Find terms in the manager based on the names.
 
@@ -240,6 +240,23 @@ class ObservationGroupCfg:
     ObservationGroupCfg.history_length is set.
     """
 
+    preallocate_output: bool = False
+    """Whether to write the observation terms into a preallocated output tensor of the group. Defaults to False.
+
+    If true, the group owns a (num_envs, group_dim) tensor in which every term has a fixed slice of columns. Each term,
+    including the ordered history of terms with history, is copied directly into its slice instead of being
+    concatenated into a new tensor at every call.
+
+    .. warning::
+        Every call returns the same tensor object and overwrites its values. Callers must ``.clone()`` the result
+        before keeping it across steps. Otherwise the kept observation silently changes with the next step, e.g. for
+        the rollout storage of a learning agent that keeps the observation of the previous step while stepping the
+        environment. This is why the option is disabled by default.
+
+    This requires :attr:`concatenate_terms` to be True and every term to be one-dimensional per environment,
+    i.e. terms with history must flatten their history dimension.
+    """
+
 
 ##
 # Event manager
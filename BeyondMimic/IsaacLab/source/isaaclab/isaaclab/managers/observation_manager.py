@@ -110,6 +110,15 @@ class ObservationManager(ManagerBase):
             else:
                 self._group_obs_dim[group_name] = group_term_dims
 
+        # allocate the output tensors of the groups that write their terms in place
+        self._group_obs_output: dict[str, torch.Tensor] = dict()
+        self._group_obs_term_slices: dict[str, list[slice]] = dict()
+        self._group_obs_term_fused: dict[str, list[bool]] = dict()
+        self._group_obs_fused_params: dict[str, dict[str, torch.Tensor]] = dict()
+        for group_name, preallocate in self._group_obs_preallocate.items():
+            if preallocate:
+                self._prepare_group_output(group_name)
+
         # Stores the latest observations.
         self._obs_buffer: dict[str, torch.Tensor | dict[str, torch.Tensor]] | None = None
 
@@ -309,6 +318,19 @@ class ObservationManager(ManagerBase):
         # nothing to log here
         return {}
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, float]:
+        # the history buffers and the modifiers are reset by indices
+        has_history = any(len(buffers) > 0 for buffers in self._group_obs_term_history_buffer.values())
+        if has_history or len(self._group_obs_class_instances) > 0:
+            return super().reset_masked(env_mask)
+        # call all terms that are classes
+        for group_cfg in self._group_obs_class_term_cfgs.values():
+            for term_cfg in group_cfg:
+                term_cfg.func.reset_masked(env_mask)
+
+        # nothing to log here
+        return {}
+
     def compute(self, update_history: bool = False) -> dict[str, torch.Tensor | dict[str, torch.Tensor]]:
         """Compute the observations per group for all groups.
 
@@ -377,6 +399,9 @@ class ObservationManager(ManagerBase):
                 f"Unable to find the group '{group_name}' in the observation manager."
                 f" Available groups are: {list(self._group_obs_term_names.keys())}"
             )
+        # groups with a preallocated output write their terms in place
+        if group_name in self._group_obs_output:
+            return self._compute_group_in_place(group_name, update_history)
         # iterate over all the terms in each group
         group_term_names = self._group_obs_term_names[group_name]
         # buffer to store obs per group
@@ -386,39 +411,15 @@ class ObservationManager(ManagerBase):
 
         # evaluate terms: compute, add noise, clip, scale, custom modifiers
         for term_name, term_cfg in obs_terms:
-            # compute term's value
-            obs: torch.Tensor = term_cfg.func(self._env, **term_cfg.params).clone()
-            # apply post-processing
-            if term_cfg.modifiers is not None:
-                for modifier in term_cfg.modifiers:
-                    obs = modifier.func(obs, **modifier.params)
-            if isinstance(term_cfg.noise, noise.NoiseCfg):
-                obs = term_cfg.noise.func(obs, term_cfg.noise)
-            elif isinstance(term_cfg.noise, noise.NoiseModelCfg) and term_cfg.noise.func is not None:
-                obs = term_cfg.noise.func(obs)
-            if term_cfg.clip:
-                obs = obs.clip_(min=term_cfg.clip[0], max=term_cfg.clip[1])
-            if term_cfg.scale is not None:
-                obs = obs.mul_(term_cfg.scale)
+            # compute term's value and apply post-processing
+            obs = self._process_term(term_cfg, term_cfg.func(self._env, **term_cfg.params).clone())
             # Update the history buffer if observation term has history enabled
             if term_cfg.history_length > 0:
-                circular_buffer = self._group_obs_term_history_buffer[group_name][term_name]
-                if update_history:
-                    circular_buffer.append(obs)
-                elif circular_buffer._buffer is None:
-                    # because circular buffer only exits after the simulation steps,
-                    # this guards history buffer from corruption by external calls before simulation start
-                    circular_buffer = CircularBuffer(
-                        max_len=circular_buffer.max_length,
-                        batch_size=circular_buffer.batch_size,
-                        device=circular_buffer.device,
-                    )
-                    circular_buffer.append(obs)
-
-                if term_cfg.flatten_history_dim:
-                    group_obs[term_name] = circular_buffer.buffer.reshape(self._env.num_envs, -1)
-                else:
-                    group_obs[term_name] = circular_buffer.buffer
+                term_history = self._get_term_history(group_name, term_name, term_cfg, obs, update_history)
+                # terms that are not concatenated are returned as is, so they must not change with the buffer
+                if not self._group_obs_concatenate[group_name]:
+                    term_history = term_history.clone()
+                group_obs[term_name] = term_history
             else:
                 group_obs[term_name] = obs
 
@@ -466,6 +467,7 @@ class ObservationManager(ManagerBase):
         self._group_obs_class_term_cfgs: dict[str, list[ObservationTermCfg]] = dict()
         self._group_obs_concatenate: dict[str, bool] = dict()
         self._group_obs_concatenate_dim: dict[str, int] = dict()
+        self._group_obs_preallocate: dict[str, bool] = dict()
 
         self._group_obs_term_history_buffer: dict[str, dict] = dict()
         # create a list to store classes instances, e.g., for modifiers and noise models
@@ -504,6 +506,7 @@ class ObservationManager(ManagerBase):
             group_entry_history_buffer: dict[str, CircularBuffer] = dict()
             # read common config for the group
             self._group_obs_concatenate[group_name] = group_cfg.concatenate_terms
+            self._group_obs_preallocate[group_name] = group_cfg.preallocate_output
             self._group_obs_concatenate_dim[group_name] = (
                 group_cfg.concatenate_dim + 1 if group_cfg.concatenate_dim >= 0 else group_cfg.concatenate_dim
             )
@@ -521,6 +524,7 @@ class ObservationManager(ManagerBase):
                     "history_length",
                     "flatten_history_dim",
                     "concatenate_dim",
+                    "preallocate_output",
                 ]:
                     continue
                 # check for non config
@@ -645,3 +649,164 @@ class ObservationManager(ManagerBase):
                     term_cfg.func.reset()
             # add history buffers for each group
             self._group_obs_term_history_buffer[group_name] = group_entry_history_buffer
+
+    def _process_term(self, term_cfg: ObservationTermCfg, obs: torch.Tensor) -> torch.Tensor:
+        """Applies the modifiers, noise, clipping and scaling of a term to its computed value."""
+        if term_cfg.modifiers is not None:
+            for modifier in term_cfg.modifiers:
+                obs = modifier.func(obs, **modifier.params)
+        if isinstance(term_cfg.noise, noise.NoiseCfg):
+            obs = term_cfg.noise.func(obs, term_cfg.noise)
+        elif isinstance(term_cfg.noise, noise.NoiseModelCfg) and term_cfg.noise.func is not None:
+            obs = term_cfg.noise.func(obs)
+        if term_cfg.clip:
+            obs = obs.clip_(min=term_cfg.clip[0], max=term_cfg.clip[1])
+        if term_cfg.scale is not None:
+            obs = obs.mul_(term_cfg.scale)
+        return obs
+
+    def _get_term_history(
+        self, group_name: str, term_name: str, term_cfg: ObservationTermCfg, obs: torch.Tensor, update_history: bool
+    ) -> torch.Tensor:
+        """Returns the ordered history of a term, with the processed value appended if requested.
+
+        The returned tensor is a view of the history buffer.
+        """
+        circular_buffer = self._group_obs_term_history_buffer[group_name][term_name]
+        if update_history:
+            circular_buffer.append(obs)
+        elif circular_buffer._buffer is None:
+            # because circular buffer only exits after the simulation steps,
+            # this guards history buffer from corruption by external calls before simulation start
+            circular_buffer = CircularBuffer(
+                max_len=circular_buffer.max_length,
+                batch_size=circular_buffer.batch_size,
+                device=circular_buffer.device,
+            )
+            circular_buffer.append(obs)
+
+        # note: the ordered history is a view of the buffer and flattening it does not copy
+        if term_cfg.flatten_history_dim:
+            return circular_buffer.buffer.reshape(self._env.num_envs, -1)
+        return circular_buffer.buffer
+
+    def _prepare_group_output(self, group_name: str):
+        """Allocates the output tensor of a group that writes its terms in place.
+
+        Every term gets a fixed slice of columns. The terms without history and modifiers, and whose noise is
+        additive constant, uniform or gaussian noise, are fused: their raw values are written into their columns and
+        the noise, clipping and scaling of all of them are applied in one pass over the output, with per-column
+        offset, noise range, clipping bounds and scale. The other terms are processed one by one as usual and
+        get identity parameters in the fused pass.
+
+        Note:
+            The noise, clipping and scaling parameters of the fused terms are read once here.
+        """
+        group_term_dims = self._group_obs_term_dim[group_name]
+        if not self._group_obs_concatenate[group_name] or any(len(dims) != 1 for dims in group_term_dims):
+            raise ValueError(
+                f"Unable to preallocate the output of observation group '{group_name}'. It requires the terms to"
+                f" be concatenated and one-dimensional, but the shapes of the terms are: {group_term_dims}."
+            )
+        slices = []
+        start = 0
+        for dims in group_term_dims:
+            slices.append(slice(start, start + int(dims[0])))
+            start += int(dims[0])
+        self._group_obs_term_slices[group_name] = slices
+        self._group_obs_output[group_name] = torch.zeros(self._env.num_envs, start, device=self._env.device)
+
+        # per-column parameters of the fused pass, set to the identity by default
+        params = {
+            "offset": torch.zeros(start, device=self._env.device),
+            "gaussian_std": torch.zeros(start, device=self._env.device),
+            "uniform_range": torch.zeros(start, device=self._env.device),
+            "clip_min": torch.full((start,), -torch.inf, device=self._env.device),
+            "clip_max": torch.full((start,), torch.inf, device=self._env.device),
+            "scale": torch.ones(start, device=self._env.device),
+        }
+        used = set()
+        term_fused = []
+        for term_cfg, term_slice in zip(self._group_obs_term_cfgs[group_name], slices):
+            fused = self._is_fusable_term(term_cfg)
+            term_fused.append(fused)
+            if not fused:
+                continue
+            term_noise = term_cfg.noise
+            if isinstance(term_noise, noise.ConstantNoiseCfg):
+                params["offset"][term_slice] = term_noise.bias
+                used.add("offset")
+            elif isinstance(term_noise, noise.UniformNoiseCfg):
+                params["offset"][term_slice] = term_noise.n_min
+                params["uniform_range"][term_slice] = term_noise.n_max - term_noise.n_min
+                used.update(["offset", "uniform_range"])
+            elif isinstance(term_noise, noise.GaussianNoiseCfg):
+                params["offset"][term_slice] = term_noise.mean
+                params["gaussian_std"][term_slice] = term_noise.std
+                used.update(["offset", "gaussian_std"])
+            if term_cfg.clip:
+                params["clip_min"][term_slice] = term_cfg.clip[0]
+                params["clip_max"][term_slice] = term_cfg.clip[1]
+                used.update(["clip_min", "clip_max"])
+            if term_cfg.scale is not None:
+                params["scale"][term_slice] = term_cfg.scale
+                used.add("scale")
+        self._group_obs_term_fused[group_name] = term_fused
+        # only keep the parameters that are not the identity for all columns
+        self._group_obs_fused_params[group_name] = {name: value for name, value in params.items() if name in used}
+
+    def _is_fusable_term(self, term_cfg: ObservationTermCfg) -> bool:
+        """Whether the noise, clipping and scaling of a term can be applied in the fused pass of its group."""
+        if term_cfg.history_length > 0 or term_cfg.modifiers is not None:
+            return False
+        if term_cfg.noise is None:
+            return True
+        # only the additive noise functions of the noise module, with parameters that are the same for all envs
+        default_funcs = {
+            noise.ConstantNoiseCfg: noise.constant_noise,
+            noise.UniformNoiseCfg: noise.uniform_noise,
+            noise.GaussianNoiseCfg: noise.gaussian_noise,
+        }
+        if default_funcs.get(type(term_cfg.noise)) is not term_cfg.noise.func or term_cfg.noise.operation != "add":
+            return False
+        return all(
+            not isinstance(value, torch.Tensor) or value.dim() <= 1 for value in term_cfg.noise.__dict__.values()
+        )
+
+    def _compute_group_in_place(self, group_name: str, update_history: bool) -> torch.Tensor:
+        """Computes the observations of a group with a preallocated output.
+
+        The terms are written into their slices of the output tensor of the group, and the noise, clipping and
+        scaling of the fused terms are applied in a single pass over the output. See :meth:`_prepare_group_output`.
+        """
+        group_output = self._group_obs_output[group_name]
+        group_terms = zip(
+            self._group_obs_term_names[group_name],
+            self._group_obs_term_cfgs[group_name],
+            self._group_obs_term_slices[group_name],
+            self._group_obs_term_fused[group_name],
+        )
+        for term_name, term_cfg, term_slice, fused in group_terms:
+            obs = term_cfg.func(self._env, **term_cfg.params)
+            if fused:
+                # the copy into the output replaces the clone of the term
+                group_output[:, term_slice] = obs
+                continue
+            obs = self._process_term(term_cfg, obs.clone())
+            if term_cfg.history_length > 0:
+                obs = self._get_term_history(group_name, term_name, term_cfg, obs, update_history)
+            group_output[:, term_slice] = obs
+
+        # noise, clip and scale of the fused terms in one pass
+        params = self._group_obs_fused_params[group_name]
+        if "offset" in params:
+            group_output.add_(params["offset"])
+        if "gaussian_std" in params:
+            group_output.addcmul_(torch.randn_like(group_output), params["gaussian_std"])
+        if "uniform_range" in params:
+            group_output.addcmul_(torch.rand_like(group_output), params["uniform_range"])
+        if "clip_min" in params:
+            torch.clamp(group_output, min=params["clip_min"], max=params["clip_max"], out=group_output)
+        if "scale" in params:
+            group_output.mul_(params["scale"])
+        return group_output
@@ -14,7 +14,7 @@ from prettytable import PrettyTable
 from typing import TYPE_CHECKING
 
 from isaaclab.utils import configclass
-from isaaclab.utils.datasets import EpisodeData, HDF5DatasetFileHandler
+from isaaclab.utils.datasets import EpisodeBuffer, EpisodeData, HDF5DatasetFileHandler
 
 from .manager_base import ManagerBase, ManagerTermBase
 from .manager_term_cfg import RecorderTermCfg
@@ -50,6 +50,33 @@ class RecorderManagerBaseCfg:
     export_in_record_pre_reset: bool = True
     """Whether to export episodes in the record_pre_reset call."""
 
+    episode_buffer_length: int = 0
+    """The initial number of steps of the preallocated episode buffers. Defaults to 0, in which case the episodes are
+    recorded as lists of tensors per environment in :class:`EpisodeData`.
+
+    If positive, the episodes of all environments are recorded into an :class:`EpisodeBuffer` on the device of the
+    recorded values, which doubles its length when an episode exceeds it. The episodes are exported from views into
+    the buffers and :meth:`RecorderManager.get_episode` returns a copy of the ongoing episode, so modifications of
+    the returned episode are not exported.
+    """
+
+    async_export: bool = False
+    """Whether the dataset file handlers write the exported episodes in a background thread. Defaults to False.
+
+    This is only supported by :class:`HDF5DatasetFileHandler` and its subclasses.
+    """
+
+    dataset_compression: str = "gzip"
+    """The compression codec of the exported datasets. Defaults to "gzip".
+
+    This is only supported by :class:`HDF5DatasetFileHandler` and its subclasses. Please refer to
+    :attr:`HDF5DatasetFileHandler.COMPRESSIONS` for the supported codecs.
+    """
+
+    dataset_compression_level: int | None = None
+    """The gzip compression level of the exported datasets. Defaults to None, in which case the default level is
+    used."""
+
 
 class RecorderTerm(ManagerTermBase):
     """Base class for recorder terms.
@@ -163,19 +190,23 @@ class RecorderManager(ManagerBase):
         self._episodes: dict[int, EpisodeData] = dict()
         for env_id in range(env.num_envs):
             self._episodes[env_id] = EpisodeData()
+        # create the preallocated buffers of the episode data, the episodes above then only hold the metadata
+        self._episode_buffer = None
+        if cfg.episode_buffer_length > 0:
+            self._episode_buffer = EpisodeBuffer(env.num_envs, cfg.episode_buffer_length, env.device)
 
         env_name = getattr(env.cfg, "env_name", None)
 
         self._dataset_file_handler = None
         if cfg.dataset_export_mode != DatasetExportMode.EXPORT_NONE:
-            self._dataset_file_handler = cfg.dataset_file_handler_class_type()
+            self._dataset_file_handler = self._create_dataset_file_handler()
             self._dataset_file_handler.create(
                 os.path.join(cfg.dataset_export_dir_path, cfg.dataset_filename), env_name=env_name
             )
 
         self._failed_episode_dataset_file_handler = None
         if cfg.dataset_export_mode == DatasetExportMode.EXPORT_SUCCEEDED_FAILED_IN_SEPARATE_FILES:
-            self._failed_episode_dataset_file_handler = cfg.dataset_file_handler_class_type()
+            self._failed_episode_dataset_file_handler = self._create_dataset_file_handler()
             self._failed_episode_dataset_file_handler.create(
                 os.path.join(cfg.dataset_export_dir_path, f"{cfg.dataset_filename}_failed"), env_name=env_name
             )
@@ -282,20 +313,35 @@ class RecorderManager(ManagerBase):
 
         for env_id in env_ids:
             self._episodes[env_id] = EpisodeData()
+        if self._episode_buffer is not None:
+            self._episode_buffer.reset(env_ids)
 
         # nothing to log here
         return {}
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, torch.Tensor]:
+        # Do nothing if no active recorder terms are provided
+        if len(self.active_terms) == 0:
+            return {}
+        return super().reset_masked(env_mask)
+
     def get_episode(self, env_id: int) -> EpisodeData:
         """Returns the episode data for the given environment id.
 
+        If :attr:`RecorderManagerBaseCfg.episode_buffer_length` is positive, this is a copy of the recorded data.
+
         Args:
             env_id: The environment id.
 
         Returns:
             The episode data for the given environment id.
         """
-        return self._episodes.get(env_id, EpisodeData())
+        if self._episode_buffer is None or env_id not in self._episodes:
+            return self._episodes.get(env_id, EpisodeData())
+        episode = self._episode_buffer.get_episode(env_id)
+        episode.seed = self._episodes[env_id].seed
+        episode.success = self._episodes[env_id].success
+        return episode
 
     def add_to_episodes(self, key: str, value: torch.Tensor | dict, env_ids: Sequence[int] | None = None):
         """Adds the given key-value pair to the episodes for the given environment ids.
@@ -320,6 +366,11 @@ class RecorderManager(ManagerBase):
         if isinstance(env_ids, torch.Tensor):
             env_ids = env_ids.tolist()
 
+        # write the values of all environments at once
+        if self._episode_buffer is not None:
+            self._episode_buffer.add(key, value, env_ids)
+            return
+
         if isinstance(value, dict):
             for sub_key, sub_value in value.items():
                 self.add_to_episodes(f"{key}/{sub_key}", sub_value, env_ids)
@@ -348,8 +399,9 @@ class RecorderManager(ManagerBase):
         if isinstance(env_ids, torch.Tensor):
             env_ids = env_ids.tolist()
 
-        for value_index, env_id in enumerate(env_ids):
-            self._episodes[env_id].success = success_values[value_index].item()
+        # transfer all values to the host at once
+        for env_id, success in zip(env_ids, success_values.flatten().tolist()):
+            self._episodes[env_id].success = success
 
     def record_pre_step(self) -> None:
         """Trigger recorder terms for pre-step functions."""
@@ -476,7 +528,7 @@ class RecorderManager(ManagerBase):
         # Export episode data through dataset exporter
         need_to_flush = False
 
-        if any(env_id in self._episodes and not self._episodes[env_id].is_empty() for env_id in env_ids):
+        if any(not self._is_episode_empty(env_id) for env_id in env_ids):
             ep_meta = self.get_ep_meta()
             if self._dataset_file_handler is not None:
                 self._dataset_file_handler.add_env_args(ep_meta)
@@ -484,7 +536,10 @@ class RecorderManager(ManagerBase):
                 self._failed_episode_dataset_file_handler.add_env_args(ep_meta)
 
         for i, env_id in enumerate(env_ids):
-            if env_id in self._episodes and not self._episodes[env_id].is_empty():
+            if not self._is_episode_empty(env_id):
+                if self._episode_buffer is not None:
+                    # export views into the buffers, the handlers copy them before the buffers are overwritten
+                    self._episodes[env_id].data = self._episode_buffer.get_data(env_id)
                 self._episodes[env_id].pre_export()
 
                 episode_succeeded = self._episodes[env_id].success
@@ -512,6 +567,8 @@ class RecorderManager(ManagerBase):
                     self._exported_failed_episode_count[env_id] = self._exported_failed_episode_count.get(env_id, 0) + 1
             # Reset the episode buffer for the given environment after export
             self._episodes[env_id] = EpisodeData()
+        if self._episode_buffer is not None:
+            self._episode_buffer.reset(env_ids)
 
         if need_to_flush:
             if self._dataset_file_handler is not None:
@@ -523,6 +580,27 @@ class RecorderManager(ManagerBase):
     Helper functions.
     """
 
+    def _create_dataset_file_handler(self):
+        """Creates a dataset file handler of the configured type."""
+        handler_class = self.cfg.dataset_file_handler_class_type
+        if not issubclass(handler_class, HDF5DatasetFileHandler):
+            if self.cfg.async_export:
+                raise ValueError(f"The dataset file handler '{handler_class.__name__}' does not support async export.")
+            return handler_class()
+        return handler_class(
+            compression=self.cfg.dataset_compression,
+            compression_level=self.cfg.dataset_compression_level,
+            async_write=self.cfg.async_export,
+        )
+
+    def _is_episode_empty(self, env_id: int) -> bool:
+        """Checks if the episode of the given environment id has no recorded data."""
+        if env_id not in self._episodes:
+            return True
+        if self._episode_buffer is not None:
+            return self._episode_buffer.is_empty(env_id)
+        return self._episodes[env_id].is_empty()
+
     def _prepare_terms(self):
         """Prepares a list of recorder terms."""
         # check if config is dict already
@@ -538,6 +616,10 @@ class RecorderManager(ManagerBase):
                 "dataset_export_dir_path",
                 "dataset_export_mode",
                 "export_in_record_pre_reset",
+                "episode_buffer_length",
+                "async_export",
+                "dataset_compression",
+                "dataset_compression_level",
             ]:
                 continue
             # check if term config is None
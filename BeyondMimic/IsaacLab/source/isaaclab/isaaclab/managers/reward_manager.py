@@ -35,6 +35,10 @@ class RewardManager(ManagerBase):
         of the environment. This is done to ensure that the computed reward terms are balanced with
         respect to the chosen time-step interval in the environment.
 
+    The values of the terms are written into the columns of a single (num_envs, num_terms) buffer. The total
+    reward is the product of this buffer with the vector of the weighted time-step intervals, and the episodic
+    sums of all terms are one (num_envs, num_terms) buffer that is updated with a single operation. Terms with
+    zero weight are not computed.
     """
 
     _env: ManagerBasedRLEnv
@@ -55,14 +59,24 @@ class RewardManager(ManagerBase):
         # call the base class constructor (this will parse the terms config)
         super().__init__(cfg, env)
         # prepare extra info to store individual reward term information
+        # note: the episodic sums of the terms are views of the columns of a single buffer
+        num_terms = len(self._term_names)
+        self._episode_sum_buf = torch.zeros((self.num_envs, num_terms), dtype=torch.float, device=self.device)
         self._episode_sums = dict()
-        for term_name in self._term_names:
-            self._episode_sums[term_name] = torch.zeros(self.num_envs, dtype=torch.float, device=self.device)
+        for term_idx, term_name in enumerate(self._term_names):
+            self._episode_sums[term_name] = self._episode_sum_buf[:, term_idx]
         # create buffer for managing reward per environment
         self._reward_buf = torch.zeros(self.num_envs, dtype=torch.float, device=self.device)
 
-        # Buffer which stores the current step reward for each term for each environment
-        self._step_reward = torch.zeros((self.num_envs, len(self._term_names)), dtype=torch.float, device=self.device)
+        # Buffer which stores the unweighted value of each term for each environment at the current step
+        self._term_values = torch.zeros((self.num_envs, num_terms), dtype=torch.float, device=self.device)
+        # weights of the terms, indices of the terms with non-zero weight and the weights multiplied by the
+        # time-step interval
+        self._term_weights: list[float] = list()
+        self._active_term_ids: list[int] = list()
+        self._weighted_dt: torch.Tensor | None = None
+        self._weighted_dt_value: float | None = None
+        self._update_term_weights()
 
     def __str__(self) -> str:
         """Returns: A string representation for reward manager."""
@@ -112,19 +126,47 @@ class RewardManager(ManagerBase):
             env_ids = slice(None)
         # store information
         extras = {}
-        for key in self._episode_sums.keys():
+        # r_1 + r_2 + ... + r_n, for all terms at once
+        episodic_sum_avg = torch.mean(self._episode_sum_buf[env_ids], dim=0) / self._env.max_episode_length_s
+        for term_idx, key in enumerate(self._term_names):
             # store information
-            # r_1 + r_2 + ... + r_n
-            episodic_sum_avg = torch.mean(self._episode_sums[key][env_ids])
-            extras["Episode_Reward/" + key] = episodic_sum_avg / self._env.max_episode_length_s
-            # reset episodic sum
-            self._episode_sums[key][env_ids] = 0.0
+            extras["Episode_Reward/" + key] = episodic_sum_avg[term_idx]
+        # reset episodic sums
+        self._episode_sum_buf[env_ids] = 0.0
         # reset all the reward terms
         for term_cfg in self._class_term_cfgs:
             term_cfg.func.reset(env_ids=env_ids)
         # return logged information
         return extras
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, torch.Tensor]:
+        """Returns the episodic sum of individual reward terms for the environments selected by a mask.
+
+        Same as :meth:`reset`, but the episodic sums are averaged and cleared with masked operations.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+
+        Returns:
+            Dictionary of episodic sum of individual reward terms.
+        """
+        # store information
+        extras = {}
+        # r_1 + r_2 + ... + r_n, for all terms at once, averaged over the selected envs
+        num_resets = env_mask.sum().clamp(min=1)
+        episodic_sum = (self._episode_sum_buf * env_mask.unsqueeze(1)).sum(dim=0)
+        episodic_sum_avg = episodic_sum / num_resets / self._env.max_episode_length_s
+        for term_idx, key in enumerate(self._term_names):
+            # store information
+            extras["Episode_Reward/" + key] = episodic_sum_avg[term_idx]
+        # reset episodic sums
+        self._episode_sum_buf.masked_fill_(env_mask.unsqueeze(1), 0.0)
+        # reset all the reward terms
+        for term_cfg in self._class_term_cfgs:
+            term_cfg.func.reset_masked(env_mask)
+        # return logged information
+        return extras
+
     def compute(self, dt: float) -> torch.Tensor:
         """Computes the reward signal as a weighted sum of individual terms.
 
@@ -137,23 +179,22 @@ class RewardManager(ManagerBase):
         Returns:
             The net reward signal of shape (num_envs,).
         """
-        # reset computation
-        self._reward_buf[:] = 0.0
-        # iterate over all the reward terms
-        for term_idx, (name, term_cfg) in enumerate(zip(self._term_names, self._term_cfgs)):
-            # skip if weight is zero (kind of a micro-optimization)
-            if term_cfg.weight == 0.0:
-                self._step_reward[:, term_idx] = 0.0
-                continue
-            # compute term's value
-            value = term_cfg.func(self._env, **term_cfg.params) * term_cfg.weight * dt
-            # update total reward
-            self._reward_buf += value
-            # update episodic sum
-            self._episode_sums[name] += value
-
-            # Update current reward for this step.
-            self._step_reward[:, term_idx] = value / dt
+        # weights multiplied by the time-step interval, rebuilt only if a weight or the interval changes
+        # note: the weights are compared on the host since the term configurations can be modified in place,
+        #   e.g. by a curriculum, without calling set_term_cfg
+        if dt != self._weighted_dt_value or any(
+            term_cfg.weight != weight for term_cfg, weight in zip(self._term_cfgs, self._term_weights)
+        ):
+            self._update_term_weights(dt)
+        # compute the values of the terms with non-zero weight into their columns
+        # note: the columns of the other terms stay zero, see _update_term_weights
+        for term_idx in self._active_term_ids:
+            term_cfg = self._term_cfgs[term_idx]
+            self._term_values[:, term_idx] = term_cfg.func(self._env, **term_cfg.params)
+        # update total reward
+        torch.mv(self._term_values, self._weighted_dt, out=self._reward_buf)
+        # update episodic sums
+        self._episode_sum_buf.addcmul_(self._term_values, self._weighted_dt)
 
         return self._reward_buf
 
@@ -175,6 +216,8 @@ class RewardManager(ManagerBase):
             raise ValueError(f"Reward term '{term_name}' not found.")
         # set the configuration
         self._term_cfgs[self._term_names.index(term_name)] = cfg
+        # update the weights of the terms
+        self._update_term_weights()
 
     def get_term_cfg(self, term_name: str) -> RewardTermCfg:
         """Gets the configuration for the specified term.
@@ -205,14 +248,34 @@ class RewardManager(ManagerBase):
             The active terms.
         """
         terms = []
-        for idx, name in enumerate(self._term_names):
-            terms.append((name, [self._step_reward[env_idx, idx].cpu().item()]))
+        step_reward = self._term_values[env_idx].cpu()
+        for idx, (name, term_cfg) in enumerate(zip(self._term_names, self._term_cfgs)):
+            terms.append((name, [step_reward[idx].item() * term_cfg.weight]))
         return terms
 
     """
     Helper functions.
     """
 
+    def _update_term_weights(self, dt: float | None = None):
+        """Updates the active terms and the weight vector from the term configurations.
+
+        Terms with zero weight are left out of the computation and their columns of the term values are zeroed.
+
+        Args:
+            dt: The time-step interval of the environment. Defaults to None, in which case the weight vector is
+                rebuilt on the next compute.
+        """
+        self._term_weights = [term_cfg.weight for term_cfg in self._term_cfgs]
+        self._active_term_ids = [idx for idx, weight in enumerate(self._term_weights) if weight != 0.0]
+        inactive_term_ids = [idx for idx, weight in enumerate(self._term_weights) if weight == 0.0]
+        self._term_values[:, inactive_term_ids] = 0.0
+        if dt is not None:
+            self._weighted_dt = torch.tensor(
+                [weight * dt for weight in self._term_weights], dtype=torch.float, device=self.device
+            )
+        self._weighted_dt_value = dt
+
     def _prepare_terms(self):
         # check if config is dict already
         if isinstance(self.cfg, dict):
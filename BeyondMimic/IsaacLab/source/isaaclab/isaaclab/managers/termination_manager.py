@@ -143,13 +143,35 @@ class TerminationManager(ManagerBase):
         last_episode_done_stats = self._last_episode_dones.float().mean(dim=0)
         for i, key in enumerate(self._term_names):
             # store information
-            extras["Episode_Termination/" + key] = last_episode_done_stats[i].item()
+            # note: kept on the device, like the episodic reward sums, to not synchronize at every reset
+            extras["Episode_Termination/" + key] = last_episode_done_stats[i]
         # reset all the reward terms
         for term_cfg in self._class_term_cfgs:
             term_cfg.func.reset(env_ids=env_ids)
         # return logged information
         return extras
 
+    def reset_masked(self, env_mask: torch.Tensor) -> dict[str, torch.Tensor]:
+        """Returns the episodic counts of individual termination terms and resets the terms selected by a mask.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+
+        Returns:
+            Dictionary of the episodic counts of individual termination terms.
+        """
+        # add to episode dict
+        # note: the statistics are over the last episode of all envs, as in reset
+        extras = {}
+        last_episode_done_stats = self._last_episode_dones.float().mean(dim=0)
+        for i, key in enumerate(self._term_names):
+            extras["Episode_Termination/" + key] = last_episode_done_stats[i]
+        # reset all the termination terms
+        for term_cfg in self._class_term_cfgs:
+            term_cfg.func.reset_masked(env_mask)
+        # return logged information
+        return extras
+
     def compute(self) -> torch.Tensor:
         """Computes the termination signal as union of individual terms.
 
@@ -174,9 +196,13 @@ class TerminationManager(ManagerBase):
             self._term_dones[:, i] = value
         # update last-episode dones once per compute: for any env where a term fired,
         # reflect exactly which term(s) fired this step and clear others
-        rows = self._term_dones.any(dim=1).nonzero(as_tuple=True)[0]
-        if rows.numel() > 0:
-            self._last_episode_dones[rows] = self._term_dones[rows]
+        # note: masked instead of indexed to not synchronize with the device
+        torch.where(
+            self._term_dones.any(dim=1, keepdim=True),
+            self._term_dones,
+            self._last_episode_dones,
+            out=self._last_episode_dones,
+        )
         # return combined termination signal
         return self._truncated_buf | self._terminated_buf
 
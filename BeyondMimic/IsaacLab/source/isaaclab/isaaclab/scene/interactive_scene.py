@@ -462,6 +462,30 @@ class InteractiveScene:
         for sensor in self._sensors.values():
             sensor.reset(env_ids)
 
+    def reset_masked(self, env_mask: torch.Tensor):
+        """Resets the scene entities of the environments selected by a mask.
+
+        Entities that do not support masked resets are reset by the indices of the selected environments,
+        which synchronizes with the device.
+
+        Args:
+            env_mask: The mask of the environments to reset. Shape is (num_envs,).
+        """
+        # -- assets
+        for articulation in self._articulations.values():
+            articulation.reset_masked(env_mask)
+        for deformable_object in self._deformable_objects.values():
+            deformable_object.reset_masked(env_mask)
+        for rigid_object in self._rigid_objects.values():
+            rigid_object.reset_masked(env_mask)
+        for surface_gripper in self._surface_grippers.values():
+            surface_gripper.reset_masked(env_mask)
+        for rigid_object_collection in self._rigid_object_collections.values():
+            rigid_object_collection.reset_masked(env_mask)
+        # -- sensors
+        for sensor in self._sensors.values():
+            sensor.reset_masked(env_mask)
+
     def write_data_to_sim(self):
         """Writes the data of the scene entities to the simulation."""
         # -- assets
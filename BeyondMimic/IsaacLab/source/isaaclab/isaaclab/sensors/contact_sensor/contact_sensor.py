@@ -165,6 +165,32 @@ class ContactSensor(SensorBase):
             # buffer used during contact position aggregation
             self._contact_position_aggregate_buffer[env_ids, :] = torch.nan
 
+    def reset_masked(self, env_mask: torch.Tensor):
+        # reset the timers and counters
+        self._timestamp.masked_fill_(env_mask, 0.0)
+        self._timestamp_last_update.masked_fill_(env_mask, 0.0)
+        self._is_outdated.masked_fill_(env_mask, True)
+        # reset accumulative data buffers
+        mask = env_mask[:, None, None]
+        self._data.net_forces_w.masked_fill_(mask, 0.0)
+        self._data.net_forces_w_history.masked_fill_(mask[..., None], 0.0)
+        # reset force matrix
+        if len(self.cfg.filter_prim_paths_expr) != 0:
+            self._data.force_matrix_w.masked_fill_(mask[..., None], 0.0)
+            self._data.force_matrix_w_history.masked_fill_(mask[..., None, None], 0.0)
+        # reset the current air time
+        if self.cfg.track_air_time:
+            mask = env_mask[:, None]
+            self._data.current_air_time.masked_fill_(mask, 0.0)
+            self._data.last_air_time.masked_fill_(mask, 0.0)
+            self._data.current_contact_time.masked_fill_(mask, 0.0)
+            self._data.last_contact_time.masked_fill_(mask, 0.0)
+        # reset contact positions
+        if self.cfg.track_contact_points:
+            self._data.contact_pos_w.masked_fill_(env_mask[:, None, None, None], torch.nan)
+            # buffer used during contact position aggregation
+            self._contact_position_aggregate_buffer[: self._num_envs].masked_fill_(env_mask[:, None, None], torch.nan)
+
     def find_bodies(self, name_keys: str | Sequence[str], preserve_order: bool = False) -> tuple[list[int], list[str]]:
         """Find bodies in the articulation based on the name keys.
 
@@ -180,6 +180,19 @@ class SensorBase(ABC):
         # Set all reset sensors to outdated so that they are updated when data is called the next time.
         self._is_outdated[env_ids] = True
 
+    def reset_masked(self, env_mask: torch.Tensor):
+        """Resets the sensor internals of the environments selected by a mask.
+
+        The default implementation calls :meth:`reset` with the indices of the selected environments, which
+        synchronizes with the device. Sensors that can reset their buffers with masked writes override it.
+
+        Args:
+            env_mask: The mask of the sensors to reset. Shape is (num_instances,).
+        """
+        env_ids = env_mask.nonzero(as_tuple=False).squeeze(-1)
+        if len(env_ids) > 0:
+            self.reset(env_ids)
+
     def update(self, dt: float, force_recompute: bool = False):
         # Update the timestamp for the sensors
         self._timestamp += dt
@@ -16,7 +16,11 @@ class CircularBuffer:
     multi-environment settings, where each environment has its own data.
 
     The shape of the appended data is expected to be (batch_size, ...), where the first dimension is the
-    batch dimension. Correspondingly, the shape of the ring buffer is (max_len, batch_size, ...).
+    batch dimension. Correspondingly, the shape of the ring buffer is (batch_size, 2 * max_len, ...).
+
+    The backing store holds every entry twice, at the slots ``i`` and ``i + max_len``. The history ordered from the
+    oldest to the most recent entry is then always the contiguous window of ``max_len`` slots that ends at the second
+    copy of the most recent entry, and :attr:`buffer` returns it as a view without any copy.
     """
 
     def __init__(self, max_len: int, batch_size: int, device: str):
@@ -43,9 +47,11 @@ class CircularBuffer:
         self._num_pushes = torch.zeros(batch_size, dtype=torch.long, device=device)
         # the pointer to the current head of the circular buffer (-1 means not initialized)
         self._pointer: int = -1
-        # the actual buffer for data storage
+        # the actual buffer for data storage, with every entry stored twice along dimension 1
         # note: this is initialized on the first call to :meth:`append`
         self._buffer: torch.Tensor = None  # type: ignore
+        # python copy of the maximum length to avoid device synchronizations
+        self._max_len_int = max_len
 
     """
     Properties.
@@ -64,7 +70,7 @@ class CircularBuffer:
     @property
     def max_length(self) -> int:
         """The maximum length of the ring buffer."""
-        return int(self._max_len[0].item())
+        return self._max_len_int
 
     @property
     def current_length(self) -> torch.Tensor:
@@ -78,12 +84,16 @@ class CircularBuffer:
     @property
     def buffer(self) -> torch.Tensor:
         """Complete circular buffer with most recent entry at the end and oldest entry at the beginning.
+
+        The returned tensor is a view into the buffer storage, which is overwritten by the next calls to
+        :meth:`append` and :meth:`reset`. Clone it to keep its values. Since the entries of each batch index are
+        contiguous, flattening the history and data dimensions with :meth:`torch.Tensor.reshape` does not copy either.
+
         Returns:
             Complete circular buffer with most recent entry at the end and oldest entry at the beginning of dimension 1. The shape is [batch_size, max_length, data.shape[1:]].
         """
-        buf = self._buffer.clone()
-        buf = torch.roll(buf, shifts=self.max_length - self._pointer - 1, dims=0)
-        return torch.transpose(buf, dim0=0, dim1=1)
+        start = self._pointer + 1
+        return self._buffer[:, start : start + self._max_len_int]
 
     """
     Operations.
@@ -102,7 +112,7 @@ class CircularBuffer:
         self._num_pushes[batch_ids] = 0
         if self._buffer is not None:
             # set buffer at batch_id reset indices to 0.0 so that the buffer() getter returns the cleared circular buffer after reset.
-            self._buffer[:, batch_ids, :] = 0.0
+            self._buffer[batch_ids] = 0.0
 
     def append(self, data: torch.Tensor):
         """Append the data to the circular buffer.
@@ -123,15 +133,18 @@ class CircularBuffer:
         # at the first call, initialize the buffer size
         if self._buffer is None:
             self._pointer = -1
-            self._buffer = torch.empty((self.max_length, *data.shape), dtype=data.dtype, device=self._device)
+            self._buffer = torch.empty(
+                (self.batch_size, 2 * self._max_len_int, *data.shape[1:]), dtype=data.dtype, device=self._device
+            )
         # move the head to the next slot
-        self._pointer = (self._pointer + 1) % self.max_length
-        # add the new data to the last layer
-        self._buffer[self._pointer] = data
+        self._pointer = (self._pointer + 1) % self._max_len_int
+        # add the new data to the last layer, in both copies of the slot
+        self._buffer[:, self._pointer] = data
+        self._buffer[:, self._pointer + self._max_len_int] = data
         # Check for batches with zero pushes and initialize all values in batch to first append
         is_first_push = self._num_pushes == 0
         if torch.any(is_first_push):
-            self._buffer[:, is_first_push] = data[is_first_push]
+            self._buffer[is_first_push] = data[is_first_push].unsqueeze(1)
         # increment number of number of pushes for all batches
         self._num_pushes += 1
 
@@ -162,6 +175,6 @@ class CircularBuffer:
         # admissible lag
         valid_keys = torch.minimum(key, self._num_pushes - 1)
         # the index in the circular buffer (pointer points to the last+1 index)
-        index_in_buffer = torch.remainder(self._pointer - valid_keys, self.max_length)
+        index_in_buffer = torch.remainder(self._pointer - valid_keys, self._max_len_int)
         # return output
-        return self._buffer[index_in_buffer, self._ALL_INDICES]
+        return self._buffer[self._ALL_INDICES, index_in_buffer]
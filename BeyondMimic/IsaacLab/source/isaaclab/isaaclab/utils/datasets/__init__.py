@@ -13,5 +13,6 @@ Submodule for datasets classes and methods.
 """
 
 from .dataset_file_handler_base import DatasetFileHandlerBase
+from .episode_buffer import EpisodeBuffer
 from .episode_data import EpisodeData
 from .hdf5_dataset_file_handler import HDF5DatasetFileHandler
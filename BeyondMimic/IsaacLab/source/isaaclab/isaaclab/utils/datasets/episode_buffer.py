@@ -0,0 +1,163 @@
+# Copyright (c) 2022-2025, The Isaac Lab Project Developers (https://github.com/isaac-sim/IsaacLab/blob/main/CONTRIBUTORS.md).
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+from __future__ import annotations
+
+import numpy as np
+import torch
+from collections.abc import Sequence
+
+from .episode_data import EpisodeData
+
+
+class EpisodeBuffer:
+    """Class to store the ongoing episodes of a batch of environments in preallocated buffers.
+
+    Contrary to :class:`EpisodeData`, which keeps a list of cloned tensors per environment and key, the buffer keeps
+    one tensor of shape (num_envs, capacity, ...) per key on the device of the recorded values. The values of all the
+    environments in a batch are written with a single indexed assignment, and the data of an episode is read as
+    views into the buffers. The number of recorded steps is tracked per key and environment on the host, so that no
+    synchronization with the device is required.
+
+    The capacity of a buffer is doubled when an episode exceeds it.
+    """
+
+    def __init__(self, num_envs: int, capacity: int, device: str):
+        """Initializes the episode buffer.
+
+        Args:
+            num_envs: The number of environments.
+            capacity: The initial number of steps per environment and key.
+            device: The device of the buffers.
+
+        Raises:
+            ValueError: If the capacity is not positive.
+        """
+        if capacity < 1:
+            raise ValueError(f"The capacity of the episode buffer must be positive. Received: {capacity}.")
+        self._num_envs = num_envs
+        self._capacity = capacity
+        self._device = device
+        self._all_env_ids = np.arange(num_envs)
+        # buffers and number of recorded steps per flattened key, e.g. "obs/policy"
+        self._buffers: dict[str, torch.Tensor] = dict()
+        self._lengths: dict[str, np.ndarray] = dict()
+
+    """
+    Properties.
+    """
+
+    @property
+    def num_envs(self) -> int:
+        """The number of environments."""
+        return self._num_envs
+
+    @property
+    def device(self) -> str:
+        """The device of the buffers."""
+        return self._device
+
+    @property
+    def keys(self) -> list[str]:
+        """The flattened keys of the recorded values."""
+        return list(self._buffers.keys())
+
+    """
+    Operations.
+    """
+
+    def add(self, key: str, value: torch.Tensor | dict, env_ids: Sequence[int] | None = None):
+        """Add a batch of values to the episodes of the given environments.
+
+        Args:
+            key: The key name. The key can be nested by using the "/" character, e.g. "obs/joint_pos".
+            value: The values of shape (len(env_ids), ...) or a dictionary of such values. As for the recorder terms,
+                additional values beyond the given environments are ignored.
+            env_ids: The environment ids. Defaults to None, in which case all environments are considered.
+        """
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                self.add(f"{key}/{sub_key}", sub_value, env_ids)
+            return
+
+        env_ids = self._all_env_ids if env_ids is None else np.asarray(env_ids, dtype=np.int64)
+        # create the buffer on the first value
+        if key not in self._buffers:
+            self._buffers[key] = torch.zeros(
+                (self._num_envs, self._capacity, *value.shape[1:]), dtype=value.dtype, device=self._device
+            )
+            self._lengths[key] = np.zeros(self._num_envs, dtype=np.int64)
+        buffer = self._buffers[key]
+        lengths = self._lengths[key]
+        step_ids = lengths[env_ids]
+        # grow the buffer if an episode is full
+        if len(step_ids) > 0 and step_ids.max() >= buffer.shape[1]:
+            buffer = torch.cat((buffer, torch.zeros_like(buffer)), dim=1)
+            self._buffers[key] = buffer
+        # write the values of all environments at once
+        index = (torch.from_numpy(env_ids).to(self._device), torch.from_numpy(step_ids).to(self._device))
+        buffer[index] = value[: len(env_ids)].to(self._device)
+        lengths[env_ids] += 1
+
+    def reset(self, env_ids: Sequence[int] | None = None):
+        """Clear the episodes of the given environments.
+
+        The buffers are not cleared, the recorded steps are overwritten by the next episode.
+
+        Args:
+            env_ids: The environment ids. Defaults to None, in which case all environments are considered.
+        """
+        env_ids = self._all_env_ids if env_ids is None else np.asarray(env_ids, dtype=np.int64)
+        for lengths in self._lengths.values():
+            lengths[env_ids] = 0
+
+    def is_empty(self, env_id: int) -> bool:
+        """Check if the episode of the given environment is empty."""
+        return not any(lengths[env_id] > 0 for lengths in self._lengths.values())
+
+    def get_data(self, env_id: int) -> dict:
+        """Returns the data of the episode of the given environment.
+
+        The data is a nested dictionary of views of shape (num_steps, ...) into the buffers, in the same layout as
+        :attr:`EpisodeData.data` after :meth:`EpisodeData.pre_export`. The views are overwritten once the episode is
+        reset and the environment records again.
+
+        Args:
+            env_id: The environment id.
+
+        Returns:
+            The episode data. Keys without recorded steps are skipped.
+        """
+        data = dict()
+        for key, buffer in self._buffers.items():
+            length = self._lengths[key][env_id]
+            if length == 0:
+                continue
+            sub_keys = key.split("/")
+            current_dataset_pointer = data
+            for sub_key in sub_keys[:-1]:
+                current_dataset_pointer = current_dataset_pointer.setdefault(sub_key, dict())
+            current_dataset_pointer[sub_keys[-1]] = buffer[env_id, :length]
+        return data
+
+    def get_episode(self, env_id: int) -> EpisodeData:
+        """Returns a copy of the episode of the given environment.
+
+        Args:
+            env_id: The environment id.
+
+        Returns:
+            The episode data with tensors that are not overwritten by later episodes.
+        """
+
+        def clone_helper(data):
+            return {
+                key: clone_helper(value) if isinstance(value, dict) else value.clone() for key, value in data.items()
+            }
+
+        episode = EpisodeData()
+        episode.env_id = env_id
+        episode.data = clone_helper(self.get_data(env_id))
+        return episode
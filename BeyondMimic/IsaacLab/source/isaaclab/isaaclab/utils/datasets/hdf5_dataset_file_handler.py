@@ -12,22 +12,62 @@ import h5py
 import json
 import numpy as np
 import os
+import queue
+import threading
 import torch
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 
 from .dataset_file_handler_base import DatasetFileHandlerBase
 from .episode_data import EpisodeData
 
 
 class HDF5DatasetFileHandler(DatasetFileHandlerBase):
-    """HDF5 dataset file handler for storing and loading episode data."""
+    """HDF5 dataset file handler for storing and loading episode data.
 
-    def __init__(self):
-        """Initializes the HDF5 dataset file handler."""
+    The datasets of the episodes are chunked along the time dimension and resizable, and compressed with the
+    configured codec. With ``async_write``, :meth:`write_episode` only starts the copy of the episode to pinned host
+    memory and returns; the datasets are written by a background thread, which owns all writes to the file until
+    :meth:`close`.
+    """
+
+    COMPRESSIONS = ("gzip", "lz4", "none")
+    """The supported compression codecs of the datasets."""
+
+    def __init__(
+        self,
+        compression: str = "gzip",
+        compression_level: int | None = None,
+        chunk_length: int = 1024,
+        async_write: bool = False,
+    ):
+        """Initializes the HDF5 dataset file handler.
+
+        Args:
+            compression: The compression codec of the datasets, one of :attr:`COMPRESSIONS`. The "lz4" codec requires
+                the ``hdf5plugin`` package, also to read the file. Defaults to "gzip".
+            compression_level: The gzip compression level (0-9). Defaults to None, in which case the h5py default
+                is used.
+            chunk_length: The maximum number of steps per chunk of the datasets. Defaults to 1024.
+            async_write: Whether to write the episodes in a background thread. Defaults to False.
+
+        Raises:
+            ValueError: If the compression codec is not supported.
+        """
         self._hdf5_file_stream = None
         self._hdf5_data_group = None
         self._demo_count = 0
         self._env_args = {}
+        self._chunk_length = chunk_length
+        self._async_write = async_write
+        # background writer, started with the file
+        self._write_queue: queue.Queue | None = None
+        self._writer: threading.Thread | None = None
+        self._writer_error: BaseException | None = None
+        self._queued_episode_names: set[str] = set()
+        # resolve the compression filter
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}', expected one of {self.COMPRESSIONS}.")
+        self._compression_kwargs = self._resolve_compression(compression, compression_level)
 
     def open(self, file_path: str, mode: str = "r"):
         """Open an existing dataset file."""
@@ -52,6 +92,11 @@ class HDF5DatasetFileHandler(DatasetFileHandlerBase):
         self._hdf5_data_group = self._hdf5_file_stream.create_group("data")
         self._hdf5_data_group.attrs["total"] = 0
         self._demo_count = 0
+        self._queued_episode_names.clear()
+        if self._async_write:
+            self._write_queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
 
         # set environment arguments
         # the environment type (we use gym environment type) is set to be compatible with robomimic
@@ -71,7 +116,7 @@ class HDF5DatasetFileHandler(DatasetFileHandlerBase):
         """Add environment arguments to the dataset."""
         self._raise_if_not_initialized()
         self._env_args.update(env_args)
-        self._hdf5_data_group.attrs["env_args"] = json.dumps(self._env_args)
+        self._submit(self._write_env_args, json.dumps(self._env_args))
 
     def set_env_name(self, env_name: str):
         """Set the environment name."""
@@ -139,6 +184,10 @@ class HDF5DatasetFileHandler(DatasetFileHandlerBase):
     def write_episode(self, episode: EpisodeData, demo_id: int | None = None):
         """Add an episode to the dataset.
 
+        With ``async_write``, the tensors of the episode are copied to pinned host memory without waiting for the
+        device, and the episode is written by the background thread. The tensors may be modified after the call
+        returns, as long as the modification is ordered after the copy on the device.
+
         Args:
             episode: The episode data to add.
             demo_id: Custom index for the episode. If None, uses default index.
@@ -154,36 +203,23 @@ class HDF5DatasetFileHandler(DatasetFileHandlerBase):
             episode_group_name = f"demo_{self._demo_count}"
 
         # create episode group with the specified name
-        if episode_group_name in self._hdf5_data_group:
+        if episode_group_name in self._queued_episode_names or episode_group_name in self._hdf5_data_group:
             raise ValueError(f"Episode group '{episode_group_name}' already exists in the dataset")
-        h5_episode_group = self._hdf5_data_group.create_group(episode_group_name)
+        self._queued_episode_names.add(episode_group_name)
 
         # store number of steps taken
-        if "actions" in episode.data:
-            h5_episode_group.attrs["num_samples"] = len(episode.data["actions"])
-        else:
-            h5_episode_group.attrs["num_samples"] = 0
-
+        attrs = {"num_samples": len(episode.data["actions"]) if "actions" in episode.data else 0}
         if episode.seed is not None:
-            h5_episode_group.attrs["seed"] = episode.seed
-
+            attrs["seed"] = episode.seed
         if episode.success is not None:
-            h5_episode_group.attrs["success"] = episode.success
-
-        def create_dataset_helper(group, key, value):
-            """Helper method to create dataset that contains recursive dict objects."""
-            if isinstance(value, dict):
-                key_group = group.create_group(key)
-                for sub_key, sub_value in value.items():
-                    create_dataset_helper(key_group, sub_key, sub_value)
-            else:
-                group.create_dataset(key, data=value.cpu().numpy(), compression="gzip")
-
-        for key, value in episode.data.items():
-            create_dataset_helper(h5_episode_group, key, value)
+            attrs["success"] = episode.success
 
-        # increment total step counts
-        self._hdf5_data_group.attrs["total"] += h5_episode_group.attrs["num_samples"]
+        if self._async_write:
+            # start the copies of all tensors and wait for them in the writer only
+            data, event = self._copy_to_host(episode.data)
+            self._submit(self._write_episode_group, episode_group_name, attrs, data, event)
+        else:
+            self._write_episode_group(episode_group_name, attrs, episode.data)
 
         # Only increment demo count if using default indexing
         if demo_id is None:
@@ -194,15 +230,138 @@ class HDF5DatasetFileHandler(DatasetFileHandlerBase):
         """Flush the episode data to disk."""
         self._raise_if_not_initialized()
 
-        self._hdf5_file_stream.flush()
+        self._submit(self._hdf5_file_stream.flush)
 
     def close(self):
-        """Close the dataset file handler."""
+        """Close the dataset file handler.
+
+        With ``async_write``, this waits until all episodes are written.
+        """
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
         if self._hdf5_file_stream is not None:
             self._hdf5_file_stream.close()
             self._hdf5_file_stream = None
+        self._raise_writer_error()
 
     def _raise_if_not_initialized(self):
         """Raise an error if the dataset file handler is not initialized."""
         if self._hdf5_file_stream is None:
             raise RuntimeError("HDF5 dataset file stream is not initialized")
+
+    """
+    Helper functions.
+    """
+
+    @staticmethod
+    def _resolve_compression(compression: str, compression_level: int | None) -> dict:
+        """Keyword arguments of :meth:`h5py.Group.create_dataset` for the compression codec."""
+        if compression == "none":
+            return {}
+        if compression == "lz4":
+            try:
+                import hdf5plugin
+            except ImportError:
+                raise ImportError("The 'lz4' compression of the datasets requires the 'hdf5plugin' package.")
+            return dict(hdf5plugin.LZ4())
+        return {"compression": "gzip", "compression_opts": compression_level}
+
+    def _submit(self, func: Callable, *args):
+        """Run a write to the file, in the background thread with ``async_write``."""
+        self._raise_writer_error()
+        if self._writer is None:
+            func(*args)
+        else:
+            self._write_queue.put((func, args))
+
+    def _raise_writer_error(self):
+        """Raise the error of the background thread in the calling thread."""
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            raise RuntimeError("Failed to write to the HDF5 dataset file in the background") from error
+
+    def _write_loop(self):
+        """Loop of the background writer thread."""
+        while True:
+            job = self._write_queue.get()
+            if job is None:
+                return
+            # skip the remaining writes after an error, it is raised on the next call of the handler
+            if self._writer_error is not None:
+                continue
+            func, args = job
+            try:
+                func(*args)
+            except BaseException as e:
+                self._writer_error = e
+
+    def _write_env_args(self, env_args: str):
+        self._hdf5_data_group.attrs["env_args"] = env_args
+
+    def _copy_to_host(self, data: dict) -> tuple[dict, torch.cuda.Event | None]:
+        """Start the non-blocking copies of the device tensors of the episode data to pinned host memory.
+
+        Returns:
+            The host copies of the data and the event to wait for before reading them, None if there is no device
+            tensor.
+        """
+        has_device_tensors = False
+
+        def copy_helper(value):
+            nonlocal has_device_tensors
+            if isinstance(value, dict):
+                return {key: copy_helper(sub_value) for key, sub_value in value.items()}
+            if isinstance(value, list):
+                value = torch.stack(value)
+            if value.is_cuda:
+                has_device_tensors = True
+                host_value = torch.empty(value.shape, dtype=value.dtype, pin_memory=True)
+                return host_value.copy_(value, non_blocking=True)
+            # host tensors may be views of buffers that are reused
+            return value.clone()
+
+        host_data = copy_helper(data)
+        event = None
+        if has_device_tensors:
+            event = torch.cuda.Event()
+            event.record()
+        return host_data, event
+
+    def _write_episode_group(
+        self, episode_group_name: str, attrs: dict, data: dict, event: torch.cuda.Event | None = None
+    ):
+        """Write the datasets of an episode into a new group of the file."""
+        if event is not None:
+            event.synchronize()
+        h5_episode_group = self._hdf5_data_group.create_group(episode_group_name)
+        for key, value in attrs.items():
+            h5_episode_group.attrs[key] = value
+
+        def create_dataset_helper(group, key, value):
+            """Helper method to create dataset that contains recursive dict objects."""
+            if isinstance(value, dict):
+                key_group = group.create_group(key)
+                for sub_key, sub_value in value.items():
+                    create_dataset_helper(key_group, sub_key, sub_value)
+            else:
+                array = value.cpu().numpy()
+                if array.ndim == 0:
+                    group.create_dataset(key, data=array)
+                    return
+                # chunked along the time dimension and resizable, so that steps can be appended
+                chunks = (max(min(len(array), self._chunk_length), 1),) + array.shape[1:]
+                group.create_dataset(
+                    key,
+                    data=array,
+                    chunks=chunks,
+                    maxshape=(None,) + array.shape[1:],
+                    **self._compression_kwargs,
+                )
+
+        for key, value in data.items():
+            create_dataset_helper(h5_episode_group, key, value)
+
+        # increment total step counts
+        self._hdf5_data_group.attrs["total"] += h5_episode_group.attrs["num_samples"]
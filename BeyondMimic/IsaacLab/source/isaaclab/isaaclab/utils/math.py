@@ -1731,40 +1731,104 @@ def pose_in_A_to_pose_in_B(pose_in_A: torch.Tensor, pose_A_in_B: torch.Tensor) -
     return torch.matmul(pose_A_in_B, pose_in_A)
 
 
-def quat_slerp(q1: torch.Tensor, q2: torch.Tensor, tau: float) -> torch.Tensor:
+def quat_slerp(q1: torch.Tensor, q2: torch.Tensor, tau: float | torch.Tensor) -> torch.Tensor:
     """Performs spherical linear interpolation (SLERP) between two quaternions.
 
-    This function does not support batch processing.
+    The interpolation is batched over the leading dimensions and always follows the shortest path. Quaternions that
+    are nearly parallel fall back to normalized linear interpolation, which avoids the division by a vanishing sine.
+    Both cases are resolved with masks, so the function is free of host-device synchronizations.
 
     Args:
-        q1: First quaternion in (w, x, y, z) format.
-        q2: Second quaternion in (w, x, y, z) format.
-        tau: Interpolation coefficient between 0 (q1) and 1 (q2).
+        q1: First quaternion in (w, x, y, z) format. Shape is (..., 4).
+        q2: Second quaternion in (w, x, y, z) format. Shape is (..., 4).
+        tau: Interpolation coefficient between 0 (q1) and 1 (q2). Either a scalar or a tensor that
+            broadcasts against the leading dimensions of the quaternions, i.e. of shape (...).
 
     Returns:
-        Interpolated quaternion in (w, x, y, z) format.
+        Interpolated quaternion in (w, x, y, z) format. Shape is (..., 4).
     """
     assert isinstance(q1, torch.Tensor), "Input must be a torch tensor"
     assert isinstance(q2, torch.Tensor), "Input must be a torch tensor"
-    if tau == 0.0:
-        return q1
-    elif tau == 1.0:
-        return q2
-    d = torch.dot(q1, q2)
-    if abs(abs(d) - 1.0) < torch.finfo(q1.dtype).eps * 4.0:
-        return q1
-    if d < 0.0:
-        # Invert rotation
-        d = -d
-        q2 *= -1.0
-    angle = torch.acos(torch.clamp(d, -1, 1))
-    if abs(angle) < torch.finfo(q1.dtype).eps * 4.0:
-        return q1
-    isin = 1.0 / torch.sin(angle)
-    q1 = q1 * torch.sin((1.0 - tau) * angle) * isin
-    q2 = q2 * torch.sin(tau * angle) * isin
-    q1 = q1 + q2
-    return q1
+    tau = torch.as_tensor(tau, dtype=q1.dtype, device=q1.device).unsqueeze(-1)
+    d = torch.sum(q1 * q2, dim=-1, keepdim=True)
+    # invert the rotation to take the shortest path
+    q2 = torch.where(d < 0.0, -q2, q2)
+    d = d.abs().clamp(max=1.0)
+    angle = torch.acos(d)
+    sin_angle = torch.sqrt(1.0 - d * d)
+    # nearly parallel quaternions are linearly interpolated
+    parallel = sin_angle < torch.finfo(q1.dtype).eps * 4.0
+    isin = 1.0 / torch.where(parallel, torch.ones_like(sin_angle), sin_angle)
+    w1 = torch.where(parallel, 1.0 - tau, torch.sin((1.0 - tau) * angle) * isin)
+    w2 = torch.where(parallel, tau, torch.sin(tau * angle) * isin)
+    return w1 * q1 + w2 * q2
+
+
+def quat_nlerp(q1: torch.Tensor, q2: torch.Tensor, tau: float | torch.Tensor) -> torch.Tensor:
+    """Performs normalized linear interpolation (NLERP) between two quaternions.
+
+    This is a cheaper approximation of :func:`quat_slerp` which follows the same path on the unit sphere, but does
+    not traverse it with a constant angular velocity. The error is negligible for closely spaced quaternions.
+
+    Args:
+        q1: First quaternion in (w, x, y, z) format. Shape is (..., 4).
+        q2: Second quaternion in (w, x, y, z) format. Shape is (..., 4).
+        tau: Interpolation coefficient between 0 (q1) and 1 (q2). Either a scalar or a tensor that
+            broadcasts against the leading dimensions of the quaternions, i.e. of shape (...).
+
+    Returns:
+        Interpolated quaternion in (w, x, y, z) format. Shape is (..., 4).
+    """
+    assert isinstance(q1, torch.Tensor), "Input must be a torch tensor"
+    assert isinstance(q2, torch.Tensor), "Input must be a torch tensor"
+    tau = torch.as_tensor(tau, dtype=q1.dtype, device=q1.device).unsqueeze(-1)
+    # invert the rotation to take the shortest path
+    q2 = torch.where(torch.sum(q1 * q2, dim=-1, keepdim=True) < 0.0, -q2, q2)
+    return normalize(torch.lerp(q1, q2, tau))
+
+
+def quat_squad(
+    q1: torch.Tensor, q2: torch.Tensor, s1: torch.Tensor, s2: torch.Tensor, tau: float | torch.Tensor
+) -> torch.Tensor:
+    """Performs spherical quadrangle interpolation (SQUAD) between two quaternions.
+
+    SQUAD interpolates between ``q1`` and ``q2`` along a curve shaped by the inner control points ``s1`` and ``s2``.
+    With the control points from :func:`quat_squad_control_points`, consecutive segments join with a continuous
+    angular velocity, unlike piecewise :func:`quat_slerp`.
+
+    Args:
+        q1: First quaternion in (w, x, y, z) format. Shape is (..., 4).
+        q2: Second quaternion in (w, x, y, z) format. Shape is (..., 4).
+        s1: Control point of the first quaternion in (w, x, y, z) format. Shape is (..., 4).
+        s2: Control point of the second quaternion in (w, x, y, z) format. Shape is (..., 4).
+        tau: Interpolation coefficient between 0 (q1) and 1 (q2). Either a scalar or a tensor that
+            broadcasts against the leading dimensions of the quaternions, i.e. of shape (...).
+
+    Returns:
+        Interpolated quaternion in (w, x, y, z) format. Shape is (..., 4).
+    """
+    tau = torch.as_tensor(tau, dtype=q1.dtype, device=q1.device)
+    return quat_slerp(quat_slerp(q1, q2, tau), quat_slerp(s1, s2, tau), 2.0 * tau * (1.0 - tau))
+
+
+def quat_squad_control_points(q_prev: torch.Tensor, q: torch.Tensor, q_next: torch.Tensor) -> torch.Tensor:
+    """Computes the SQUAD control point of a quaternion from its neighbors in a sequence.
+
+    Args:
+        q_prev: Previous quaternion in the sequence in (w, x, y, z) format. Shape is (..., 4).
+        q: Quaternion whose control point is computed in (w, x, y, z) format. Shape is (..., 4).
+        q_next: Next quaternion in the sequence in (w, x, y, z) format. Shape is (..., 4).
+
+    Returns:
+        Control point of the quaternion in (w, x, y, z) format. Shape is (..., 4).
+    """
+    q_inv = quat_conjugate(q)
+    # the axis-angle vectors are twice the quaternion logarithms
+    log_next = axis_angle_from_quat(quat_mul(q_inv, q_next))
+    log_prev = axis_angle_from_quat(quat_mul(q_inv, q_prev))
+    delta = -0.25 * (log_next + log_prev)
+    # a vanishing increment normalizes to a zero axis, which yields the identity quaternion
+    return quat_mul(q, quat_from_angle_axis(torch.linalg.norm(delta, dim=-1), delta))
 
 
 def interpolate_rotations(R1: torch.Tensor, R2: torch.Tensor, num_steps: int, axis_angle: bool = True) -> torch.Tensor:
@@ -1802,16 +1866,14 @@ def interpolate_rotations(R1: torch.Tensor, R2: torch.Tensor, num_steps: int, ax
         else:
             # Make sure that axis is a unit vector
             delta_axis = delta_axis_angle / delta_angle
-            delta_rot_steps = [
-                matrix_from_quat(quat_from_angle_axis(i * rot_step_size, delta_axis)) for i in range(num_steps)
-            ]
-            rot_steps = torch.stack([torch.matmul(delta_rot_steps[i], R1) for i in range(num_steps)])
+            angles = torch.arange(num_steps, dtype=R1.dtype, device=R1.device) * rot_step_size
+            delta_rot_steps = matrix_from_quat(quat_from_angle_axis(angles, delta_axis.expand(num_steps, -1)))
+            rot_steps = torch.matmul(delta_rot_steps, R1)
     else:
         q1 = quat_from_matrix(R1)
         q2 = quat_from_matrix(R2)
-        rot_steps = torch.stack(
-            [matrix_from_quat(quat_slerp(q1, q2, tau=float(i) / num_steps)) for i in range(num_steps)]
-        )
+        taus = torch.arange(num_steps, dtype=q1.dtype, device=q1.device) / num_steps
+        rot_steps = matrix_from_quat(quat_slerp(q1.expand(num_steps, -1), q2.expand(num_steps, -1), taus))
 
     # Add in endpoint
     rot_steps = torch.cat([rot_steps, R2[None]], dim=0)
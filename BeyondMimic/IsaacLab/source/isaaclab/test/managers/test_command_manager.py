@@ -0,0 +1,146 @@
+# Copyright (c) 2022-2025, The Isaac Lab Project Developers (https://github.com/isaac-sim/IsaacLab/blob/main/CONTRIBUTORS.md).
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""Launch Isaac Sim Simulator first."""
+
+from isaaclab.app import AppLauncher
+
+# launch omniverse app
+simulation_app = AppLauncher(headless=True).app
+
+"""Rest everything follows."""
+
+import torch
+from collections import namedtuple
+from collections.abc import Sequence
+
+import pytest
+
+from isaaclab.managers import CommandTerm, CommandTermCfg
+from isaaclab.utils import configclass
+
+DummyEnv = namedtuple("ManagerBasedRLEnv", ["num_envs", "device"])
+"""Dummy environment for testing."""
+
+
+class CountingCommand(CommandTerm):
+    """Command term that counts the resamples of each environment."""
+
+    def __init__(self, cfg: CommandTermCfg, env):
+        super().__init__(cfg, env)
+        self.num_resamples = torch.zeros(self.num_envs, dtype=torch.long, device=self.device)
+        self.metrics["error"] = torch.zeros(self.num_envs, device=self.device)
+
+    @property
+    def command(self) -> torch.Tensor:
+        return self.num_resamples
+
+    def _update_metrics(self):
+        self.metrics["error"] += 1.0
+
+    def _resample_command(self, env_ids: Sequence[int]):
+        self.num_resamples[env_ids] += 1
+
+    def _update_command(self):
+        pass
+
+
+@configclass
+class CountingCommandCfg(CommandTermCfg):
+    class_type: type = CountingCommand
+
+
+@pytest.fixture
+def env():
+    return DummyEnv(16, "cpu")
+
+
+@pytest.fixture
+def count_nonzero(monkeypatch):
+    """Count the searches of the environments to resample, which synchronize with the device."""
+    calls = []
+    nonzero = torch.Tensor.nonzero
+
+    def counting_nonzero(self, *args, **kwargs):
+        calls.append(self.shape)
+        return nonzero(self, *args, **kwargs)
+
+    monkeypatch.setattr(torch.Tensor, "nonzero", counting_nonzero)
+    return calls
+
+
+def test_host_bound_skips_resampling(env, count_nonzero):
+    """The search for the environments to resample only runs once the host-side bound of the time left expires."""
+    dt = 0.1
+    term = CountingCommand(CountingCommandCfg(resampling_time_range=(1.0, 2.0)), env)
+    term.reset(env_ids=torch.arange(env.num_envs))
+    assert torch.all(term.num_resamples == 1)
+
+    # the first update searches and tightens the bound to the smallest time left
+    term.compute(dt)
+    assert len(count_nonzero) == 1
+    assert term._time_left_bound == pytest.approx(term.time_left.min().item())
+    assert term._time_left_bound >= 1.0 - dt - 1e-6
+
+    # no search until the bound expires, i.e. for at least 0.8 s
+    for _ in range(8):
+        term.compute(dt)
+    assert len(count_nonzero) == 1
+    assert torch.all(term.num_resamples == 1)
+
+    # the commands are still resampled exactly when their time is over
+    for _ in range(30):
+        time_left = term.time_left.clone()
+        num_resamples = term.num_resamples.clone()
+        term.compute(dt)
+        due = time_left - dt <= 0.0
+        torch.testing.assert_close(term.num_resamples, num_resamples + due.long())
+        assert torch.all(term.time_left > 0.0)
+        assert term._time_left_bound <= term.time_left.min().item() + 1e-6
+    assert torch.all(term.num_resamples > 1)
+    # a search per expired bound instead of one per step
+    assert len(count_nonzero) < 30
+
+
+def test_host_bound_long_resampling_time(env, count_nonzero):
+    """Terms with resampling times longer than the episodes never search the environments to resample."""
+    term = CountingCommand(CountingCommandCfg(resampling_time_range=(1e9, 1e9)), env)
+    term.reset(env_ids=torch.arange(env.num_envs))
+    term.compute(0.02)
+    count_nonzero.clear()
+    for _ in range(500):
+        term.compute(0.02)
+    assert len(count_nonzero) == 0
+    assert torch.all(term.num_resamples == 1)
+
+
+def test_reset_masked(env):
+    """A masked reset logs and clears the metrics of the mask and resamples its commands."""
+    term = CountingCommand(CountingCommandCfg(resampling_time_range=(1.0, 2.0)), env)
+    term.reset(env_ids=torch.arange(env.num_envs))
+    for _ in range(3):
+        term.compute(0.1)
+    term.metrics["error"][:4] = 5.0
+    time_left = term.time_left.clone()
+
+    env_mask = torch.zeros(env.num_envs, dtype=torch.bool, device=env.device)
+    env_mask[[0, 1, 10]] = True
+    extras = term.reset_masked(env_mask)
+    # the metrics are averaged over the masked environments only
+    torch.testing.assert_close(extras["error"], torch.tensor((5.0 + 5.0 + 3.0) / 3))
+    assert torch.all(term.metrics["error"][env_mask] == 0.0)
+    assert torch.all(term.metrics["error"][2:4] == 5.0)
+    # the masked environments are resampled once, through the default fallback to indices
+    torch.testing.assert_close(term.num_resamples, 1 + env_mask.long())
+    # the counter restarts for the masked environments and is incremented by their resample
+    assert torch.all(term.command_counter == 1)
+    assert torch.all(term.time_left[env_mask] >= 1.0) and torch.all(term.time_left[env_mask] <= 2.0)
+    torch.testing.assert_close(term.time_left[~env_mask], time_left[~env_mask])
+    assert term._time_left_bound <= term.time_left.min().item() + 1e-6
+
+    # an empty mask leaves everything untouched
+    num_resamples = term.num_resamples.clone()
+    term.reset_masked(torch.zeros_like(env_mask))
+    torch.testing.assert_close(term.num_resamples, num_resamples)
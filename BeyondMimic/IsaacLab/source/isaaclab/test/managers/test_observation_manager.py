@@ -29,7 +29,7 @@ from isaaclab.managers import (
     ObservationTermCfg,
     RewardTermCfg,
 )
-from isaaclab.utils import configclass, modifiers
+from isaaclab.utils import configclass, modifiers, noise
 
 if TYPE_CHECKING:
     from isaaclab.envs import ManagerBasedEnv
@@ -424,6 +424,148 @@ def test_compute_with_history(setup_env):
     torch.testing.assert_close(expected_obs_data_t0[reset_env_ids], obs_policy[reset_env_ids])
 
 
+def test_compute_with_history_preallocated(setup_env):
+    env = setup_env
+    """Test the observation computation with history buffers written into the preallocated group output."""
+    HISTORY_LENGTH = 5
+
+    @configclass
+    class MyObservationManagerCfg:
+        """Test config class for observation manager."""
+
+        @configclass
+        class PolicyCfg(ObservationGroupCfg):
+            """Test config class for policy observation group."""
+
+            preallocate_output = True
+            term_1 = ObservationTermCfg(
+                func=complex_function_class, params={"interval": 0.5}, history_length=HISTORY_LENGTH
+            )
+            # total observation size: term_dim (1) * history_len (5) = 5
+            term_2 = ObservationTermCfg(func=lin_vel_w_data)
+            # total observation size: term_dim (3) = 3
+
+        policy: ObservationGroupCfg = PolicyCfg()
+
+    # create observation manager
+    cfg = MyObservationManagerCfg()
+    obs_man = ObservationManager(cfg, env)
+    # compute observation using manager
+    obs_policy_t0: torch.Tensor = obs_man.compute(update_history=True)["policy"]
+    expected_obs_data_t0 = torch.cat(
+        (torch.full((env.num_envs, HISTORY_LENGTH), 0.5, device=env.device), lin_vel_w_data(env)), dim=-1
+    )
+    torch.testing.assert_close(expected_obs_data_t0, obs_policy_t0)
+    # the history is ordered from the oldest to the most recent entry
+    for _ in range(HISTORY_LENGTH + 1):
+        obs_policy = obs_man.compute(update_history=True)["policy"]
+    expected_history = 0.5 * torch.arange(3, HISTORY_LENGTH + 3, device=env.device).repeat(env.num_envs, 1)
+    torch.testing.assert_close(expected_history, obs_policy[:, :HISTORY_LENGTH])
+    torch.testing.assert_close(lin_vel_w_data(env), obs_policy[:, HISTORY_LENGTH:])
+    # the group output is written in place
+    assert obs_policy.data_ptr() == obs_policy_t0.data_ptr()
+
+
+def test_compute_preallocated_fused(setup_env):
+    env = setup_env
+    """Test that the fused noise, clipping and scaling of a preallocated group match the per-term computation."""
+    modifier = modifiers.ModifierCfg(func=modifiers.bias, params={"value": 1.0})
+
+    @configclass
+    class MyObservationManagerCfg:
+        """Test config class for observation manager."""
+
+        @configclass
+        class PolicyCfg(ObservationGroupCfg):
+            """Test config class for policy observation group."""
+
+            enable_corruption = True
+            term_1 = ObservationTermCfg(func=pos_w_data, noise=noise.ConstantNoiseCfg(bias=0.5), clip=(0.0, 1.2))
+            term_2 = ObservationTermCfg(func=lin_vel_w_data, scale=(1.0, 2.0, 3.0))
+            term_3 = ObservationTermCfg(func=pos_w_data, modifiers=[modifier], scale=2.0)
+            term_4 = ObservationTermCfg(func=complex_function_class, params={"interval": 0.5}, history_length=3)
+
+        @configclass
+        class CriticCfg(PolicyCfg):
+            """Test config class for critic observation group."""
+
+            preallocate_output = True
+
+        policy: ObservationGroupCfg = PolicyCfg()
+        critic: ObservationGroupCfg = CriticCfg()
+
+    # create observation manager
+    cfg = MyObservationManagerCfg()
+    obs_man = ObservationManager(cfg, env)
+    # terms with modifiers or history are not fused
+    assert obs_man._group_obs_term_fused["critic"] == [True, True, False, False]
+    # the two groups only differ in the preallocation of the output
+    for _ in range(5):
+        observations = obs_man.compute(update_history=True)
+        torch.testing.assert_close(observations["policy"], observations["critic"])
+
+
+def test_compute_preallocated_random_noise(setup_env):
+    env = setup_env
+    """Test the fused uniform and gaussian noise of a preallocated group."""
+
+    @configclass
+    class MyObservationManagerCfg:
+        """Test config class for observation manager."""
+
+        @configclass
+        class PolicyCfg(ObservationGroupCfg):
+            """Test config class for policy observation group."""
+
+            enable_corruption = True
+            preallocate_output = True
+            term_1 = ObservationTermCfg(func=pos_w_data, noise=noise.UniformNoiseCfg(n_min=-0.1, n_max=0.1))
+            term_2 = ObservationTermCfg(func=lin_vel_w_data, noise=noise.GaussianNoiseCfg(mean=1.0, std=0.0))
+            term_3 = ObservationTermCfg(func=lin_vel_w_data)
+
+        policy: ObservationGroupCfg = PolicyCfg()
+
+    # create observation manager
+    cfg = MyObservationManagerCfg()
+    obs_man = ObservationManager(cfg, env)
+    obs_policy = obs_man.compute()["policy"]
+    # uniform noise within its range
+    pos_noise = obs_policy[:, :3] - pos_w_data(env)
+    assert torch.all(pos_noise.abs() <= 0.1 + 1e-6)
+    assert torch.any(pos_noise != 0.0)
+    # gaussian noise with its mean and the term without noise left untouched
+    torch.testing.assert_close(obs_policy[:, 3:6], lin_vel_w_data(env) + 1.0)
+    torch.testing.assert_close(obs_policy[:, 6:], lin_vel_w_data(env))
+
+
+def test_preallocated_output_invalid_config(setup_env):
+    env = setup_env
+    """Test that preallocating the output of a group with multi-dimensional terms fails."""
+
+    @configclass
+    class MyObservationManagerCfg:
+        """Test config class for observation manager."""
+
+        @configclass
+        class PolicyCfg(ObservationGroupCfg):
+            """Test config class for policy observation group."""
+
+            preallocate_output = True
+            term_1 = ObservationTermCfg(
+                func=grilled_chicken_image,
+                params={"bland": 1.0, "channel": 1},
+                history_length=2,
+                flatten_history_dim=False,
+            )
+
+        policy: ObservationGroupCfg = PolicyCfg()
+
+    # create observation manager
+    cfg = MyObservationManagerCfg()
+    with pytest.raises(ValueError):
+        ObservationManager(cfg, env)
+
+
 def test_compute_with_2d_history(setup_env):
     env = setup_env
     """Test the observation computation with history buffers for 2D observations."""
@@ -28,6 +28,7 @@ from isaaclab.envs import ManagerBasedEnv
 from isaaclab.managers import DatasetExportMode, RecorderManager, RecorderManagerBaseCfg, RecorderTerm, RecorderTermCfg
 from isaaclab.sim import SimulationContext
 from isaaclab.utils import configclass
+from isaaclab.utils.datasets import HDF5DatasetFileHandler
 
 
 class DummyResetRecorderTerm(RecorderTerm):
@@ -179,3 +180,47 @@ def test_record(dataset_dir):
         for env_id in range(env.num_envs):
             episode = recorder_manager.get_episode(env_id)
             assert torch.stack(episode.data["record_post_reset"]).shape == (1, 3)
+
+
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+@pytest.mark.parametrize("async_export", [False, True])
+def test_record_with_episode_buffer(dataset_dir, device, async_export):
+    """Test the recording into the preallocated episode buffers and the export in the background."""
+    env = create_dummy_env(device)
+    # create recorder manager
+    cfg = DummyRecorderManagerCfg()
+    cfg.dataset_export_dir_path = dataset_dir
+    cfg.dataset_filename = f"{uuid.uuid4()}.hdf5"
+    cfg.episode_buffer_length = 2
+    cfg.async_export = async_export
+    cfg.dataset_compression = "none"
+    recorder_manager = RecorderManager(cfg, env)
+
+    # record more steps than the initial length of the buffers
+    for _ in range(3):
+        recorder_manager.record_pre_step()
+        recorder_manager.record_post_step()
+
+    # check the recorded data
+    for env_id in range(env.num_envs):
+        episode = recorder_manager.get_episode(env_id)
+        assert episode.data["record_pre_step"].shape == (3, 4)
+        assert episode.data["record_post_step"].shape == (3, 5)
+
+    # Trigger pre-reset callbacks which then export and clean the episode data
+    recorder_manager.record_pre_reset(env_ids=[0, 1])
+    assert recorder_manager.get_episode(0).is_empty()
+    assert recorder_manager.get_episode(2).data["record_pre_step"].shape == (3, 4)
+    assert recorder_manager.exported_failed_episode_count == 2
+
+    # the exported episodes are not affected by the next episodes
+    recorder_manager.record_post_reset(env_ids=[0, 1])
+    recorder_manager._dataset_file_handler.close()
+    dataset_file_handler = HDF5DatasetFileHandler()
+    dataset_file_handler.open(os.path.join(cfg.dataset_export_dir_path, cfg.dataset_filename))
+    assert dataset_file_handler.get_num_episodes() == 2
+    episode = dataset_file_handler.load_episode("demo_0", device=device)
+    torch.testing.assert_close(episode.data["record_pre_step"], torch.ones(3, 4, device=device))
+    torch.testing.assert_close(episode.data["record_pre_reset"], torch.ones(1, 2, device=device))
+    assert "record_post_reset" not in episode.data
+    dataset_file_handler.close()
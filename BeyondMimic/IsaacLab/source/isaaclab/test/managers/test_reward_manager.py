@@ -38,6 +38,10 @@ def grilled_chicken_with_yoghurt(env, hot: bool, bland: float):
     return 0
 
 
+def grilled_chicken_per_env(env):
+    return torch.arange(env.num_envs, dtype=torch.float, device=env.device)
+
+
 @pytest.fixture
 def env():
     sim = SimulationContext()
@@ -129,6 +133,91 @@ def test_compute(env):
     assert tuple(rewards.shape) == (env.num_envs,)
 
 
+def test_episode_sums_and_weight_update(env):
+    """Test the episodic sums of the terms and the update of the term weights."""
+    cfg = {
+        "term_1": RewardTermCfg(func=grilled_chicken, weight=10),
+        "term_2": RewardTermCfg(func=grilled_chicken, weight=0.0),
+    }
+    env = namedtuple("ManagerBasedRLEnv", [*env._fields, "max_episode_length_s"])(*env, 2.0)
+    rew_man = RewardManager(cfg, env)
+    # the term with zero weight is not computed
+    assert rew_man._active_term_ids == [0]
+    for _ in range(3):
+        rew_man.compute(dt=env.dt)
+    torch.testing.assert_close(rew_man._episode_sums["term_1"], torch.full((env.num_envs,), 3.0))
+    torch.testing.assert_close(rew_man._episode_sums["term_2"], torch.zeros(env.num_envs))
+
+    # enable the second term
+    term_cfg = rew_man.get_term_cfg("term_2")
+    term_cfg.weight = -5.0
+    rew_man.set_term_cfg("term_2", term_cfg)
+    rewards = rew_man.compute(dt=env.dt)
+    torch.testing.assert_close(rewards, torch.full((env.num_envs,), 0.5))
+    torch.testing.assert_close(rew_man._episode_sums["term_2"], torch.full((env.num_envs,), -0.5))
+    assert rew_man.get_active_iterable_terms(0) == [("term_1", [10.0]), ("term_2", [-5.0])]
+
+    # the episodic sums are logged and cleared for the reset envs only
+    extras = rew_man.reset(env_ids=[0, 1])
+    torch.testing.assert_close(extras["Episode_Reward/term_1"], torch.tensor(4.0 / 2.0))
+    torch.testing.assert_close(extras["Episode_Reward/term_2"], torch.tensor(-0.5 / 2.0))
+    assert torch.all(rew_man._episode_sums["term_1"][:2] == 0.0)
+    assert torch.all(rew_man._episode_sums["term_1"][2:] == 4.0)
+
+
+def test_weight_update_in_place(env):
+    """Test that weights modified directly in the term configurations are applied, e.g. by a curriculum."""
+
+    @configclass
+    class MyRewardManagerCfg:
+        term_1 = RewardTermCfg(func=grilled_chicken, weight=1.0)
+        term_2 = RewardTermCfg(func=grilled_chicken, weight=0.0)
+
+    rew_man = RewardManager(MyRewardManagerCfg(), env)
+    torch.testing.assert_close(rew_man.compute(dt=env.dt), torch.full((env.num_envs,), 0.1))
+
+    # modify the weights without calling set_term_cfg, as done by the curriculum "rewards.<term>.weight" addresses
+    rew_man.cfg.term_1.weight = 5.0
+    rew_man.cfg.term_2.weight = 2.0
+    torch.testing.assert_close(rew_man.compute(dt=env.dt), torch.full((env.num_envs,), 0.7))
+    torch.testing.assert_close(rew_man._episode_sums["term_2"], torch.full((env.num_envs,), 0.2))
+
+    # disable a term again
+    rew_man.cfg.term_1.weight = 0.0
+    torch.testing.assert_close(rew_man.compute(dt=env.dt), torch.full((env.num_envs,), 0.2))
+    assert rew_man._active_term_ids == [1]
+
+
+def test_reset_masked(env):
+    """Test that a masked reset logs and clears the same episodic sums as a reset by indices."""
+    cfg = {
+        "term_1": RewardTermCfg(func=grilled_chicken_per_env, weight=1.0),
+        "term_2": RewardTermCfg(func=grilled_chicken, weight=2.0),
+    }
+    env = namedtuple("ManagerBasedRLEnv", [*env._fields, "max_episode_length_s"])(*env, 2.0)
+    rew_man_idx = RewardManager(cfg, env)
+    rew_man_mask = RewardManager(cfg, env)
+    for _ in range(3):
+        rew_man_idx.compute(dt=env.dt)
+        rew_man_mask.compute(dt=env.dt)
+
+    env_ids = [1, 4, 5, 18]
+    env_mask = torch.zeros(env.num_envs, dtype=torch.bool, device=env.device)
+    env_mask[env_ids] = True
+    extras_idx = rew_man_idx.reset(env_ids=env_ids)
+    extras_mask = rew_man_mask.reset_masked(env_mask)
+    assert extras_idx.keys() == extras_mask.keys()
+    for key in extras_idx:
+        torch.testing.assert_close(extras_mask[key], extras_idx[key])
+    for name in rew_man_idx.active_terms:
+        torch.testing.assert_close(rew_man_mask._episode_sums[name], rew_man_idx._episode_sums[name])
+
+    # an empty mask clears nothing
+    rew_man_mask.reset_masked(torch.zeros_like(env_mask))
+    for name in rew_man_idx.active_terms:
+        torch.testing.assert_close(rew_man_mask._episode_sums[name], rew_man_idx._episode_sums[name])
+
+
 def test_config_empty(env):
     """Test the creation of reward manager with empty config."""
     rew_man = RewardManager(None, env)
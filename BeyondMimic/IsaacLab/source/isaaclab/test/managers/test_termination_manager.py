@@ -16,7 +16,7 @@ import torch
 
 import pytest
 
-from isaaclab.managers import TerminationManager, TerminationTermCfg
+from isaaclab.managers import ManagerTermBase, TerminationManager, TerminationTermCfg
 from isaaclab.sim import SimulationContext
 
 
@@ -48,6 +48,30 @@ def fail_every_3_steps(env) -> torch.Tensor:
     return torch.full((env.num_envs,), cond, dtype=torch.bool, device=env.device)
 
 
+def fail_env_mask_a(env) -> torch.Tensor:
+    """Returns the per-env mask set by the test."""
+    return env.mask_a
+
+
+def fail_env_mask_b(env) -> torch.Tensor:
+    """Returns the per-env mask set by the test."""
+    return env.mask_b
+
+
+class ResetRecorderTerm(ManagerTermBase):
+    """Class term that records the environment ids it was reset with."""
+
+    def __init__(self, cfg: TerminationTermCfg, env):
+        super().__init__(cfg, env)
+        self.reset_env_ids = []
+
+    def reset(self, env_ids=None):
+        self.reset_env_ids.append(torch.as_tensor(env_ids, device=self.device))
+
+    def __call__(self, env) -> torch.Tensor:
+        return torch.zeros(env.num_envs, dtype=torch.bool, device=env.device)
+
+
 @pytest.fixture
 def env():
     sim = SimulationContext()
@@ -138,3 +162,70 @@ def test_time_out_vs_terminated_split(env):
     out = tm.compute()
     assert torch.all(out)
     assert torch.all(tm.terminated) and torch.all(tm.time_outs)
+
+
+def test_last_episode_dones_per_env(env):
+    """The terms of the last episode are updated for the envs where a term fired only."""
+    cfg = {
+        "term_a": TerminationTermCfg(func=fail_env_mask_a),
+        "term_b": TerminationTermCfg(func=fail_env_mask_b),
+    }
+    tm = TerminationManager(cfg, env)
+    env_ids = torch.arange(env.num_envs, device=env.device)
+    even = env_ids % 2 == 0
+    low = env_ids < 10
+
+    # step 1: term_a fires for the even envs -> [True, False] for them, [False, False] for the odd ones
+    env.mask_a, env.mask_b = even, torch.zeros_like(even)
+    out = tm.compute()
+    assert torch.equal(out, even)
+    assert torch.equal(tm._last_episode_dones[:, 0], even)
+    assert torch.all(~tm._last_episode_dones[:, 1])
+
+    # step 2: term_b fires for the low envs -> [False, True] for them, the other envs persist
+    env.mask_a, env.mask_b = torch.zeros_like(even), low
+    out = tm.compute()
+    assert torch.equal(out, low)
+    assert torch.equal(tm._last_episode_dones[:, 0], even & ~low)
+    assert torch.equal(tm._last_episode_dones[:, 1], low)
+
+    # step 3: nothing fires -> all envs persist
+    env.mask_a, env.mask_b = torch.zeros_like(even), torch.zeros_like(even)
+    assert torch.all(~tm.compute())
+    assert torch.equal(tm._last_episode_dones[:, 0], even & ~low)
+    assert torch.equal(tm._last_episode_dones[:, 1], low)
+
+    # the statistics are the share of envs whose last episode ended with each term
+    extras = tm.reset()
+    torch.testing.assert_close(extras["Episode_Termination/term_a"], torch.tensor(0.25))
+    torch.testing.assert_close(extras["Episode_Termination/term_b"], torch.tensor(0.5))
+
+
+def test_reset_masked(env):
+    """A masked reset logs the same statistics as a reset by indices and resets the class terms of the mask."""
+    cfg = {
+        "term_a": TerminationTermCfg(func=fail_env_mask_a),
+        "term_class": TerminationTermCfg(func=ResetRecorderTerm),
+    }
+    # let the simulation play to initialize the class term
+    env.sim._app_control_on_stop_handle = None
+    env.sim.reset()
+    tm = TerminationManager(cfg, env)
+    env.mask_a = torch.arange(env.num_envs, device=env.device) < 5
+    tm.compute()
+
+    env_mask = torch.zeros(env.num_envs, dtype=torch.bool, device=env.device)
+    env_mask[[2, 7]] = True
+    extras_mask = tm.reset_masked(env_mask)
+    extras_idx = tm.reset(env_ids=[2, 7])
+    assert extras_mask.keys() == extras_idx.keys()
+    for key in extras_idx:
+        torch.testing.assert_close(extras_mask[key], extras_idx[key])
+
+    # the class term without masked implementation is reset by the indices of the mask
+    term = tm.get_term_cfg("term_class").func
+    assert len(term.reset_env_ids) == 2
+    assert term.reset_env_ids[0].tolist() == [2, 7]
+    # and not at all for an empty mask
+    tm.reset_masked(torch.zeros_like(env_mask))
+    assert len(term.reset_env_ids) == 2
@@ -181,3 +181,26 @@ def test_return_buffer_prop(circular_buffer):
     # check that it is returned oldest first
     for idx in range(circular_buffer.max_length - 1):
         assert torch.all(torch.le(retrieved_buffer[:, idx], retrieved_buffer[:, idx + 1]))
+
+
+def test_return_buffer_prop_without_copy(circular_buffer):
+    """Test that the ordered buffer and its flattened version are views of the buffer storage."""
+    for i in range(circular_buffer.max_length + 3):
+        data = torch.tensor([[i]], device=circular_buffer.device).repeat(3, 2)
+        circular_buffer.append(data)
+
+    retrieved_buffer = circular_buffer.buffer
+    flat_buffer = retrieved_buffer.reshape(circular_buffer.batch_size, -1)
+    # check that no copy is made
+    storage_ptr = circular_buffer._buffer.untyped_storage().data_ptr()
+    assert retrieved_buffer.untyped_storage().data_ptr() == storage_ptr
+    assert flat_buffer.untyped_storage().data_ptr() == storage_ptr
+    # check the order of the flattened history
+    expected = torch.arange(3, circular_buffer.max_length + 3, device=circular_buffer.device).repeat_interleave(2)
+    torch.testing.assert_close(flat_buffer, expected.repeat(3, 1))
+    # check that the window follows the next append
+    circular_buffer.append(torch.full((3, 2), 100, device=circular_buffer.device))
+    torch.testing.assert_close(circular_buffer.buffer[:, -1], torch.full((3, 2), 100, device=circular_buffer.device))
+    torch.testing.assert_close(
+        circular_buffer.buffer[:, 0], torch.full((3, 2), 4, device=circular_buffer.device, dtype=torch.long)
+    )
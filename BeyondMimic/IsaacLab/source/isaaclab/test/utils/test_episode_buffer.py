@@ -0,0 +1,73 @@
+# Copyright (c) 2022-2025, The Isaac Lab Project Developers (https://github.com/isaac-sim/IsaacLab/blob/main/CONTRIBUTORS.md).
+# All rights reserved.
+#
+# SPDX-License-Identifier: BSD-3-Clause
+"""Launch Isaac Sim Simulator first."""
+
+from isaaclab.app import AppLauncher
+
+# launch omniverse app in headless mode
+simulation_app = AppLauncher(headless=True).app
+
+"""Rest everything follows from here."""
+
+import torch
+
+import pytest
+
+from isaaclab.utils.datasets import EpisodeBuffer, EpisodeData
+
+
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_add_and_get_data(device):
+    """Test that the buffer records the same data as the episode data."""
+    buffer = EpisodeBuffer(num_envs=3, capacity=2, device=device)
+    episodes = [EpisodeData() for _ in range(3)]
+    assert buffer.is_empty(0)
+
+    for step in range(5):
+        actions = torch.arange(6, device=device).view(3, 2) + 10 * step
+        obs = {"policy": torch.rand(3, 4, device=device), "critic": torch.rand(3, 1, device=device)}
+        # the last environment only records every other step
+        env_ids = [0, 1, 2] if step % 2 == 0 else [0, 1]
+        buffer.add("actions", actions[env_ids], env_ids)
+        buffer.add("obs", {key: value[env_ids] for key, value in obs.items()}, env_ids)
+        for env_id in env_ids:
+            episodes[env_id].add("actions", actions[env_id])
+            episodes[env_id].add("obs", {key: value[env_id] for key, value in obs.items()})
+
+    assert not buffer.is_empty(0)
+    assert sorted(buffer.keys) == ["actions", "obs/critic", "obs/policy"]
+    for env_id, episode in enumerate(episodes):
+        episode.pre_export()
+        data = buffer.get_data(env_id)
+        torch.testing.assert_close(data["actions"], episode.data["actions"])
+        torch.testing.assert_close(data["obs"]["policy"], episode.data["obs"]["policy"])
+        torch.testing.assert_close(data["obs"]["critic"], episode.data["obs"]["critic"])
+    assert len(buffer.get_data(2)["actions"]) == 3
+
+
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+def test_reset(device):
+    """Test that reset episodes are overwritten and copies are kept."""
+    buffer = EpisodeBuffer(num_envs=2, capacity=4, device=device)
+    buffer.add("actions", torch.ones(2, 3, device=device))
+    episode = buffer.get_episode(0)
+
+    buffer.reset([0])
+    assert buffer.is_empty(0)
+    assert not buffer.is_empty(1)
+    assert buffer.get_data(0) == {}
+
+    buffer.add("actions", torch.zeros(2, 3, device=device))
+    torch.testing.assert_close(buffer.get_data(0)["actions"], torch.zeros(1, 3, device=device))
+    torch.testing.assert_close(buffer.get_data(1)["actions"], torch.tensor([[1.0] * 3, [0.0] * 3], device=device))
+    # the copy of the episode is not overwritten
+    assert episode.env_id == 0
+    torch.testing.assert_close(episode.data["actions"], torch.ones(1, 3, device=device))
+
+
+def test_invalid_capacity():
+    """Test creating the buffer with an invalid capacity."""
+    with pytest.raises(ValueError):
+        EpisodeBuffer(num_envs=2, capacity=0, device="cpu")
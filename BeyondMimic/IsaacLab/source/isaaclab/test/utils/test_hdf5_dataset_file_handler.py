@@ -118,3 +118,47 @@ def test_write_and_load_episode(temp_dir, device):
             assert torch.equal(loaded_episode.get_next_action(), action)
 
     dataset_file_handler.close()
+
+
+@pytest.mark.parametrize("device", ["cuda:0", "cpu"])
+@pytest.mark.parametrize("compression", ["gzip", "none"])
+@pytest.mark.parametrize("async_write", [False, True])
+def test_write_episode_with_compression_and_async_write(temp_dir, device, compression, async_write):
+    """Test writing episodes with the compression codecs and in the background thread."""
+    dataset_file_path = os.path.join(temp_dir, f"{uuid.uuid4()}.hdf5")
+    dataset_file_handler = HDF5DatasetFileHandler(compression=compression, async_write=async_write)
+    dataset_file_handler.create(dataset_file_path, "test_env_name")
+
+    test_episode = create_test_episode(device)
+    test_episode.pre_export()
+    dataset_file_handler.write_episode(test_episode)
+    dataset_file_handler.write_episode(test_episode, demo_id=5)
+    dataset_file_handler.flush()
+    # only the episodes with default names are counted
+    assert dataset_file_handler.get_num_episodes() == 1
+
+    # episode names are checked before the episodes are written
+    with pytest.raises(ValueError):
+        dataset_file_handler.write_episode(test_episode, demo_id=5)
+
+    # the data written in the background is not affected by later modifications of the episode
+    expected_actions = test_episode.data["actions"].clone()
+    test_episode.data["actions"].zero_()
+    dataset_file_handler.close()
+
+    dataset_file_handler = HDF5DatasetFileHandler()
+    dataset_file_handler.open(dataset_file_path)
+    assert sorted(dataset_file_handler.get_episode_names()) == ["demo_0", "demo_5"]
+    for episode_name in dataset_file_handler.get_episode_names():
+        loaded_episode = dataset_file_handler.load_episode(episode_name, device=device)
+        assert loaded_episode.success == test_episode.success
+        if async_write:
+            assert torch.equal(loaded_episode.data["actions"], expected_actions)
+        assert torch.equal(loaded_episode.data["obs"]["policy"]["term1"], test_episode.data["obs"]["policy"]["term1"])
+    dataset_file_handler.close()
+
+
+def test_invalid_compression():
+    """Test creating the handler with an unknown compression codec."""
+    with pytest.raises(ValueError):
+        HDF5DatasetFileHandler(compression="zstd")
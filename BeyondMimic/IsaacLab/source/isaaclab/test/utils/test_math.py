@@ -868,6 +868,76 @@ def test_quat_slerp(device):
             np.testing.assert_array_almost_equal(result.cpu(), expected, decimal=DECIMAL_PRECISION)
 
 
+@pytest.mark.parametrize("device", ["cpu", "cuda:0"])
+@pytest.mark.parametrize("shape", [(100,), (10, 5, 3)])
+def test_quat_slerp_batched(device, shape):
+    """Test that batched quat_slerp with per-element coefficients matches the per-sample calls."""
+    q1 = math_utils.random_orientation(num=math.prod(shape), device=device).view(*shape, 4)
+    q2 = math_utils.random_orientation(num=math.prod(shape), device=device).view(*shape, 4)
+    tau = torch.rand(shape, device=device)
+
+    result = math_utils.quat_slerp(q1, q2, tau)
+    expected = torch.stack(
+        [math_utils.quat_slerp(a, b, t.item()) for a, b, t in zip(q1.view(-1, 4), q2.view(-1, 4), tau.view(-1))]
+    ).view(*shape, 4)
+    torch.testing.assert_close(result, expected)
+
+    # the inputs must not be modified
+    q1_clone, q2_clone = q1.clone(), q2.clone()
+    math_utils.quat_slerp(q1, -q2, tau)
+    torch.testing.assert_close(q1, q1_clone)
+    torch.testing.assert_close(q2, q2_clone)
+
+    # end points and the shortest path
+    torch.testing.assert_close(math_utils.quat_slerp(q1, q2, torch.zeros(shape, device=device)), q1)
+    torch.testing.assert_close(math_utils.quat_slerp(q1, -q2, 0.5), math_utils.quat_slerp(q1, q2, 0.5))
+    # nearly parallel quaternions fall back to linear interpolation
+    torch.testing.assert_close(math_utils.quat_slerp(q1, q1, tau), q1)
+    torch.testing.assert_close(math_utils.quat_slerp(q1, -q1, tau), q1)
+
+
+@pytest.mark.parametrize("device", ["cpu", "cuda:0"])
+def test_quat_nlerp(device):
+    """Test that quat_nlerp stays on the unit sphere and approximates quat_slerp for close quaternions."""
+    q1 = math_utils.random_orientation(num=1000, device=device)
+    delta = math_utils.quat_from_angle_axis(
+        torch.full((1000,), 0.05, device=device), torch.randn(1000, 3, device=device)
+    )
+    q2 = math_utils.quat_mul(delta, q1)
+    tau = torch.rand(1000, device=device)
+
+    result = math_utils.quat_nlerp(q1, q2, tau)
+    torch.testing.assert_close(result.norm(dim=-1), torch.ones(1000, device=device))
+    torch.testing.assert_close(result, math_utils.quat_slerp(q1, q2, tau), atol=1e-3, rtol=1e-3)
+    torch.testing.assert_close(math_utils.quat_nlerp(q1, -q2, tau), result)
+
+
+@pytest.mark.parametrize("device", ["cpu", "cuda:0"])
+def test_quat_squad(device):
+    """Test that quat_squad interpolates the key quaternions and reduces to slerp on a geodesic."""
+    q = math_utils.random_orientation(num=6, device=device)
+    s = math_utils.quat_squad_control_points(q[:-2], q[1:-1], q[2:])
+    q1, q2, s1, s2 = q[1:-2], q[2:-1], s[:-1], s[1:]
+
+    for tau, expected in ((0.0, q1), (1.0, q2)):
+        result = math_utils.quat_squad(q1, q2, s1, s2, tau)
+        torch.testing.assert_close(math_utils.quat_error_magnitude(result, expected), torch.zeros(3, device=device))
+
+    # on a single great circle with constant angular velocity, the control points coincide with the keys
+    axis = torch.randn(1, 3, device=device).expand(5, 3)
+    angles = torch.arange(5, device=device) * 0.3
+    q = math_utils.quat_from_angle_axis(angles, axis)
+    s = math_utils.quat_squad_control_points(q[:-2], q[1:-1], q[2:])
+    torch.testing.assert_close(s, q[1:-1], atol=1e-5, rtol=1e-5)
+    tau = torch.rand(2, device=device)
+    torch.testing.assert_close(
+        math_utils.quat_squad(q[1:-2], q[2:-1], s[:-1], s[1:], tau),
+        math_utils.quat_slerp(q[1:-2], q[2:-1], tau),
+        atol=1e-5,
+        rtol=1e-5,
+    )
+
+
 @pytest.mark.parametrize("device", ["cpu", "cuda:0"])
 def test_matrix_from_quat(device):
     """test matrix_from_quat against scipy."""
@@ -1200,6 +1270,49 @@ def test_quat_apply_benchmarks():
         )
 
 
+def test_quat_slerp_benchmarks():
+    """Test for the batched quat_slerp compared to iterating over the batch with scalar coefficients.
+
+    Before batching, trajectory interpolation had to loop over the samples in Python, as done for instance when
+    resampling motion files to a different frame rate.
+    """
+    for device in ["cpu", "cuda:0"]:
+        q1 = math_utils.random_orientation(num=1000, device=device)
+        q2 = math_utils.random_orientation(num=1000, device=device)
+        tau = torch.rand(1000, device=device)
+
+        def iter_quat_slerp(q1: torch.Tensor, q2: torch.Tensor, tau: torch.Tensor) -> torch.Tensor:
+            """Iterative calls of quat_slerp with a scalar coefficient."""
+            out = torch.empty_like(q1)
+            for i in range(q1.shape[0]):
+                out[i] = math_utils.quat_slerp(q1[i], q2[i], tau[i].item())
+            return out
+
+        timer_quat_slerp = benchmark.Timer(
+            stmt="math_utils.quat_slerp(q1, q2, tau)",
+            globals={"math_utils": math_utils, "q1": q1, "q2": q2, "tau": tau},
+        )
+        timer_quat_nlerp = benchmark.Timer(
+            stmt="math_utils.quat_nlerp(q1, q2, tau)",
+            globals={"math_utils": math_utils, "q1": q1, "q2": q2, "tau": tau},
+        )
+        timer_iter_quat_slerp = benchmark.Timer(
+            stmt="iter_quat_slerp(q1, q2, tau)",
+            globals={"iter_quat_slerp": iter_quat_slerp, "q1": q1, "q2": q2, "tau": tau},
+        )
+
+        # run the benchmark
+        print("--------------------------------")
+        print(f"Device: {device}")
+        print("Time for quat_slerp:", timer_quat_slerp.timeit(number=1000))
+        print("Time for quat_nlerp:", timer_quat_nlerp.timeit(number=1000))
+        print("Time for iter_quat_slerp:", timer_iter_quat_slerp.timeit(number=10))
+        print("--------------------------------")
+
+        # check output values are the same
+        torch.testing.assert_close(math_utils.quat_slerp(q1, q2, tau), iter_quat_slerp(q1, q2, tau))
+
+
 def test_interpolate_rotations():
     """Test interpolate_rotations function.
 
@@ -30,6 +30,12 @@ parser.add_argument(
 )
 parser.add_argument("--output_name", type=str, required=True, help="The name of the motion npz file.")
 parser.add_argument("--output_fps", type=int, default=50, help="The fps of the output motion.")
+parser.add_argument(
+    "--registry_dir",
+    type=str,
+    default=None,
+    help="Publish the motion to this local registry directory instead of the wandb registry.",
+)
 
 # append AppLauncher cli args
 AppLauncher.add_app_launcher_args(parser)
@@ -42,6 +48,8 @@ simulation_app = app_launcher.app
 
 """Rest everything follows."""
 
+import os
+import tempfile
 import torch
 
 import isaaclab.sim as sim_utils
@@ -56,6 +64,7 @@ from isaaclab.utils.math import axis_angle_from_quat, quat_conjugate, quat_mul,
 # Pre-defined configs
 ##
 from whole_body_tracking.robots.g1 import G1_CYLINDER_CFG
+from whole_body_tracking.utils.motion_cache import MOTION_FILE_NAME, LocalMotionRegistry, WandbMotionRegistry
 
 
 @configclass
@@ -153,10 +162,7 @@ class MotionLoader:
 
     def _slerp(self, a: torch.Tensor, b: torch.Tensor, blend: torch.Tensor) -> torch.Tensor:
         """Spherical linear interpolation between two quaternions."""
-        slerped_quats = torch.zeros_like(a)
-        for i in range(a.shape[0]):
-            slerped_quats[i] = quat_slerp(a[i], b[i], blend[i])
-        return slerped_quats
+        return quat_slerp(a, b, blend)
 
     def _compute_frame_blend(self, times: torch.Tensor) -> torch.Tensor:
         """Computes the frame blend for the motion."""
@@ -298,17 +304,15 @@ def run_simulator(sim: sim_utils.SimulationContext, scene: InteractiveScene, joi
             ):
                 log[k] = np.stack(log[k], axis=0)
 
-            np.savez("/tmp/motion.npz", **log)
-
-            import wandb
-
-            COLLECTION = args_cli.output_name
-            run = wandb.init(project="csv_to_npz", name=COLLECTION)
-            print(f"[INFO]: Logging motion to wandb: {COLLECTION}")
-            REGISTRY = "motions"
-            logged_artifact = run.log_artifact(artifact_or_path="/tmp/motion.npz", name=COLLECTION, type=REGISTRY)
-            run.link_artifact(artifact=logged_artifact, target_path=f"wandb-registry-{REGISTRY}/{COLLECTION}")
-            print(f"[INFO]: Motion saved to wandb registry: {REGISTRY}/{COLLECTION}")
+            # a private staging directory, concurrent conversions must not share the motion file
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                motion_file = os.path.join(tmp_dir, MOTION_FILE_NAME)
+                np.savez(motion_file, **log)
+                if args_cli.registry_dir is not None:
+                    version = LocalMotionRegistry(args_cli.registry_dir).publish(motion_file, args_cli.output_name)
+                    print(f"[INFO]: Motion saved to local registry: {args_cli.output_name}:{version}")
+                else:
+                    WandbMotionRegistry().publish(motion_file, args_cli.output_name)
 
 
 def main():
@@ -0,0 +1,392 @@
+"""This script converts motion csv files to npz files without launching Isaac Sim.
+
+Unlike ``csv_to_npz.py``, which replays the motion frame by frame in the simulator to read back the body states, the
+body poses are computed with batched forward kinematics of the robot URDF over all frames at once, and the body
+velocities are obtained by differentiating them. The output follows the same schema as ``csv_to_npz.py`` and is
+consumed by :class:`whole_body_tracking.tasks.tracking.mdp.MotionLoader`.
+
+.. code-block:: bash
+
+    # Usage
+    python csv_to_npz_batch.py --input LAFAN/ --input_fps 30 --output_dir ./motions --output_fps 50 --num_workers 8
+"""
+
+import argparse
+import glob
+import numpy as np
+import os
+import torch
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from isaaclab.utils.math import (
+    axis_angle_from_quat,
+    quat_apply,
+    quat_conjugate,
+    quat_from_angle_axis,
+    quat_from_euler_xyz,
+    quat_mul,
+    quat_slerp,
+)
+
+G1_JOINT_NAMES = [
+    "left_hip_pitch_joint",
+    "left_hip_roll_joint",
+    "left_hip_yaw_joint",
+    "left_knee_joint",
+    "left_ankle_pitch_joint",
+    "left_ankle_roll_joint",
+    "right_hip_pitch_joint",
+    "right_hip_roll_joint",
+    "right_hip_yaw_joint",
+    "right_knee_joint",
+    "right_ankle_pitch_joint",
+    "right_ankle_roll_joint",
+    "waist_yaw_joint",
+    "waist_roll_joint",
+    "waist_pitch_joint",
+    "left_shoulder_pitch_joint",
+    "left_shoulder_roll_joint",
+    "left_shoulder_yaw_joint",
+    "left_elbow_joint",
+    "left_wrist_roll_joint",
+    "left_wrist_pitch_joint",
+    "left_wrist_yaw_joint",
+    "right_shoulder_pitch_joint",
+    "right_shoulder_roll_joint",
+    "right_shoulder_yaw_joint",
+    "right_elbow_joint",
+    "right_wrist_roll_joint",
+    "right_wrist_pitch_joint",
+    "right_wrist_yaw_joint",
+]
+"""Order of the joint columns in the motion csv files."""
+
+DEFAULT_URDF = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "source",
+    "whole_body_tracking",
+    "whole_body_tracking",
+    "assets",
+    "unitree_description",
+    "urdf",
+    "g1",
+    "main.urdf",
+)
+
+
+def _parse_vector(text: str | None, default: tuple[float, ...]) -> list[float]:
+    return [float(x) for x in text.split()] if text else list(default)
+
+
+def _parse_origin(element: ET.Element | None) -> tuple[torch.Tensor, torch.Tensor]:
+    """Position and (w, x, y, z) orientation of an URDF ``<origin>`` element."""
+    xyz = _parse_vector(element.get("xyz") if element is not None else None, (0.0, 0.0, 0.0))
+    rpy = _parse_vector(element.get("rpy") if element is not None else None, (0.0, 0.0, 0.0))
+    rpy = torch.tensor(rpy, dtype=torch.float64)
+    return torch.tensor(xyz, dtype=torch.float64), quat_from_euler_xyz(rpy[0], rpy[1], rpy[2])
+
+
+class UrdfKinematics:
+    """Batched forward kinematics of a floating-base URDF.
+
+    Links connected by fixed joints are merged into their parent, as done by the URDF importer of Isaac Lab. Bodies
+    and joints are ordered breadth-first from the root link, which is the order of the simulated articulation.
+    """
+
+    def __init__(self, urdf_path: str, merge_fixed_joints: bool = True):
+        robot = ET.parse(urdf_path).getroot()
+
+        # inertial properties of every link in the link frame
+        links = {}
+        for link in robot.findall("link"):
+            inertial = link.find("inertial")
+            if inertial is None:
+                links[link.get("name")] = (0.0, torch.zeros(3, dtype=torch.float64))
+            else:
+                mass = inertial.find("mass")
+                com, _ = _parse_origin(inertial.find("origin"))
+                links[link.get("name")] = (float(mass.get("value")) if mass is not None else 0.0, com)
+
+        children: dict[str, list[ET.Element]] = {name: [] for name in links}
+        child_links = set()
+        for joint in robot.findall("joint"):
+            children[joint.find("parent").get("link")].append(joint)
+            child_links.add(joint.find("child").get("link"))
+        root_link = next(name for name in links if name not in child_links)
+
+        self.body_names: list[str] = []
+        self.joint_names: list[str] = []
+        self._parents: list[int] = []
+        self._origin_pos: list[torch.Tensor] = []
+        self._origin_quat: list[torch.Tensor] = []
+        self._axes: list[torch.Tensor] = []
+        self._joint_types: list[str] = []
+        self._masses: list[float] = []
+        self._coms: list[torch.Tensor] = []
+
+        def add_body(name: str, parent: int, joint: ET.Element | None, pos: torch.Tensor, quat: torch.Tensor):
+            self.body_names.append(name)
+            self._parents.append(parent)
+            self._origin_pos.append(pos)
+            self._origin_quat.append(quat)
+            mass, com = links[name]
+            self._masses.append(mass)
+            self._coms.append(com)
+            if joint is None:
+                self._joint_types.append("root")
+                self._axes.append(torch.zeros(3, dtype=torch.float64))
+            else:
+                self._joint_types.append(joint.get("type"))
+                axis = joint.find("axis")
+                axis = torch.tensor(_parse_vector(axis.get("xyz") if axis is not None else None, (1.0, 0.0, 0.0)))
+                self._axes.append((axis / torch.linalg.norm(axis)).to(torch.float64))
+                self.joint_names.append(joint.get("name"))
+
+        def merge_link(body: int, name: str, pos: torch.Tensor, quat: torch.Tensor):
+            # fold the inertia of a fixed child link into its body
+            mass, com = links[name]
+            com = pos + quat_apply(quat, com)
+            total = self._masses[body] + mass
+            if total > 0.0:
+                self._coms[body] = (self._masses[body] * self._coms[body] + mass * com) / total
+            self._masses[body] = total
+
+        # breadth-first traversal, fixed children are expanded in place of their parent body
+        add_body(root_link, -1, None, *self._identity())
+        queue = [(0, root_link, *self._identity())]
+        while queue:
+            expanded = []
+            for body, link, offset_pos, offset_quat in queue:
+                pending = [(link, offset_pos, offset_quat)]
+                while pending:
+                    name, pos, quat = pending.pop(0)
+                    for joint in children[name]:
+                        child = joint.find("child").get("link")
+                        joint_pos, joint_quat = _parse_origin(joint.find("origin"))
+                        child_pos = pos + quat_apply(quat, joint_pos)
+                        child_quat = quat_mul(quat, joint_quat)
+                        if joint.get("type") == "fixed" and merge_fixed_joints:
+                            merge_link(body, child, child_pos, child_quat)
+                            pending.append((child, child_pos, child_quat))
+                        elif joint.get("type") == "fixed":
+                            add_body(child, body, None, child_pos, child_quat)
+                            self._joint_types[-1] = "fixed"
+                            expanded.append((len(self.body_names) - 1, child, *self._identity()))
+                        else:
+                            add_body(child, body, joint, child_pos, child_quat)
+                            expanded.append((len(self.body_names) - 1, child, *self._identity()))
+            queue = expanded
+
+        self._joint_indexes = []
+        dof = 0
+        for joint_type in self._joint_types:
+            if joint_type in ("revolute", "continuous", "prismatic"):
+                self._joint_indexes.append(dof)
+                dof += 1
+            else:
+                self._joint_indexes.append(-1)
+
+    @staticmethod
+    def _identity() -> tuple[torch.Tensor, torch.Tensor]:
+        return torch.zeros(3, dtype=torch.float64), torch.tensor([1.0, 0.0, 0.0, 0.0], dtype=torch.float64)
+
+    @property
+    def num_bodies(self) -> int:
+        return len(self.body_names)
+
+    def forward_kinematics(
+        self, root_pos: torch.Tensor, root_quat: torch.Tensor, joint_pos: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Compute the link poses of all frames in one batched pass.
+
+        Args:
+            root_pos: Root link position. Shape is (T, 3).
+            root_quat: Root link orientation in (w, x, y, z). Shape is (T, 4).
+            joint_pos: Joint positions in :attr:`joint_names` order. Shape is (T, num_joints).
+
+        Returns:
+            The link positions with shape (T, num_bodies, 3) and orientations with shape (T, num_bodies, 4).
+        """
+        num_frames = root_pos.shape[0]
+        dtype, device = root_pos.dtype, root_pos.device
+        body_pos = [root_pos]
+        body_quat = [root_quat]
+        for i in range(1, self.num_bodies):
+            parent = self._parents[i]
+            origin_pos = self._origin_pos[i].to(device, dtype).expand(num_frames, 3)
+            origin_quat = self._origin_quat[i].to(device, dtype).expand(num_frames, 4)
+            pos = body_pos[parent] + quat_apply(body_quat[parent], origin_pos)
+            quat = quat_mul(body_quat[parent], origin_quat)
+            if self._joint_indexes[i] >= 0:
+                q = joint_pos[:, self._joint_indexes[i]]
+                axis = self._axes[i].to(device, dtype).expand(num_frames, 3)
+                if self._joint_types[i] == "prismatic":
+                    pos = pos + quat_apply(quat, axis * q.unsqueeze(-1))
+                else:
+                    quat = quat_mul(quat, quat_from_angle_axis(q, axis))
+            body_pos.append(pos)
+            body_quat.append(quat)
+        return torch.stack(body_pos, dim=1), torch.stack(body_quat, dim=1)
+
+    def com_positions(self, body_pos: torch.Tensor, body_quat: torch.Tensor) -> torch.Tensor:
+        """Center of mass positions of the bodies given their link poses."""
+        coms = torch.stack(self._coms).to(body_pos.device, body_pos.dtype).expand_as(body_pos)
+        return body_pos + quat_apply(body_quat, coms)
+
+
+def lerp(a: torch.Tensor, b: torch.Tensor, blend: torch.Tensor) -> torch.Tensor:
+    """Linear interpolation between two tensors."""
+    return a * (1 - blend) + b * blend
+
+
+def so3_derivative(rotations: torch.Tensor, dt: float) -> torch.Tensor:
+    """Computes the angular velocity of a sequence of rotations by central differences.
+
+    Args:
+        rotations: shape (T, ..., 4).
+        dt: time step.
+    Returns:
+        shape (T, ..., 3).
+    """
+    q_prev, q_next = rotations[:-2], rotations[2:]
+    q_rel = quat_mul(q_next, quat_conjugate(q_prev))
+    omega = axis_angle_from_quat(q_rel) / (2.0 * dt)
+    return torch.cat([omega[:1], omega, omega[-1:]], dim=0)  # repeat first and last sample
+
+
+def convert_motion(
+    motion: np.ndarray,
+    kinematics: UrdfKinematics,
+    input_fps: int,
+    output_fps: int,
+    csv_joint_names: list[str] = G1_JOINT_NAMES,
+) -> dict[str, np.ndarray]:
+    """Resample a motion csv array and compute the maximal coordinates of all bodies.
+
+    Args:
+        motion: The csv rows. Shape is (T, 7 + num_joints): base position, base orientation in (x, y, z, w) and
+            joint positions in ``csv_joint_names`` order.
+        kinematics: The robot kinematics.
+        input_fps: The fps of the csv motion.
+        output_fps: The fps of the output motion.
+        csv_joint_names: The order of the joint columns. Defaults to :data:`G1_JOINT_NAMES`.
+
+    Returns:
+        The arrays of the motion npz file.
+    """
+    motion = torch.from_numpy(motion).to(torch.float64)
+    base_pos_input = motion[:, :3]
+    base_rot_input = motion[:, 3:7][:, [3, 0, 1, 2]]  # convert to wxyz
+    dof_pos_input = torch.zeros(motion.shape[0], len(kinematics.joint_names), dtype=torch.float64)
+    dof_pos_input[:, [kinematics.joint_names.index(name) for name in csv_joint_names]] = motion[:, 7:]
+
+    # interpolate to the output fps
+    input_frames = motion.shape[0]
+    output_dt = 1.0 / output_fps
+    duration = (input_frames - 1) / input_fps
+    times = torch.arange(0, duration, output_dt, dtype=torch.float64)
+    phase = times / duration
+    index_0 = (phase * (input_frames - 1)).floor().long()
+    index_1 = torch.clamp(index_0 + 1, max=input_frames - 1)
+    blend = phase * (input_frames - 1) - index_0
+    base_pos = lerp(base_pos_input[index_0], base_pos_input[index_1], blend.unsqueeze(1))
+    base_rot = quat_slerp(base_rot_input[index_0], base_rot_input[index_1], blend)
+    dof_pos = lerp(dof_pos_input[index_0], dof_pos_input[index_1], blend.unsqueeze(1))
+
+    # maximal coordinates, the velocities are those of the body com as reported by the simulator
+    body_pos_w, body_quat_w = kinematics.forward_kinematics(base_pos, base_rot, dof_pos)
+    body_com_w = kinematics.com_positions(body_pos_w, body_quat_w)
+    body_lin_vel_w = torch.gradient(body_com_w, spacing=output_dt, dim=0)[0]
+    body_ang_vel_w = so3_derivative(body_quat_w, output_dt)
+    dof_vel = torch.gradient(dof_pos, spacing=output_dt, dim=0)[0]
+
+    return {
+        "fps": np.array([output_fps]),
+        "joint_pos": dof_pos.float().numpy(),
+        "joint_vel": dof_vel.float().numpy(),
+        "body_pos_w": body_pos_w.float().numpy(),
+        "body_quat_w": body_quat_w.float().numpy(),
+        "body_lin_vel_w": body_lin_vel_w.float().numpy(),
+        "body_ang_vel_w": body_ang_vel_w.float().numpy(),
+    }
+
+
+"""Worker processes."""
+
+_kinematics: UrdfKinematics | None = None
+
+
+def _init_worker(urdf_path: str):
+    global _kinematics
+    # every worker converts one clip at a time, parallelism comes from the process pool
+    torch.set_num_threads(1)
+    _kinematics = UrdfKinematics(urdf_path)
+
+
+def _convert_file(
+    input_file: str, output_file: str, input_fps: int, output_fps: int, frame_range: tuple[int, int] | None
+) -> str:
+    if frame_range is None:
+        motion = np.loadtxt(input_file, delimiter=",", ndmin=2)
+    else:
+        motion = np.loadtxt(
+            input_file,
+            delimiter=",",
+            skiprows=frame_range[0] - 1,
+            max_rows=frame_range[1] - frame_range[0] + 1,
+            ndmin=2,
+        )
+    np.savez(output_file, **convert_motion(motion, _kinematics, input_fps, output_fps))
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert motion csv files to npz files without Isaac Sim.")
+    parser.add_argument("--input", type=str, required=True, help="A motion csv file or a directory of csv files.")
+    parser.add_argument("--input_fps", type=int, default=30, help="The fps of the input motions.")
+    parser.add_argument(
+        "--frame_range",
+        nargs=2,
+        type=int,
+        metavar=("START", "END"),
+        help=(
+            "frame range: START END (both inclusive) applied to every input. The frame index starts from 1. If not"
+            " provided, all frames will be loaded."
+        ),
+    )
+    parser.add_argument("--output_dir", type=str, required=True, help="The directory of the output npz files.")
+    parser.add_argument("--output_fps", type=int, default=50, help="The fps of the output motions.")
+    parser.add_argument("--urdf", type=str, default=DEFAULT_URDF, help="The URDF of the robot.")
+    parser.add_argument("--num_workers", type=int, default=os.cpu_count(), help="Number of worker processes.")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.input):
+        input_files = sorted(glob.glob(os.path.join(args.input, "*.csv")))
+    else:
+        input_files = [args.input]
+    if len(input_files) == 0:
+        raise FileNotFoundError(f"No motion csv files found in: {args.input}")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    num_workers = max(1, min(args.num_workers, len(input_files)))
+    print(f"[INFO]: Converting {len(input_files)} motions with {num_workers} workers.")
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker, initargs=(args.urdf,)) as executor:
+        futures = [
+            executor.submit(
+                _convert_file,
+                input_file,
+                os.path.join(args.output_dir, os.path.splitext(os.path.basename(input_file))[0] + ".npz"),
+                args.input_fps,
+                args.output_fps,
+                args.frame_range,
+            )
+            for input_file in input_files
+        ]
+        for i, future in enumerate(futures):
+            print(f"[INFO]: ({i + 1}/{len(futures)}) Motion saved to: {future.result()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,16 @@ from isaaclab.app import AppLauncher
 # add argparse arguments
 parser = argparse.ArgumentParser(description="Replay converted motions.")
 parser.add_argument("--registry_name", type=str, required=True, help="The name of the wand registry.")
+parser.add_argument(
+    "--motion_cache_dir", type=str, default=None, help="The local motion cache directory (see MotionCache)."
+)
+parser.add_argument(
+    "--motion_registry_dir",
+    type=str,
+    default=None,
+    help="Fetch the motions from this local registry directory instead of the wandb registry.",
+)
+parser.add_argument("--offline", action="store_true", default=False, help="Only use motions already in the cache.")
 
 # append AppLauncher cli args
 AppLauncher.add_app_launcher_args(parser)
@@ -41,6 +51,7 @@ from isaaclab.utils.assets import ISAAC_NUCLEUS_DIR
 ##
 from whole_body_tracking.robots.g1 import G1_CYLINDER_CFG
 from whole_body_tracking.tasks.tracking.mdp import MotionLoader
+from whole_body_tracking.utils.motion_cache import LocalMotionRegistry, MotionCache
 
 
 @configclass
@@ -70,18 +81,16 @@ def run_simulator(sim: sim_utils.SimulationContext, scene: InteractiveScene):
     registry_name = args_cli.registry_name
     if ":" not in registry_name:  # Check if the registry name includes alias, if not, append ":latest"
         registry_name += ":latest"
-    import pathlib
-
-    import wandb
-
-    api = wandb.Api()
-    artifact = api.artifact(registry_name)
-    motion_file = str(pathlib.Path(artifact.download()) / "motion.npz")
+    registry = LocalMotionRegistry(args_cli.motion_registry_dir) if args_cli.motion_registry_dir else None
+    motion_cache = MotionCache(args_cli.motion_cache_dir, registry=registry, offline=args_cli.offline or None)
+    motion_file = motion_cache.fetch(registry_name)
 
+    # only the root body is replayed, memory-map the file so the other bodies are never read
     motion = MotionLoader(
         motion_file,
         torch.tensor([0], dtype=torch.long, device=sim.device),
         sim.device,
+        mmap=True,
     )
     time_steps = torch.zeros(scene.num_envs, dtype=torch.long, device=sim.device)
 
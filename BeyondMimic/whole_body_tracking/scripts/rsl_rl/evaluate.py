@@ -0,0 +1,191 @@
+"""Script to evaluate a checkpoint of an RL agent from RSL-RL on every clip of a motion set.
+
+Every clip is played from deterministic start frames across all parallel envs until the clip ends or the robot falls.
+The tracking errors reported by the motion command are averaged per clip, and the results are written to a CSV or
+parquet report with one row per clip.
+
+.. code-block:: bash
+
+    # Usage
+    python scripts/rsl_rl/evaluate.py --task=Tracking-Flat-G1-v0 --motion_dir motions/ --load_run {run} --headless \
+    --num_envs 1024 --num_starts 4 --output report.csv
+"""
+
+"""Launch Isaac Sim Simulator first."""
+
+import argparse
+import importlib.util
+import sys
+
+from isaaclab.app import AppLauncher
+
+# local imports
+import cli_args  # isort: skip
+
+# add argparse arguments
+parser = argparse.ArgumentParser(description="Evaluate an RL agent with RSL-RL on a set of motions.")
+parser.add_argument("--num_envs", type=int, default=None, help="Number of environments to simulate.")
+parser.add_argument("--task", type=str, default=None, help="Name of the task.")
+parser.add_argument(
+    "--motion_dir", type=str, nargs="+", required=True, help="The motion npz files or directories to evaluate on."
+)
+parser.add_argument("--num_starts", type=int, default=1, help="Number of evenly spaced start frames per clip.")
+parser.add_argument(
+    "--randomize",
+    action="store_true",
+    default=False,
+    help="Keep the events and observation noise of the task instead of evaluating without randomization.",
+)
+parser.add_argument("--output", type=str, default="evaluation.csv", help="The report file, csv or parquet.")
+# append RSL-RL cli arguments
+cli_args.add_rsl_rl_args(parser)
+# append AppLauncher cli args
+AppLauncher.add_app_launcher_args(parser)
+args_cli, hydra_args = parser.parse_known_args()
+
+# check the report dependencies before launching the simulator
+required_modules = ["pandas", "pyarrow"] if args_cli.output.endswith(".parquet") else ["pandas"]
+missing_modules = [name for name in required_modules if importlib.util.find_spec(name) is None]
+if missing_modules:
+    raise ImportError(
+        f"Writing the report '{args_cli.output}' requires {', '.join(missing_modules)}. Install them with:"
+        " pip install -e source/whole_body_tracking[evaluation]"
+    )
+
+# clear out sys.argv for Hydra
+sys.argv = [sys.argv[0]] + hydra_args
+
+# launch omniverse app
+app_launcher = AppLauncher(args_cli)
+simulation_app = app_launcher.app
+
+"""Rest everything follows."""
+
+import gymnasium as gym
+import os
+import time
+import torch
+
+import pandas as pd
+from rsl_rl.runners import OnPolicyRunner
+
+from isaaclab.envs import ManagerBasedRLEnvCfg
+from isaaclab_rl.rsl_rl import RslRlOnPolicyRunnerCfg, RslRlVecEnvWrapper
+from isaaclab_tasks.utils import get_checkpoint_path
+from isaaclab_tasks.utils.hydra import hydra_task_config
+
+# Import extensions to set up environment tasks
+import whole_body_tracking.tasks  # noqa: F401
+from whole_body_tracking.tasks.tracking.mdp import MotionCommand
+
+
+@hydra_task_config(args_cli.task, "rsl_rl_cfg_entry_point")
+def main(env_cfg: ManagerBasedRLEnvCfg, agent_cfg: RslRlOnPolicyRunnerCfg):
+    """Evaluate with RSL-RL agent."""
+    agent_cfg = cli_args.update_rsl_rl_cfg(agent_cfg, args_cli)
+    env_cfg.scene.num_envs = args_cli.num_envs if args_cli.num_envs is not None else env_cfg.scene.num_envs
+    env_cfg.seed = agent_cfg.seed
+    env_cfg.sim.device = args_cli.device if args_cli.device is not None else env_cfg.sim.device
+    env_cfg.commands.motion.motion_file = args_cli.motion_dir
+    env_cfg.commands.motion.motion_mmap = True
+    env_cfg.commands.motion.debug_vis = False
+    if not args_cli.randomize:
+        env_cfg.commands.motion.pose_range = {}
+        env_cfg.commands.motion.velocity_range = {}
+        env_cfg.commands.motion.joint_position_range = (0.0, 0.0)
+        env_cfg.observations.policy.enable_corruption = False
+        for name in list(env_cfg.events.to_dict()):
+            setattr(env_cfg.events, name, None)
+
+    log_root_path = os.path.abspath(os.path.join("logs", "rsl_rl", agent_cfg.experiment_name))
+    resume_path = get_checkpoint_path(log_root_path, agent_cfg.load_run, agent_cfg.load_checkpoint)
+    print(f"[INFO]: Loading model checkpoint from: {resume_path}")
+
+    env = RslRlVecEnvWrapper(gym.make(args_cli.task, cfg=env_cfg))
+    runner = OnPolicyRunner(env, agent_cfg.to_dict(), log_dir=None, device=agent_cfg.device)
+    runner.load(resume_path)
+    policy = runner.get_inference_policy(device=env.unwrapped.device)
+
+    command: MotionCommand = env.unwrapped.command_manager.get_term("motion")
+    motion = command.motion
+    device = env.unwrapped.device
+    num_envs = env.num_envs
+    # the rollouts end with the clips, never with a time out
+    env.unwrapped.cfg.episode_length_s = (int(motion.clip_lengths.max()) + 1) * env.unwrapped.step_dt
+
+    # rollouts: every clip from num_starts evenly spaced start frames
+    rollout_clip_ids = torch.arange(motion.num_clips, device=device).repeat_interleave(args_cli.num_starts)
+    rollout_starts = torch.arange(args_cli.num_starts, device=device).repeat(motion.num_clips)
+    rollout_starts = rollout_starts * motion.clip_lengths[rollout_clip_ids] // args_cli.num_starts
+    num_rollouts = len(rollout_clip_ids)
+
+    metric_names = [name for name in command.metrics if name.startswith("error_")]
+    metric_sums = torch.zeros(num_rollouts, len(metric_names), device=device)
+    num_steps = torch.zeros(num_rollouts, device=device)
+    fallen = torch.zeros(num_rollouts, dtype=torch.bool, device=device)
+
+    start_time = time.time()
+    for first in range(0, num_rollouts, num_envs):
+        rollout_ids = torch.arange(first, min(first + num_envs, num_rollouts), device=device)
+        env_ids = torch.arange(len(rollout_ids), device=device)
+        command.schedule_starts(env_ids, rollout_clip_ids[rollout_ids], rollout_starts[rollout_ids])
+        obs, _ = env.reset()
+
+        # an env is active until its clip ends or it terminates, envs beyond the rollouts never are
+        active = torch.zeros(num_envs, dtype=torch.bool, device=device)
+        active[env_ids] = True
+        remaining = torch.zeros(num_envs, dtype=torch.long, device=device)
+        remaining[env_ids] = motion.clip_lengths[rollout_clip_ids[rollout_ids]] - rollout_starts[rollout_ids] - 1
+        while bool(active.any()):
+            with torch.inference_mode():
+                obs, _, dones, _ = env.step(policy(obs))
+            dones = dones.bool()
+            terminated = env.unwrapped.termination_manager.terminated
+            fallen[rollout_ids] |= (active & terminated)[env_ids]
+            # the metrics of the reset envs already belong to their next episode
+            active &= ~dones
+            metrics = torch.stack([command.metrics[name] for name in metric_names], dim=-1)
+            metric_sums[rollout_ids] += (metrics * active.unsqueeze(-1))[env_ids]
+            num_steps[rollout_ids] += active[env_ids]
+            remaining -= 1
+            active &= remaining > 0
+        elapsed = time.time() - start_time
+        print(f"[INFO]: Evaluated {first + len(rollout_ids)}/{num_rollouts} rollouts ({elapsed:.1f} s).")
+
+    # aggregate the rollouts per clip
+    def per_clip(values: torch.Tensor) -> torch.Tensor:
+        clip_values = torch.zeros((motion.num_clips,) + values.shape[1:], device=device)
+        return clip_values.index_add_(0, rollout_clip_ids, values)
+
+    clip_steps = per_clip(num_steps)
+    clip_metrics = per_clip(metric_sums) / clip_steps.clamp(min=1).unsqueeze(-1)
+    possible_steps = per_clip((motion.clip_lengths[rollout_clip_ids] - rollout_starts - 1).float())
+    report = pd.DataFrame(
+        {
+            "motion_file": motion.motion_files,
+            "num_frames": motion.clip_lengths.cpu().numpy(),
+            "num_rollouts": args_cli.num_starts,
+            "fall_rate": (per_clip(fallen.float()) / args_cli.num_starts).cpu().numpy(),
+            "survival_ratio": (clip_steps / possible_steps.clamp(min=1)).cpu().numpy(),
+            **{name: clip_metrics[:, i].cpu().numpy() for i, name in enumerate(metric_names)},
+        }
+    )
+    report.insert(0, "checkpoint", resume_path)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args_cli.output)), exist_ok=True)
+    if args_cli.output.endswith(".parquet"):
+        report.to_parquet(args_cli.output, index=False)
+    else:
+        report.to_csv(args_cli.output, index=False)
+    print(report.drop(columns=["checkpoint"]).describe().loc[["mean", "max"]].to_string())
+    print(f"[INFO]: Report of {motion.num_clips} clips saved to: {args_cli.output}")
+
+    # close the simulator
+    env.close()
+
+
+if __name__ == "__main__":
+    # run the main function
+    main()
+    # close sim app
+    simulation_app.close()
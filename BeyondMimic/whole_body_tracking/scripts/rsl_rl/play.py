@@ -20,6 +20,15 @@ parser.add_argument(
 parser.add_argument("--num_envs", type=int, default=None, help="Number of environments to simulate.")
 parser.add_argument("--task", type=str, default=None, help="Name of the task.")
 parser.add_argument("--motion_file", type=str, default=None, help="Path to the motion file.")
+parser.add_argument(
+    "--reference_stream",
+    action="store_true",
+    default=False,
+    help=(
+        "Export the policy without the baked reference motion, together with a reference-stream file. Always the"
+        " case for a motion library of several clips."
+    ),
+)
 # append RSL-RL cli arguments
 cli_args.add_rsl_rl_args(parser)
 # append AppLauncher cli args
@@ -40,7 +49,6 @@ simulation_app = app_launcher.app
 
 import gymnasium as gym
 import os
-import pathlib
 import torch
 
 from rsl_rl.runners import OnPolicyRunner
@@ -59,7 +67,12 @@ from isaaclab_tasks.utils.hydra import hydra_task_config
 
 # Import extensions to set up environment tasks
 import whole_body_tracking.tasks  # noqa: F401
-from whole_body_tracking.utils.exporter import attach_onnx_metadata, export_motion_policy_as_onnx
+from whole_body_tracking.utils.exporter import (
+    attach_onnx_metadata,
+    export_motion_policy_as_onnx,
+    export_motion_reference_stream,
+)
+from whole_body_tracking.utils.motion_cache import MotionCache
 
 
 @hydra_task_config(args_cli.task, "rsl_rl_cfg_entry_point")
@@ -104,11 +117,14 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
             print(f"[INFO]: Using motion file from CLI: {args_cli.motion_file}")
             env_cfg.commands.motion.motion_file = args_cli.motion_file
 
-        art = next((a for a in wandb_run.used_artifacts() if a.type == "motions"), None)
-        if art is None:
+        arts = [a for a in wandb_run.used_artifacts() if a.type == "motions"]
+        if len(arts) == 0:
             print("[WARN] No model artifact found in the run.")
         else:
-            env_cfg.commands.motion.motion_file = str(pathlib.Path(art.download()) / "motion.npz")
+            motion_cache = MotionCache()
+            motion_files = [motion_cache.fetch(art.qualified_name) for art in arts]
+            env_cfg.commands.motion.motion_file = motion_files[0] if len(motion_files) == 1 else motion_files
+            env_cfg.commands.motion.motion_tensor_cache = True
 
     else:
         print(f"[INFO] Loading experiment from directory: {log_root_path}")
@@ -152,14 +168,20 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
     #print("RUNNER DIR:", dir(ppo_runner))
     #print("RUNNER DICT:", ppo_runner.__dict__)
 
+    # only a single clip can be baked into the policy, the reference motion of a library is streamed
+    num_clips = env.unwrapped.command_manager.get_term("motion").motion.num_clips
+    reference_stream = args_cli.reference_stream or num_clips > 1
     export_motion_policy_as_onnx(
         env.unwrapped,
         ppo_runner.alg.policy,
         normalizer=ppo_runner.obs_normalizer,
         path=export_model_dir,
         filename="policy.onnx",
+        reference_mode="stream" if reference_stream else "baked",
     )
     attach_onnx_metadata(env.unwrapped, args_cli.wandb_path if args_cli.wandb_path else "none", export_model_dir)
+    if reference_stream:
+        export_motion_reference_stream(env.unwrapped, path=export_model_dir, filename="reference.bin")
     # reset environment
     obs, _ = env.get_observations()
     timestep = 0
@@ -24,7 +24,23 @@ parser.add_argument("--num_envs", type=int, default=None, help="Number of enviro
 parser.add_argument("--task", type=str, default=None, help="Name of the task.")
 parser.add_argument("--seed", type=int, default=None, help="Seed used for the environment")
 parser.add_argument("--max_iterations", type=int, default=None, help="RL Policy training iterations.")
-parser.add_argument("--registry_name", type=str, required=True, help="The name of the wand registry.")
+parser.add_argument(
+    "--registry_name",
+    type=str,
+    nargs="+",
+    required=True,
+    help="The name of the wand registry. Several names are packed into a single multi-clip motion library.",
+)
+parser.add_argument(
+    "--motion_cache_dir", type=str, default=None, help="The local motion cache directory (see MotionCache)."
+)
+parser.add_argument(
+    "--motion_registry_dir",
+    type=str,
+    default=None,
+    help="Fetch the motions from this local registry directory instead of the wandb registry.",
+)
+parser.add_argument("--offline", action="store_true", default=False, help="Only use motions already in the cache.")
 
 # append RSL-RL cli arguments
 cli_args.add_rsl_rl_args(parser)
@@ -65,6 +81,7 @@ from isaaclab_tasks.utils.hydra import hydra_task_config
 
 # Import extensions to set up environment tasks
 import whole_body_tracking.tasks  # noqa: F401
+from whole_body_tracking.utils.motion_cache import LocalMotionRegistry, MotionCache
 from whole_body_tracking.utils.my_on_policy_runner import MotionOnPolicyRunner as OnPolicyRunner
 
 torch.backends.cuda.matmul.allow_tf32 = True
@@ -88,17 +105,18 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
     env_cfg.seed = agent_cfg.seed
     env_cfg.sim.device = args_cli.device if args_cli.device is not None else env_cfg.sim.device
 
-    # load the motion file from the wandb registry
-    registry_name = args_cli.registry_name
-    if ":" not in registry_name:  # Check if the registry name includes alias, if not, append ":latest"
-        registry_name += ":latest"
-    import pathlib
-
-    import wandb
-
-    api = wandb.Api()
-    artifact = api.artifact(registry_name)
-    env_cfg.commands.motion.motion_file = str(pathlib.Path(artifact.download()) / "motion.npz")
+    # load the motion files from the registry through the local cache, only versions not cached yet are downloaded
+    # check if the registry name includes alias, if not, append ":latest"
+    registry_names = [name if ":" in name else name + ":latest" for name in args_cli.registry_name]
+    registry = LocalMotionRegistry(args_cli.motion_registry_dir) if args_cli.motion_registry_dir else None
+    motion_cache = MotionCache(args_cli.motion_cache_dir, registry=registry, offline=args_cli.offline or None)
+    motion_files = [motion_cache.fetch(name) for name in registry_names]
+    env_cfg.commands.motion.motion_file = motion_files[0] if len(motion_files) == 1 else motion_files
+    # the cached motions are immutable, keep their preprocessed tensors next to them
+    env_cfg.commands.motion.motion_tensor_cache = True
+    if isinstance(motion_cache.registry, LocalMotionRegistry) or motion_cache.offline:
+        # the motions are not linked to wandb registry artifacts, also with a WBT_MOTION_REGISTRY directory
+        registry_names = None
 
     # specify directory for logging experiments
     log_root_path = os.path.join("logs", "rsl_rl", agent_cfg.experiment_name)
@@ -133,7 +151,7 @@ def main(env_cfg: ManagerBasedRLEnvCfg | DirectRLEnvCfg | DirectMARLEnvCfg, agen
 
     # create runner from rsl-rl
     runner = OnPolicyRunner(
-        env, agent_cfg.to_dict(), log_dir=log_dir, device=agent_cfg.device, registry_name=registry_name
+        env, agent_cfg.to_dict(), log_dir=log_dir, device=agent_cfg.device, registry_name=registry_names
     )
     # write git state to logs
     runner.add_git_repo_to_log(__file__)
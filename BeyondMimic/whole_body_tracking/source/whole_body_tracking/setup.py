@@ -17,6 +17,11 @@ INSTALL_REQUIRES = [
     "wandb>=0.19",
 ]
 
+# Optional dependencies, e.g. of the evaluation reports of scripts/rsl_rl/evaluate.py
+EXTRAS_REQUIRE = {
+    "evaluation": ["pandas", "pyarrow"],
+}
+
 # Installation operation
 setup(
     name="whole_body_tracking",
@@ -28,6 +33,7 @@ setup(
     description=EXTENSION_TOML_DATA["package"]["description"],
     keywords=EXTENSION_TOML_DATA["package"]["keywords"],
     install_requires=INSTALL_REQUIRES,
+    extras_require=EXTRAS_REQUIRE,
     license="MIT",
     include_package_data=True,
     python_requires=">=3.10",
@@ -0,0 +1,174 @@
+"""Launch Isaac Sim Simulator first."""
+
+from isaaclab.app import AppLauncher
+
+# launch omniverse app
+simulation_app = AppLauncher(headless=True).app
+
+"""Rest everything follows."""
+
+import numpy as np
+import torch
+from types import SimpleNamespace
+
+import pytest
+
+from whole_body_tracking.tasks.tracking.mdp.commands import MotionCommand, MotionCommandCfg
+
+NUM_ENVS = 8
+BODY_NAMES = ["pelvis", "torso", "left_hand", "right_hand"]
+NUM_JOINTS = 5
+CLIP_LENGTHS = (5, 7)
+
+
+class FakeRobot:
+    """Articulation stand-in that keeps its state in tensors and records the written envs."""
+
+    def __init__(self, num_envs: int):
+        self.body_names = BODY_NAMES
+        num_bodies = len(BODY_NAMES)
+        body_quat_w = torch.zeros(num_envs, num_bodies, 4)
+        body_quat_w[..., 0] = 1.0
+        self.data = SimpleNamespace(
+            joint_pos=torch.rand(num_envs, NUM_JOINTS),
+            joint_vel=torch.rand(num_envs, NUM_JOINTS),
+            root_state_w=torch.rand(num_envs, 13),
+            body_pos_w=torch.rand(num_envs, num_bodies, 3),
+            body_quat_w=body_quat_w,
+            body_lin_vel_w=torch.rand(num_envs, num_bodies, 3),
+            body_ang_vel_w=torch.rand(num_envs, num_bodies, 3),
+            soft_joint_pos_limits=torch.tensor([-10.0, 10.0]).repeat(num_envs, NUM_JOINTS, 1),
+        )
+        self.written_env_ids = []
+
+    def find_bodies(self, name_keys, preserve_order=False):
+        return [self.body_names.index(name) for name in name_keys], list(name_keys)
+
+    def write_joint_state_to_sim(self, position, velocity, env_ids=None):
+        self.written_env_ids.append(sorted(torch.as_tensor(env_ids).tolist()))
+        self.data.joint_pos[env_ids] = position
+        self.data.joint_vel[env_ids] = velocity
+
+    def write_root_state_to_sim(self, root_state, env_ids=None):
+        self.data.root_state_w[env_ids] = root_state
+
+
+class FakeScene(dict):
+    env_origins = torch.zeros(NUM_ENVS, 3)
+
+
+@pytest.fixture
+def motion_files(tmp_path):
+    files = []
+    for i, length in enumerate(CLIP_LENGTHS):
+        rng = np.random.default_rng(i)
+        body_quat_w = np.zeros((length, len(BODY_NAMES), 4), dtype=np.float32)
+        body_quat_w[..., 0] = 1.0
+        file = str(tmp_path / f"clip_{i}.npz")
+        np.savez(
+            file,
+            fps=[50],
+            joint_pos=rng.random((length, NUM_JOINTS), dtype=np.float32),
+            joint_vel=rng.random((length, NUM_JOINTS), dtype=np.float32),
+            body_pos_w=rng.random((length, len(BODY_NAMES), 3), dtype=np.float32),
+            body_quat_w=body_quat_w,
+            body_lin_vel_w=rng.random((length, len(BODY_NAMES), 3), dtype=np.float32),
+            body_ang_vel_w=rng.random((length, len(BODY_NAMES), 3), dtype=np.float32),
+        )
+        files.append(file)
+    return files
+
+
+@pytest.fixture
+def command(motion_files):
+    robot = FakeRobot(NUM_ENVS)
+    env = SimpleNamespace(
+        num_envs=NUM_ENVS,
+        device="cpu",
+        scene=FakeScene(robot=robot),
+        cfg=SimpleNamespace(decimation=4, sim=SimpleNamespace(dt=0.005), masked_reset=True),
+        termination_manager=SimpleNamespace(terminated=torch.zeros(NUM_ENVS, dtype=torch.bool)),
+        common_step_counter=0,
+    )
+    cfg = MotionCommandCfg(
+        asset_name="robot",
+        motion_file=motion_files,
+        anchor_body_name="torso",
+        body_names=BODY_NAMES,
+        resampling_time_range=(1.0e9, 1.0e9),
+        debug_vis=False,
+    )
+    command = MotionCommand(cfg, env)
+    # start all envs at the first frame of their clip
+    command.reset_masked(torch.ones(NUM_ENVS, dtype=torch.bool))
+    command.compute(0.02)
+    command.time_steps[:] = 0
+    command.invalidate_reference_frame()
+    robot.written_env_ids.clear()
+    return command
+
+
+def step(command: MotionCommand, env_mask: torch.Tensor):
+    """Masked reset and command update, as done by the env step with masked resets."""
+    command._env.common_step_counter += 1
+    command.reset_masked(env_mask)
+    command.compute(0.02)
+
+
+def test_masked_reset_writes_reset_envs_only(command):
+    """Only the reset envs are resampled and written, the state of the other envs is unchanged."""
+    robot = command.robot
+    joint_pos, joint_vel = robot.data.joint_pos.clone(), robot.data.joint_vel.clone()
+    root_state = robot.data.root_state_w.clone()
+    clip_ids, time_steps = command.clip_ids.clone(), command.time_steps.clone()
+
+    env_mask = torch.zeros(NUM_ENVS, dtype=torch.bool)
+    env_mask[[2, 5]] = True
+    step(command, env_mask)
+
+    assert robot.written_env_ids == [[2, 5]]
+    torch.testing.assert_close(robot.data.joint_pos[~env_mask], joint_pos[~env_mask])
+    torch.testing.assert_close(robot.data.joint_vel[~env_mask], joint_vel[~env_mask])
+    torch.testing.assert_close(robot.data.root_state_w[~env_mask], root_state[~env_mask])
+    torch.testing.assert_close(command.clip_ids[~env_mask], clip_ids[~env_mask])
+    torch.testing.assert_close(command.time_steps[~env_mask], time_steps[~env_mask] + 1)
+    assert not command._pending_resets.any()
+
+
+def test_no_resample_without_selected_envs(command, monkeypatch):
+    """Without reset or clip end, nothing is sampled or written and the sampling distribution is not rebuilt."""
+    num_samples = []
+    sample = command.sampler.sample
+    monkeypatch.setattr(command.sampler, "sample", lambda n: num_samples.append(n) or sample(n))
+
+    for _ in range(3):
+        step(command, torch.zeros(NUM_ENVS, dtype=torch.bool))
+    assert num_samples == []
+    assert command.robot.written_env_ids == []
+    assert not command.sampler._cdf_stale
+    assert torch.all(command.sampler.difficulty == 0.0)
+
+
+def test_clip_end_and_failures(command):
+    """Envs at the end of their clip are resampled, failures are only recorded for the terminated envs."""
+    # env 0 reaches the end of its clip with the next update, env 3 terminates
+    command.time_steps[0] = command.motion.clip_lengths[command.clip_ids[0]] - 1
+    command.invalidate_reference_frame()
+    failed_bin = command.sampler.bin_index(command.clip_ids[3:4], command.time_steps[3:4])
+    command._env.termination_manager.terminated[3] = True
+    env_mask = torch.zeros(NUM_ENVS, dtype=torch.bool)
+    env_mask[3] = True
+    step(command, env_mask)
+
+    assert command.robot.written_env_ids == [[0, 3]]
+    assert torch.all(command.time_steps < command.motion.clip_lengths[command.clip_ids])
+    difficulty = command.sampler.difficulty
+    assert difficulty[failed_bin] > 0.0
+    assert torch.count_nonzero(difficulty) == 1
+
+
+def test_metrics_initialized(command):
+    """All metrics exist from construction on, so that they can be listed before the first step."""
+    metric_names = set(MotionCommand(command.cfg, command._env).metrics)
+    step(command, torch.zeros(NUM_ENVS, dtype=torch.bool))
+    assert set(command.metrics) == metric_names
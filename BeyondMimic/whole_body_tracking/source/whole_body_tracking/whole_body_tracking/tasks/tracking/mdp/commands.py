@@ -1,61 +1,445 @@
 from __future__ import annotations
 
+import glob
+import hashlib
 import math
 import numpy as np
 import os
+import struct
+import tempfile
 import torch
+import zipfile
 from collections.abc import Sequence
 from dataclasses import MISSING
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 from isaaclab.assets import Articulation
 from isaaclab.managers import CommandTerm, CommandTermCfg
 from isaaclab.markers import VisualizationMarkers, VisualizationMarkersCfg
 from isaaclab.markers.config import FRAME_MARKER_CFG
 from isaaclab.utils import configclass
-from isaaclab.utils.math import (
-    quat_apply,
-    quat_error_magnitude,
-    quat_from_euler_xyz,
-    quat_inv,
-    quat_mul,
-    sample_uniform,
-    yaw_quat,
-)
+from isaaclab.utils.math import quat_apply, quat_from_euler_xyz, quat_inv, quat_mul, sample_uniform, yaw_quat
 
 if TYPE_CHECKING:
     from isaaclab.envs import ManagerBasedRLEnv
 
+MOTION_FIELDS = ("joint_pos", "joint_vel", "body_pos_w", "body_quat_w", "body_lin_vel_w", "body_ang_vel_w")
+"""Per-frame arrays stored in a motion npz file (besides ``fps``)."""
+
+
+# channels of MotionCommand.body_tracking_errors
+BODY_POS_ERROR_SQ = 0
+BODY_POS_Z_ERROR = 1
+BODY_ROT_ERROR = 2
+BODY_LIN_VEL_ERROR_SQ = 3
+BODY_ANG_VEL_ERROR_SQ = 4
+
+# channels of MotionCommand.anchor_tracking_errors
+ANCHOR_POS_ERROR_SQ = 0
+ANCHOR_POS_Z_ERROR = 1
+ANCHOR_ROT_ERROR = 2
+ANCHOR_GRAVITY_Z_ERROR = 3
+
+
+def _quat_error_angle(q1: torch.Tensor, q2: torch.Tensor) -> torch.Tensor:
+    """Angle of the rotation ``q1 * q2^-1`` between unit quaternions, same as ``quat_error_magnitude``."""
+    w1, v1 = q1[..., 0], q1[..., 1:]
+    w2, v2 = q2[..., 0], q2[..., 1:]
+    w = w1 * w2 + torch.sum(v1 * v2, dim=-1)
+    v = w2.unsqueeze(-1) * v1 - w1.unsqueeze(-1) * v2 - torch.linalg.cross(v1, v2, dim=-1)
+    return 2.0 * torch.atan2(torch.linalg.norm(v, dim=-1), torch.abs(w))
+
+
+def compute_tracking_errors(
+    body_pos: torch.Tensor,
+    body_quat: torch.Tensor,
+    body_lin_vel: torch.Tensor,
+    body_ang_vel: torch.Tensor,
+    robot_body_pos: torch.Tensor,
+    robot_body_quat: torch.Tensor,
+    robot_body_lin_vel: torch.Tensor,
+    robot_body_ang_vel: torch.Tensor,
+    anchor_pos: torch.Tensor,
+    anchor_quat: torch.Tensor,
+    robot_anchor_pos: torch.Tensor,
+    robot_anchor_quat: torch.Tensor,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Compute all reference tracking errors in one pass.
+
+    Args:
+        body_pos: Reference body positions. Shape is (N, B, 3).
+        body_quat: Reference body orientations in (w, x, y, z). Shape is (N, B, 4).
+        body_lin_vel: Reference body linear velocities. Shape is (N, B, 3).
+        body_ang_vel: Reference body angular velocities. Shape is (N, B, 3).
+        robot_body_pos: Robot body positions. Shape is (N, B, 3).
+        robot_body_quat: Robot body orientations in (w, x, y, z). Shape is (N, B, 4).
+        robot_body_lin_vel: Robot body linear velocities. Shape is (N, B, 3).
+        robot_body_ang_vel: Robot body angular velocities. Shape is (N, B, 3).
+        anchor_pos: Reference anchor position. Shape is (N, 3).
+        anchor_quat: Reference anchor orientation in (w, x, y, z). Shape is (N, 4).
+        robot_anchor_pos: Robot anchor position. Shape is (N, 3).
+        robot_anchor_quat: Robot anchor orientation in (w, x, y, z). Shape is (N, 4).
+
+    Returns:
+        A tuple of the per-body errors with shape (N, B, 5), indexed by the ``BODY_*`` channels, and the anchor
+        errors with shape (N, 4), indexed by the ``ANCHOR_*`` channels.
+    """
+    body_pos_diff = body_pos - robot_body_pos
+    body_errors = torch.stack(
+        [
+            torch.sum(torch.square(body_pos_diff), dim=-1),
+            torch.abs(body_pos_diff[..., 2]),
+            _quat_error_angle(body_quat, robot_body_quat),
+            torch.sum(torch.square(body_lin_vel - robot_body_lin_vel), dim=-1),
+            torch.sum(torch.square(body_ang_vel - robot_body_ang_vel), dim=-1),
+        ],
+        dim=-1,
+    )
+    anchor_pos_diff = anchor_pos - robot_anchor_pos
+    # z-component of the gravity direction (0, 0, -1) projected into the anchor frame is 2 * (x^2 + y^2) - 1
+    anchor_gravity_z_diff = 2.0 * (
+        torch.sum(torch.square(anchor_quat[..., 1:3]), dim=-1)
+        - torch.sum(torch.square(robot_anchor_quat[..., 1:3]), dim=-1)
+    )
+    anchor_errors = torch.stack(
+        [
+            torch.sum(torch.square(anchor_pos_diff), dim=-1),
+            torch.abs(anchor_pos_diff[..., 2]),
+            _quat_error_angle(anchor_quat, robot_anchor_quat),
+            torch.abs(anchor_gravity_z_diff),
+        ],
+        dim=-1,
+    )
+    return body_errors, anchor_errors
+
+
+def resolve_motion_files(motion_file: str | Sequence[str]) -> list[str]:
+    """Expand a motion file specification into an ordered list of npz files.
+
+    Args:
+        motion_file: A path to a single npz file, a directory containing npz files, or a sequence of either.
+
+    Returns:
+        The list of npz files. Directories are expanded in sorted order.
+    """
+    if isinstance(motion_file, str):
+        if os.path.isdir(motion_file):
+            files = sorted(glob.glob(os.path.join(motion_file, "*.npz")))
+            assert len(files) > 0, f"No motion files found in directory: {motion_file}"
+            return files
+        assert os.path.isfile(motion_file), f"Invalid file path: {motion_file}"
+        return [motion_file]
+    return [file for entry in motion_file for file in resolve_motion_files(entry)]
+
+
+def load_motion_arrays(motion_file: str, mmap: bool = False) -> dict[str, np.ndarray]:
+    """Load the arrays stored in a motion npz file.
+
+    Args:
+        motion_file: The npz file to load.
+        mmap: Whether to memory-map the members of the archive instead of reading them. Only uncompressed members
+            (as written by :func:`numpy.savez`) can be mapped, compressed ones are read eagerly. Defaults to False.
+
+    Returns:
+        The arrays keyed by their name in the archive.
+    """
+    if not mmap:
+        with np.load(motion_file) as data:
+            return {key: data[key] for key in data.files}
+
+    arrays = {}
+    with zipfile.ZipFile(motion_file) as archive, open(motion_file, "rb") as f:
+        for info in archive.infolist():
+            key = info.filename.removesuffix(".npy")
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[key] = np.lib.format.read_array(member)
+                continue
+            # skip the local file header to reach the npy member
+            f.seek(info.header_offset)
+            name_length, extra_length = struct.unpack("<HH", f.read(30)[26:30])
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if len(shape) == 0 or dtype.hasobject:
+                f.seek(info.header_offset + 30 + name_length + extra_length)
+                arrays[key] = np.lib.format.read_array(f)
+                continue
+            arrays[key] = np.memmap(
+                motion_file, dtype=dtype, mode="c", shape=shape, order="F" if fortran_order else "C", offset=f.tell()
+            )
+    return arrays
+
+
+def load_motion_clip(
+    motion_file: str,
+    body_indexes: Sequence[int],
+    dtype: torch.dtype = torch.float32,
+    mmap: bool = False,
+    cache: bool = False,
+) -> dict[str, torch.Tensor]:
+    """Load a motion npz file as CPU tensors restricted to the tracked bodies.
+
+    Args:
+        motion_file: The npz file to load.
+        body_indexes: The bodies to keep, in that order.
+        dtype: The dtype of the per-frame tensors. Defaults to float32.
+        mmap: Whether to memory-map the npz file, see :func:`load_motion_arrays`. Defaults to False.
+        cache: Whether to save the preprocessed tensors next to the npz file as ``<name>.<key>.pt`` and to load them
+            from there on the next call. The key covers the file size and modification time, the bodies and the
+            dtype. Defaults to False.
+
+    Returns:
+        The :data:`MOTION_FIELDS` tensors and the ``fps`` of the motion.
+    """
+    body_indexes = torch.as_tensor(body_indexes, dtype=torch.long).cpu()
+    if cache:
+        stat = os.stat(motion_file)
+        key = hashlib.sha256(
+            repr((stat.st_size, stat.st_mtime_ns, body_indexes.tolist(), str(dtype))).encode()
+        ).hexdigest()[:16]
+        cache_file = f"{os.path.splitext(motion_file)[0]}.{key}.pt"
+        if os.path.isfile(cache_file):
+            return torch.load(cache_file, mmap=True, weights_only=True)
+
+    data = load_motion_arrays(motion_file, mmap=mmap)
+    clip = {"fps": torch.from_numpy(np.array(data["fps"]))}
+    for key in MOTION_FIELDS:
+        # body arrays are (frames, bodies, ...), only the tracked bodies are read
+        array = data[key][:, body_indexes.numpy()] if key.startswith("body_") else data[key]
+        clip[key] = torch.from_numpy(np.asarray(array)).to(dtype)
+    del data
+
+    if cache:
+        # the cache is best effort, concurrent writers race on the rename and read-only directories are skipped
+        try:
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_file), prefix=".tmp-", delete=False) as f:
+                torch.save(clip, f)
+            os.replace(f.name, cache_file)
+        except OSError as e:
+            print(f"[WARN]: Could not cache the motion tensors of {motion_file}: {e}")
+    return clip
+
 
 class MotionLoader:
-    def __init__(self, motion_file: str, body_indexes: Sequence[int], device: str = "cpu"):
-        assert os.path.isfile(motion_file), f"Invalid file path: {motion_file}"
-        data = np.load(motion_file)
-        self.fps = data["fps"]
-        self.joint_pos = torch.tensor(data["joint_pos"], dtype=torch.float32, device=device)
-        self.joint_vel = torch.tensor(data["joint_vel"], dtype=torch.float32, device=device)
-        self._body_pos_w = torch.tensor(data["body_pos_w"], dtype=torch.float32, device=device)
-        self._body_quat_w = torch.tensor(data["body_quat_w"], dtype=torch.float32, device=device)
-        self._body_lin_vel_w = torch.tensor(data["body_lin_vel_w"], dtype=torch.float32, device=device)
-        self._body_ang_vel_w = torch.tensor(data["body_ang_vel_w"], dtype=torch.float32, device=device)
+    """Packed library of reference motion clips.
+
+    All clips are concatenated along the time axis into flat per-field tensors. Clip ``i`` occupies the frames
+    ``clip_offsets[i]:clip_offsets[i] + clip_lengths[i]``, so a per-env ``(clip_id, frame)`` cursor is resolved into
+    the flat tensors with a single batched gather (see :meth:`frame_index`). A single npz file is a library with
+    one clip.
+
+    Only the bodies selected by ``body_indexes`` are kept resident, in that order. With ``mmap`` the files are
+    memory-mapped so that the untracked bodies are never read from disk. The tensors are stored in ``dtype``;
+    readers are expected to cast gathered frames to float32 before doing math on them. With ``cache`` the
+    preprocessed tensors of every file are kept next to it and reused on the next start (see
+    :func:`load_motion_clip`).
+    """
+
+    def __init__(
+        self,
+        motion_file: str | Sequence[str],
+        body_indexes: Sequence[int],
+        device: str = "cpu",
+        mmap: bool = False,
+        dtype: torch.dtype = torch.float32,
+        cache: bool = False,
+    ):
+        self.motion_files = resolve_motion_files(motion_file)
         self._body_indexes = body_indexes
+
+        self.fps = None
+        fields = {key: [] for key in MOTION_FIELDS}
+        clip_lengths = []
+        for file in self.motion_files:
+            clip = load_motion_clip(file, body_indexes, dtype=dtype, mmap=mmap, cache=cache)
+            fps = clip.pop("fps").numpy()
+            if self.fps is None:
+                self.fps = fps
+            elif not np.allclose(fps, self.fps):
+                raise ValueError(f"Motion file {file} has fps {fps}, expected {self.fps}.")
+            for key in MOTION_FIELDS:
+                fields[key].append(clip[key])
+            clip_lengths.append(clip["joint_pos"].shape[0])
+            del clip
+
+        def _pack(key: str) -> torch.Tensor:
+            tensors = fields.pop(key)
+            tensor = tensors[0] if len(tensors) == 1 else torch.cat(tensors, dim=0)
+            return tensor.to(device=device)
+
+        self.joint_pos = _pack("joint_pos")
+        self.joint_vel = _pack("joint_vel")
+        self.body_pos_w = _pack("body_pos_w")
+        self.body_quat_w = _pack("body_quat_w")
+        self.body_lin_vel_w = _pack("body_lin_vel_w")
+        self.body_ang_vel_w = _pack("body_ang_vel_w")
+
+        self.num_clips = len(self.motion_files)
+        self.clip_lengths = torch.tensor(clip_lengths, dtype=torch.long, device=device)
+        self.clip_offsets = torch.cumsum(self.clip_lengths, dim=0) - self.clip_lengths
         self.time_step_total = self.joint_pos.shape[0]
 
-    @property
-    def body_pos_w(self) -> torch.Tensor:
-        return self._body_pos_w[:, self._body_indexes]
+    def frame_index(self, clip_ids: torch.Tensor, time_steps: torch.Tensor) -> torch.Tensor:
+        """Flat frame index of the ``(clip_id, frame)`` cursors."""
+        return self.clip_offsets[clip_ids] + time_steps
+
+    def locate(self, frame_indexes: torch.Tensor) -> tuple[torch.Tensor, torch.Tensor]:
+        """Inverse of :meth:`frame_index`: split flat frame indexes into ``(clip_id, frame)`` cursors."""
+        clip_ids = torch.searchsorted(self.clip_offsets, frame_indexes, right=True) - 1
+        return clip_ids, frame_indexes - self.clip_offsets[clip_ids]
+
+
+class AdaptiveSampler:
+    """Failure-driven sampler of start frames over the clips of a :class:`MotionLoader`.
+
+    Every clip is split into ``clip_length // bin_size + 1`` bins of equal length, so no bin straddles two clips. The
+    difficulty of a bin is an exponential moving average (EMA) of the failures recorded in it. Start bins are drawn
+    with probability proportional to the difficulty, smoothed over the following ``kernel_size`` bins of the same
+    clip, plus a uniform share of ``uniform_ratio``.
+
+    The cost of an env step does not grow with the library: the EMA decay is folded into a scalar scale
+    (``difficulty = scale * raw``), recorded failures are scattered into their bins only, and the cumulative
+    distribution (CDF) of the smoothed difficulty is rebuilt lazily only after failures were recorded. Sampling is a
+    mixture of a binary search in that CDF and a uniform draw over the bins.
+
+    Args:
+        clip_lengths: The number of frames of each clip. Shape is (num_clips,).
+        bin_size: The number of frames per bin.
+        kernel_size: The number of bins the difficulty is smoothed over. Defaults to 1.
+        kernel_lambda: The decay of the smoothing kernel weights. Defaults to 0.8.
+        uniform_ratio: The share of the uniform distribution relative to the total difficulty. Defaults to 0.1.
+        alpha: The EMA rate of the difficulty per update. Defaults to 0.001.
+    """
+
+    def __init__(
+        self,
+        clip_lengths: torch.Tensor,
+        bin_size: float,
+        kernel_size: int = 1,
+        kernel_lambda: float = 0.8,
+        uniform_ratio: float = 0.1,
+        alpha: float = 0.001,
+    ):
+        self.device = clip_lengths.device
+        self.uniform_ratio = uniform_ratio
+        self.alpha = alpha
+
+        self.clip_lengths = clip_lengths
+        self.clip_bin_counts = (clip_lengths // bin_size).long() + 1
+        self.clip_bin_offsets = torch.cumsum(self.clip_bin_counts, dim=0) - self.clip_bin_counts
+        self.bin_count = int(self.clip_bin_counts.sum())
+        self.bin_clip_ids = torch.repeat_interleave(
+            torch.arange(len(clip_lengths), device=self.device), self.clip_bin_counts
+        )
+        bins = torch.arange(self.bin_count, device=self.device)
+        self._bin_indexes_in_clip = bins - self.clip_bin_offsets[self.bin_clip_ids]
+
+        # non-causal smoothing window, replicating the last bin of each clip instead of reaching into the next clip
+        kernel = torch.tensor([kernel_lambda**i for i in range(kernel_size)], device=self.device)
+        self._kernel = kernel / kernel.sum()
+        last_bins = (self.clip_bin_offsets + self.clip_bin_counts - 1)[self.bin_clip_ids]
+        self._window = torch.minimum(
+            bins.unsqueeze(1) + torch.arange(kernel_size, device=self.device), last_bins.unsqueeze(1)
+        )
+
+        self._raw_difficulty = torch.zeros(self.bin_count, device=self.device)
+        self._scale = 1.0
+        self._pending_bins: list[torch.Tensor] = []
+        self._pending_weights: list[torch.Tensor] = []
+        self._cdf = torch.zeros(self.bin_count, device=self.device)
+        self._cdf_stale = False
+        self._summary: tuple[torch.Tensor, torch.Tensor, torch.Tensor] | None = None
 
     @property
-    def body_quat_w(self) -> torch.Tensor:
-        return self._body_quat_w[:, self._body_indexes]
+    def difficulty(self) -> torch.Tensor:
+        """EMA of the failures recorded in each bin. Shape is (bin_count,)."""
+        return self._raw_difficulty * self._scale
 
     @property
-    def body_lin_vel_w(self) -> torch.Tensor:
-        return self._body_lin_vel_w[:, self._body_indexes]
+    def clip_difficulty(self) -> torch.Tensor:
+        """Total difficulty of the bins of each clip. Shape is (num_clips,)."""
+        return torch.zeros(len(self.clip_lengths), device=self.device).index_add_(
+            0, self.bin_clip_ids, self.difficulty
+        )
 
     @property
-    def body_ang_vel_w(self) -> torch.Tensor:
-        return self._body_ang_vel_w[:, self._body_indexes]
+    def probabilities(self) -> torch.Tensor:
+        """Probability of each bin to be sampled. Shape is (bin_count,)."""
+        smoothed = (self._raw_difficulty[self._window] * self._kernel).sum(dim=-1) * self._scale
+        probabilities = smoothed + self.uniform_ratio / self.bin_count
+        return probabilities / probabilities.sum()
+
+    def bin_index(self, clip_ids: torch.Tensor, time_steps: torch.Tensor) -> torch.Tensor:
+        """Bin of the ``(clip_id, frame)`` cursors."""
+        clip_bin_counts = self.clip_bin_counts[clip_ids]
+        bins_in_clip = (time_steps * clip_bin_counts) // self.clip_lengths[clip_ids]
+        return self.clip_bin_offsets[clip_ids] + torch.clamp(bins_in_clip, max=clip_bin_counts - 1)
+
+    def record_failures(self, clip_ids: torch.Tensor, time_steps: torch.Tensor, mask: torch.Tensor | None = None):
+        """Record failures at the ``(clip_id, frame)`` cursors, they are applied on the next :meth:`update`.
+
+        With ``mask``, only the cursors where it is true are failures. This avoids selecting them on the host.
+        """
+        bins = self.bin_index(clip_ids, time_steps)
+        self._pending_bins.append(bins)
+        self._pending_weights.append(torch.ones_like(bins, dtype=torch.float) if mask is None else mask.float())
+
+    def update(self):
+        """Advance the difficulty EMA by one step."""
+        self._scale *= 1.0 - self.alpha
+        if self._pending_bins:
+            bins = torch.cat(self._pending_bins)
+            increments = torch.cat(self._pending_weights) * (self.alpha / self._scale)
+            self._pending_bins.clear()
+            self._pending_weights.clear()
+            self._raw_difficulty.index_add_(0, bins, increments)
+            self._cdf_stale = True
+        if self._scale < 1e-6:
+            # fold the scale back before the raw values lose precision
+            self._raw_difficulty *= self._scale
+            self._scale = 1.0
+            self._cdf_stale = True
+        self._summary = None
+
+    def sample(self, num_samples: int) -> tuple[torch.Tensor, torch.Tensor]:
+        """Sample start cursors.
+
+        Args:
+            num_samples: The number of cursors to sample.
+
+        Returns:
+            The clip ids and the frames within the clips. Shape is (num_samples,).
+        """
+        if self._cdf_stale:
+            self._cdf = torch.cumsum((self._raw_difficulty[self._window] * self._kernel).sum(dim=-1), dim=0)
+            self._cdf_stale = False
+        failure_weight = self._cdf[-1] * self._scale
+        draws = torch.rand(num_samples, device=self.device) * (failure_weight + self.uniform_ratio)
+        failure_bins = torch.searchsorted(self._cdf, (draws / self._scale).unsqueeze(-1), right=True).squeeze(-1)
+        # draws beyond the failure weight are uniform over the uniform share
+        uniform_bins = ((draws - failure_weight) / max(self.uniform_ratio, 1e-12) * self.bin_count).long()
+        bins = torch.where(draws < failure_weight, failure_bins, uniform_bins).clamp(0, self.bin_count - 1)
+
+        clip_ids = self.bin_clip_ids[bins]
+        phases = self._bin_indexes_in_clip[bins] + torch.rand(num_samples, device=self.device)
+        phases = phases / self.clip_bin_counts[clip_ids]
+        return clip_ids, (phases * (self.clip_lengths[clip_ids] - 1)).long()
+
+    def summary(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Normalized entropy, top-1 probability and relative position of the top-1 bin of the sampling distribution.
+
+        The values are computed at most once per :meth:`update`.
+        """
+        if self._summary is None:
+            probabilities = self.probabilities
+            entropy = -(probabilities * (probabilities + 1e-12).log()).sum() / max(math.log(self.bin_count), 1e-12)
+            top1_prob, top1_bin = probabilities.max(dim=0)
+            self._summary = (entropy, top1_prob, top1_bin.float() / self.bin_count)
+        return self._summary
 
 
 class MotionCommand(CommandTerm):
@@ -71,19 +455,52 @@ class MotionCommand(CommandTerm):
             self.robot.find_bodies(self.cfg.body_names, preserve_order=True)[0], dtype=torch.long, device=self.device
         )
 
-        self.motion = MotionLoader(self.cfg.motion_file, self.body_indexes, device=self.device)
+        self.motion = MotionLoader(
+            self.cfg.motion_file,
+            self.body_indexes,
+            device=self.device,
+            mmap=self.cfg.motion_mmap,
+            dtype=getattr(torch, self.cfg.motion_dtype),
+            cache=self.cfg.motion_tensor_cache,
+        )
+        self.clip_ids = torch.zeros(self.num_envs, dtype=torch.long, device=self.device)
         self.time_steps = torch.zeros(self.num_envs, dtype=torch.long, device=self.device)
+        # reference frame of every env at its current cursor, gathered once per cursor update
+        self._reference_frame = {
+            key: torch.zeros((self.num_envs,) + getattr(self.motion, key).shape[1:], device=self.device)
+            for key in MOTION_FIELDS
+        }
+        self._reference_frame_stale = True
+        # host-side number of steps before the first env reaches the end of its clip, None when unknown
+        self._steps_to_clip_end: int | None = None
+        # tracking errors shared by the rewards, terminations and metrics, computed once per env step
+        if self.cfg.tracking_error_backend == "jit":
+            self._compute_tracking_errors = torch.jit.script(compute_tracking_errors)
+        elif self.cfg.tracking_error_backend == "compile":
+            self._compute_tracking_errors = torch.compile(compute_tracking_errors)
+        else:
+            self._compute_tracking_errors = compute_tracking_errors
+        self._tracking_errors_step = -1
+        self._body_indexes_cache: dict[tuple[str, ...], torch.Tensor] = {}
         self.body_pos_relative_w = torch.zeros(self.num_envs, len(cfg.body_names), 3, device=self.device)
         self.body_quat_relative_w = torch.zeros(self.num_envs, len(cfg.body_names), 4, device=self.device)
         self.body_quat_relative_w[:, :, 0] = 1.0
 
-        self.bin_count = int(self.motion.time_step_total // (1 / (env.cfg.decimation * env.cfg.sim.dt))) + 1
-        self.bin_failed_count = torch.zeros(self.bin_count, dtype=torch.float, device=self.device)
-        self._current_bin_failed = torch.zeros(self.bin_count, dtype=torch.float, device=self.device)
-        self.kernel = torch.tensor(
-            [self.cfg.adaptive_lambda**i for i in range(self.cfg.adaptive_kernel_size)], device=self.device
+        # one second of motion per bin
+        self.sampler = AdaptiveSampler(
+            self.motion.clip_lengths,
+            bin_size=1 / (env.cfg.decimation * env.cfg.sim.dt),
+            kernel_size=self.cfg.adaptive_kernel_size,
+            kernel_lambda=self.cfg.adaptive_lambda,
+            uniform_ratio=self.cfg.adaptive_uniform_ratio,
+            alpha=self.cfg.adaptive_alpha,
         )
-        self.kernel = self.kernel / self.kernel.sum()
+        # start cursors that replace the sampled one at the next resample of an env, see schedule_starts
+        self._scheduled = torch.zeros(self.num_envs, dtype=torch.bool, device=self.device)
+        self._scheduled_clip_ids = torch.zeros(self.num_envs, dtype=torch.long, device=self.device)
+        self._scheduled_time_steps = torch.zeros(self.num_envs, dtype=torch.long, device=self.device)
+        # envs reset with a mask, resampled on the next update, see _resample_command_masked
+        self._pending_resets = torch.zeros(self.num_envs, dtype=torch.bool, device=self.device)
 
         self.metrics["error_anchor_pos"] = torch.zeros(self.num_envs, device=self.device)
         self.metrics["error_anchor_rot"] = torch.zeros(self.num_envs, device=self.device)
@@ -91,6 +508,8 @@ class MotionCommand(CommandTerm):
         self.metrics["error_anchor_ang_vel"] = torch.zeros(self.num_envs, device=self.device)
         self.metrics["error_body_pos"] = torch.zeros(self.num_envs, device=self.device)
         self.metrics["error_body_rot"] = torch.zeros(self.num_envs, device=self.device)
+        self.metrics["error_body_lin_vel"] = torch.zeros(self.num_envs, device=self.device)
+        self.metrics["error_body_ang_vel"] = torch.zeros(self.num_envs, device=self.device)
         self.metrics["error_joint_pos"] = torch.zeros(self.num_envs, device=self.device)
         self.metrics["error_joint_vel"] = torch.zeros(self.num_envs, device=self.device)
         self.metrics["sampling_entropy"] = torch.zeros(self.num_envs, device=self.device)
@@ -101,45 +520,50 @@ class MotionCommand(CommandTerm):
     def command(self) -> torch.Tensor:  # TODO Consider again if this is the best observation
         return torch.cat([self.joint_pos, self.joint_vel], dim=1)
 
+    @property
+    def frame_indexes(self) -> torch.Tensor:
+        """Index of each env's ``(clip_ids, time_steps)`` cursor into the flat motion library."""
+        return self.motion.frame_index(self.clip_ids, self.time_steps)
+
     @property
     def joint_pos(self) -> torch.Tensor:
-        return self.motion.joint_pos[self.time_steps]
+        return self._get_reference_frame("joint_pos")
 
     @property
     def joint_vel(self) -> torch.Tensor:
-        return self.motion.joint_vel[self.time_steps]
+        return self._get_reference_frame("joint_vel")
 
     @property
     def body_pos_w(self) -> torch.Tensor:
-        return self.motion.body_pos_w[self.time_steps] + self._env.scene.env_origins[:, None, :]
+        return self._get_reference_frame("body_pos_w")
 
     @property
     def body_quat_w(self) -> torch.Tensor:
-        return self.motion.body_quat_w[self.time_steps]
+        return self._get_reference_frame("body_quat_w")
 
     @property
     def body_lin_vel_w(self) -> torch.Tensor:
-        return self.motion.body_lin_vel_w[self.time_steps]
+        return self._get_reference_frame("body_lin_vel_w")
 
     @property
     def body_ang_vel_w(self) -> torch.Tensor:
-        return self.motion.body_ang_vel_w[self.time_steps]
+        return self._get_reference_frame("body_ang_vel_w")
 
     @property
     def anchor_pos_w(self) -> torch.Tensor:
-        return self.motion.body_pos_w[self.time_steps, self.motion_anchor_body_index] + self._env.scene.env_origins
+        return self.body_pos_w[:, self.motion_anchor_body_index]
 
     @property
     def anchor_quat_w(self) -> torch.Tensor:
-        return self.motion.body_quat_w[self.time_steps, self.motion_anchor_body_index]
+        return self.body_quat_w[:, self.motion_anchor_body_index]
 
     @property
     def anchor_lin_vel_w(self) -> torch.Tensor:
-        return self.motion.body_lin_vel_w[self.time_steps, self.motion_anchor_body_index]
+        return self.body_lin_vel_w[:, self.motion_anchor_body_index]
 
     @property
     def anchor_ang_vel_w(self) -> torch.Tensor:
-        return self.motion.body_ang_vel_w[self.time_steps, self.motion_anchor_body_index]
+        return self.body_ang_vel_w[:, self.motion_anchor_body_index]
 
     @property
     def robot_joint_pos(self) -> torch.Tensor:
@@ -181,69 +605,134 @@ class MotionCommand(CommandTerm):
     def robot_anchor_ang_vel_w(self) -> torch.Tensor:
         return self.robot.data.body_ang_vel_w[:, self.robot_anchor_body_index]
 
+    @property
+    def body_tracking_errors(self) -> torch.Tensor:
+        """Per-body tracking errors. Shape is (num_envs, num_bodies, 5), see the ``BODY_*`` channels."""
+        self._update_tracking_errors()
+        return self._body_tracking_errors
+
+    @property
+    def anchor_tracking_errors(self) -> torch.Tensor:
+        """Anchor tracking errors. Shape is (num_envs, 4), see the ``ANCHOR_*`` channels."""
+        self._update_tracking_errors()
+        return self._anchor_tracking_errors
+
+    def get_body_indexes(self, body_names: list[str] | None) -> torch.Tensor | slice:
+        """Indexes of ``body_names`` into :attr:`MotionCommandCfg.body_names`, resolved once per name list."""
+        if body_names is None:
+            return slice(None)
+        key = tuple(body_names)
+        if key not in self._body_indexes_cache:
+            self._body_indexes_cache[key] = torch.tensor(
+                [i for i, name in enumerate(self.cfg.body_names) if name in body_names],
+                dtype=torch.long,
+                device=self.device,
+            )
+        return self._body_indexes_cache[key]
+
+    def invalidate_reference_frame(self):
+        """Mark the cached reference frame and tracking errors as stale.
+
+        Must be called after writing :attr:`clip_ids` or :attr:`time_steps` from outside this class.
+        """
+        self._reference_frame_stale = True
+        self._tracking_errors_step = -1
+        # the cursors may have jumped, the distance to the nearest clip end is recomputed on the next update
+        self._steps_to_clip_end = None
+
+    def schedule_starts(self, env_ids: Sequence[int], clip_ids: torch.Tensor, time_steps: torch.Tensor):
+        """Start the next episode of the envs at the given cursors instead of adaptively sampled ones.
+
+        This makes the start frames deterministic, e.g. for evaluation. The override applies to the next resample of
+        each env only.
+
+        Args:
+            env_ids: The envs to schedule.
+            clip_ids: The clip to start from. Shape is (len(env_ids),).
+            time_steps: The frame of the clip to start from. Shape is (len(env_ids),).
+        """
+        self._scheduled[env_ids] = True
+        self._scheduled_clip_ids[env_ids] = clip_ids
+        self._scheduled_time_steps[env_ids] = time_steps
+
+    def _update_tracking_errors(self):
+        # the robot state only changes with the env step, the reference only with the cursor
+        if self._tracking_errors_step == self._env.common_step_counter:
+            return
+        self._body_tracking_errors, self._anchor_tracking_errors = self._compute_tracking_errors(
+            self.body_pos_relative_w,
+            self.body_quat_relative_w,
+            self.body_lin_vel_w,
+            self.body_ang_vel_w,
+            self.robot_body_pos_w,
+            self.robot_body_quat_w,
+            self.robot_body_lin_vel_w,
+            self.robot_body_ang_vel_w,
+            self.anchor_pos_w,
+            self.anchor_quat_w,
+            self.robot_anchor_pos_w,
+            self.robot_anchor_quat_w,
+        )
+        self._tracking_errors_step = self._env.common_step_counter
+
+    def _get_reference_frame(self, key: str) -> torch.Tensor:
+        """Reference motion field at the current cursor of every env.
+
+        All fields are gathered together into preallocated float32 buffers the first time one of them is read after
+        the cursor moved. The returned tensors are overwritten on the next gather and must not be modified.
+        """
+        if self._reference_frame_stale:
+            frame_indexes = self.frame_indexes
+            for name, buffer in self._reference_frame.items():
+                data = getattr(self.motion, name)
+                if data.dtype == buffer.dtype:
+                    torch.index_select(data, 0, frame_indexes, out=buffer)
+                else:
+                    buffer.copy_(data[frame_indexes])
+            self._reference_frame["body_pos_w"] += self._env.scene.env_origins[:, None, :]
+            self._reference_frame_stale = False
+        return self._reference_frame[key]
+
     def _update_metrics(self):
-        self.metrics["error_anchor_pos"] = torch.norm(self.anchor_pos_w - self.robot_anchor_pos_w, dim=-1)
-        self.metrics["error_anchor_rot"] = quat_error_magnitude(self.anchor_quat_w, self.robot_anchor_quat_w)
+        body_errors = self.body_tracking_errors
+        anchor_errors = self.anchor_tracking_errors
+        self.metrics["error_anchor_pos"] = torch.sqrt(anchor_errors[:, ANCHOR_POS_ERROR_SQ])
+        self.metrics["error_anchor_rot"] = anchor_errors[:, ANCHOR_ROT_ERROR]
         self.metrics["error_anchor_lin_vel"] = torch.norm(self.anchor_lin_vel_w - self.robot_anchor_lin_vel_w, dim=-1)
         self.metrics["error_anchor_ang_vel"] = torch.norm(self.anchor_ang_vel_w - self.robot_anchor_ang_vel_w, dim=-1)
 
-        self.metrics["error_body_pos"] = torch.norm(self.body_pos_relative_w - self.robot_body_pos_w, dim=-1).mean(
-            dim=-1
-        )
-        self.metrics["error_body_rot"] = quat_error_magnitude(self.body_quat_relative_w, self.robot_body_quat_w).mean(
-            dim=-1
-        )
+        self.metrics["error_body_pos"] = torch.sqrt(body_errors[..., BODY_POS_ERROR_SQ]).mean(dim=-1)
+        self.metrics["error_body_rot"] = body_errors[..., BODY_ROT_ERROR].mean(dim=-1)
 
-        self.metrics["error_body_lin_vel"] = torch.norm(self.body_lin_vel_w - self.robot_body_lin_vel_w, dim=-1).mean(
-            dim=-1
-        )
-        self.metrics["error_body_ang_vel"] = torch.norm(self.body_ang_vel_w - self.robot_body_ang_vel_w, dim=-1).mean(
-            dim=-1
-        )
+        self.metrics["error_body_lin_vel"] = torch.sqrt(body_errors[..., BODY_LIN_VEL_ERROR_SQ]).mean(dim=-1)
+        self.metrics["error_body_ang_vel"] = torch.sqrt(body_errors[..., BODY_ANG_VEL_ERROR_SQ]).mean(dim=-1)
 
         self.metrics["error_joint_pos"] = torch.norm(self.joint_pos - self.robot_joint_pos, dim=-1)
         self.metrics["error_joint_vel"] = torch.norm(self.joint_vel - self.robot_joint_vel, dim=-1)
 
-    def _adaptive_sampling(self, env_ids: Sequence[int]):
-        episode_failed = self._env.termination_manager.terminated[env_ids]
-        if torch.any(episode_failed):
-            current_bin_index = torch.clamp(
-                (self.time_steps * self.bin_count) // max(self.motion.time_step_total, 1), 0, self.bin_count - 1
-            )
-            fail_bins = current_bin_index[env_ids][episode_failed]
-            self._current_bin_failed[:] = torch.bincount(fail_bins, minlength=self.bin_count)
-
-        # Sample
-        sampling_probabilities = self.bin_failed_count + self.cfg.adaptive_uniform_ratio / float(self.bin_count)
-        sampling_probabilities = torch.nn.functional.pad(
-            sampling_probabilities.unsqueeze(0).unsqueeze(0),
-            (0, self.cfg.adaptive_kernel_size - 1),  # Non-causal kernel
-            mode="replicate",
-        )
-        sampling_probabilities = torch.nn.functional.conv1d(sampling_probabilities, self.kernel.view(1, 1, -1)).view(-1)
-
-        sampling_probabilities = sampling_probabilities / sampling_probabilities.sum()
-
-        sampled_bins = torch.multinomial(sampling_probabilities, len(env_ids), replacement=True)
+    def _adaptive_sampling(self, env_ids: Sequence[int], record_failures: bool = True):
+        if record_failures:
+            # note: masked instead of selecting the failed envs, which would synchronize with the device
+            episode_failed = self._env.termination_manager.terminated[env_ids]
+            self.sampler.record_failures(self.clip_ids[env_ids], self.time_steps[env_ids], mask=episode_failed)
 
-        self.time_steps[env_ids] = (
-            (sampled_bins + sample_uniform(0.0, 1.0, (len(env_ids),), device=self.device))
-            / self.bin_count
-            * (self.motion.time_step_total - 1)
-        ).long()
+        clip_ids, time_steps = self.sampler.sample(len(env_ids))
+        scheduled = self._scheduled[env_ids]
+        self.clip_ids[env_ids] = torch.where(scheduled, self._scheduled_clip_ids[env_ids], clip_ids)
+        self.time_steps[env_ids] = torch.where(scheduled, self._scheduled_time_steps[env_ids], time_steps)
+        self._scheduled[env_ids] = False
+        self.invalidate_reference_frame()
 
         # Metrics
-        H = -(sampling_probabilities * (sampling_probabilities + 1e-12).log()).sum()
-        H_norm = H / math.log(self.bin_count)
-        pmax, imax = sampling_probabilities.max(dim=0)
-        self.metrics["sampling_entropy"][:] = H_norm
-        self.metrics["sampling_top1_prob"][:] = pmax
-        self.metrics["sampling_top1_bin"][:] = imax.float() / self.bin_count
-
-    def _resample_command(self, env_ids: Sequence[int]):
+        entropy, top1_prob, top1_bin = self.sampler.summary()
+        self.metrics["sampling_entropy"][:] = entropy
+        self.metrics["sampling_top1_prob"][:] = top1_prob
+        self.metrics["sampling_top1_bin"][:] = top1_bin
+
+    def _resample_command(self, env_ids: Sequence[int], record_failures: bool = True):
         if len(env_ids) == 0:
             return
-        self._adaptive_sampling(env_ids)
+        self._adaptive_sampling(env_ids, record_failures)
 
         root_pos = self.body_pos_w[:, 0].clone()
         root_ori = self.body_quat_w[:, 0].clone()
@@ -276,10 +765,53 @@ class MotionCommand(CommandTerm):
             env_ids=env_ids,
         )
 
+    def _resample_command_masked(self, env_mask: torch.Tensor):
+        # the reset envs are resampled together with the envs at the end of their clip in the next update, so that
+        # the start states are sampled and written once per step and only for the selected envs
+        self._pending_resets |= env_mask
+
+    def _resample_pending(self):
+        """Resample the envs reset since the last update and the envs at the end of their clip.
+
+        With masked resets, this is the only synchronization of the command per step: the numbers of envs to resample
+        and of failures are read back together. Nothing is sampled or written if no env is selected, and the failures
+        are only recorded for the envs that were reset after a termination.
+        """
+        failed = self._pending_resets & self._env.termination_manager.terminated
+        resample = self._pending_resets | (self.time_steps >= self.motion.clip_lengths[self.clip_ids])
+        self._pending_resets.zero_()
+        # 2 for the failed envs, 1 for the other envs to resample, 0 otherwise
+        code = resample.long() + failed.long()
+        num_resampled, num_failed = torch.stack([(code > 0).sum(), (code == 2).sum()]).tolist()
+        if num_resampled == 0:
+            return
+        # the failed envs are sorted first, followed by the other envs to resample
+        env_ids = torch.argsort(code, descending=True, stable=True)[:num_resampled]
+        if num_failed > 0:
+            failed_env_ids = env_ids[:num_failed]
+            # the cursors of the failed envs were advanced once since their termination
+            self.sampler.record_failures(self.clip_ids[failed_env_ids], self.time_steps[failed_env_ids] - 1)
+        self._resample_command(env_ids, record_failures=False)
+
     def _update_command(self):
+        steps_to_clip_end = self._steps_to_clip_end
         self.time_steps += 1
-        env_ids = torch.where(self.time_steps >= self.motion.time_step_total)[0]
-        self._resample_command(env_ids)
+        self.invalidate_reference_frame()
+        if self._env.cfg.masked_reset:
+            self._resample_pending()
+        else:
+            # the search for the envs at the end of their clip synchronizes with the device, so it is skipped while
+            # the host knows that no clip can end yet. The distance is only read back after the cursors were resampled.
+            if steps_to_clip_end is None:
+                steps_to_clip_end = int(torch.min(self.motion.clip_lengths[self.clip_ids] - self.time_steps))
+            else:
+                steps_to_clip_end -= 1
+            if steps_to_clip_end <= 0:
+                env_ids = torch.where(self.time_steps >= self.motion.clip_lengths[self.clip_ids])[0]
+                # the failures are only recorded at the resets of the envs
+                self._resample_command(env_ids, record_failures=False)
+            else:
+                self._steps_to_clip_end = steps_to_clip_end
 
         anchor_pos_w_repeat = self.anchor_pos_w[:, None, :].repeat(1, len(self.cfg.body_names), 1)
         anchor_quat_w_repeat = self.anchor_quat_w[:, None, :].repeat(1, len(self.cfg.body_names), 1)
@@ -293,10 +825,7 @@ class MotionCommand(CommandTerm):
         self.body_quat_relative_w = quat_mul(delta_ori_w, self.body_quat_w)
         self.body_pos_relative_w = delta_pos_w + quat_apply(delta_ori_w, self.body_pos_w - anchor_pos_w_repeat)
 
-        self.bin_failed_count = (
-            self.cfg.adaptive_alpha * self._current_bin_failed + (1 - self.cfg.adaptive_alpha) * self.bin_failed_count
-        )
-        self._current_bin_failed.zero_()
+        self.sampler.update()
 
     def _set_debug_vis_impl(self, debug_vis: bool):
         if debug_vis:
@@ -356,7 +885,17 @@ class MotionCommandCfg(CommandTermCfg):
 
     asset_name: str = MISSING
 
-    motion_file: str = MISSING
+    motion_file: str | list[str] = MISSING
+    """Reference motion npz file, a directory of npz files, or a list of either.
+
+    Multiple clips are packed into one motion library and every env tracks its own clip.
+    """
+    motion_mmap: bool = False
+    """Whether to memory-map uncompressed motion files instead of reading them eagerly. Defaults to False."""
+    motion_dtype: Literal["float32", "float16"] = "float32"
+    """Storage dtype of the motion library on the device. Frames are cast to float32 when read."""
+    motion_tensor_cache: bool = False
+    """Whether to cache the preprocessed motion tensors next to the motion files. Defaults to False."""
     anchor_body_name: str = MISSING
     body_names: list[str] = MISSING
 
@@ -365,6 +904,9 @@ class MotionCommandCfg(CommandTermCfg):
 
     joint_position_range: tuple[float, float] = (-0.52, 0.52)
 
+    tracking_error_backend: Literal["eager", "jit", "compile"] = "eager"
+    """How the shared tracking error stage is run: eagerly, as TorchScript, or through :func:`torch.compile`."""
+
     adaptive_kernel_size: int = 1
     adaptive_lambda: float = 0.8
     adaptive_uniform_ratio: float = 0.1
@@ -5,27 +5,34 @@ from typing import TYPE_CHECKING
 
 from isaaclab.managers import SceneEntityCfg
 from isaaclab.sensors import ContactSensor
-from isaaclab.utils.math import quat_error_magnitude
 
-from whole_body_tracking.tasks.tracking.mdp.commands import MotionCommand
+from whole_body_tracking.tasks.tracking.mdp.commands import (
+    ANCHOR_POS_ERROR_SQ,
+    ANCHOR_ROT_ERROR,
+    BODY_ANG_VEL_ERROR_SQ,
+    BODY_LIN_VEL_ERROR_SQ,
+    BODY_POS_ERROR_SQ,
+    BODY_ROT_ERROR,
+    MotionCommand,
+)
 
 if TYPE_CHECKING:
     from isaaclab.envs import ManagerBasedRLEnv
 
 
-def _get_body_indexes(command: MotionCommand, body_names: list[str] | None) -> list[int]:
-    return [i for i, name in enumerate(command.cfg.body_names) if (body_names is None) or (name in body_names)]
+def _get_body_indexes(command: MotionCommand, body_names: list[str] | None) -> torch.Tensor | slice:
+    return command.get_body_indexes(body_names)
 
 
 def motion_global_anchor_position_error_exp(env: ManagerBasedRLEnv, command_name: str, std: float) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
-    error = torch.sum(torch.square(command.anchor_pos_w - command.robot_anchor_pos_w), dim=-1)
+    error = command.anchor_tracking_errors[:, ANCHOR_POS_ERROR_SQ]
     return torch.exp(-error / std**2)
 
 
 def motion_global_anchor_orientation_error_exp(env: ManagerBasedRLEnv, command_name: str, std: float) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
-    error = quat_error_magnitude(command.anchor_quat_w, command.robot_anchor_quat_w) ** 2
+    error = command.anchor_tracking_errors[:, ANCHOR_ROT_ERROR] ** 2
     return torch.exp(-error / std**2)
 
 
@@ -34,9 +41,7 @@ def motion_relative_body_position_error_exp(
 ) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
     body_indexes = _get_body_indexes(command, body_names)
-    error = torch.sum(
-        torch.square(command.body_pos_relative_w[:, body_indexes] - command.robot_body_pos_w[:, body_indexes]), dim=-1
-    )
+    error = command.body_tracking_errors[:, body_indexes, BODY_POS_ERROR_SQ]
     return torch.exp(-error.mean(-1) / std**2)
 
 
@@ -45,10 +50,7 @@ def motion_relative_body_orientation_error_exp(
 ) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
     body_indexes = _get_body_indexes(command, body_names)
-    error = (
-        quat_error_magnitude(command.body_quat_relative_w[:, body_indexes], command.robot_body_quat_w[:, body_indexes])
-        ** 2
-    )
+    error = command.body_tracking_errors[:, body_indexes, BODY_ROT_ERROR] ** 2
     return torch.exp(-error.mean(-1) / std**2)
 
 
@@ -57,9 +59,7 @@ def motion_global_body_linear_velocity_error_exp(
 ) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
     body_indexes = _get_body_indexes(command, body_names)
-    error = torch.sum(
-        torch.square(command.body_lin_vel_w[:, body_indexes] - command.robot_body_lin_vel_w[:, body_indexes]), dim=-1
-    )
+    error = command.body_tracking_errors[:, body_indexes, BODY_LIN_VEL_ERROR_SQ]
     return torch.exp(-error.mean(-1) / std**2)
 
 
@@ -68,9 +68,7 @@ def motion_global_body_angular_velocity_error_exp(
 ) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
     body_indexes = _get_body_indexes(command, body_names)
-    error = torch.sum(
-        torch.square(command.body_ang_vel_w[:, body_indexes] - command.robot_body_ang_vel_w[:, body_indexes]), dim=-1
-    )
+    error = command.body_tracking_errors[:, body_indexes, BODY_ANG_VEL_ERROR_SQ]
     return torch.exp(-error.mean(-1) / std**2)
 
 
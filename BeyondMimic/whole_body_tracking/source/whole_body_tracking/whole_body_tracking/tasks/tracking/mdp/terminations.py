@@ -3,39 +3,34 @@ from __future__ import annotations
 import torch
 from typing import TYPE_CHECKING
 
-import isaaclab.utils.math as math_utils
-
 if TYPE_CHECKING:
     from isaaclab.envs import ManagerBasedRLEnv
 
-from isaaclab.assets import Articulation, RigidObject
-from isaaclab.managers import SceneEntityCfg
-
-from whole_body_tracking.tasks.tracking.mdp.commands import MotionCommand
+from whole_body_tracking.tasks.tracking.mdp.commands import (
+    ANCHOR_GRAVITY_Z_ERROR,
+    ANCHOR_POS_ERROR_SQ,
+    ANCHOR_POS_Z_ERROR,
+    BODY_POS_ERROR_SQ,
+    BODY_POS_Z_ERROR,
+    MotionCommand,
+)
 from whole_body_tracking.tasks.tracking.mdp.rewards import _get_body_indexes
 
 
 def bad_anchor_pos(env: ManagerBasedRLEnv, command_name: str, threshold: float) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
-    return torch.norm(command.anchor_pos_w - command.robot_anchor_pos_w, dim=1) > threshold
+    return command.anchor_tracking_errors[:, ANCHOR_POS_ERROR_SQ] > threshold**2
 
 
 def bad_anchor_pos_z_only(env: ManagerBasedRLEnv, command_name: str, threshold: float) -> torch.Tensor:
     command: MotionCommand = env.command_manager.get_term(command_name)
-    return torch.abs(command.anchor_pos_w[:, -1] - command.robot_anchor_pos_w[:, -1]) > threshold
+    return command.anchor_tracking_errors[:, ANCHOR_POS_Z_ERROR] > threshold
 
 
-def bad_anchor_ori(
-    env: ManagerBasedRLEnv, asset_cfg: SceneEntityCfg, command_name: str, threshold: float
-) -> torch.Tensor:
-    asset: RigidObject | Articulation = env.scene[asset_cfg.name]
-
+def bad_anchor_ori(env: ManagerBasedRLEnv, command_name: str, threshold: float) -> torch.Tensor:
+    # the projected gravity of the motion and robot anchors is compared with the gravity direction (0, 0, -1)
     command: MotionCommand = env.command_manager.get_term(command_name)
-    motion_projected_gravity_b = math_utils.quat_rotate_inverse(command.anchor_quat_w, asset.data.GRAVITY_VEC_W)
-
-    robot_projected_gravity_b = math_utils.quat_rotate_inverse(command.robot_anchor_quat_w, asset.data.GRAVITY_VEC_W)
-
-    return (motion_projected_gravity_b[:, 2] - robot_projected_gravity_b[:, 2]).abs() > threshold
+    return command.anchor_tracking_errors[:, ANCHOR_GRAVITY_Z_ERROR] > threshold
 
 
 def bad_motion_body_pos(
@@ -44,8 +39,8 @@ def bad_motion_body_pos(
     command: MotionCommand = env.command_manager.get_term(command_name)
 
     body_indexes = _get_body_indexes(command, body_names)
-    error = torch.norm(command.body_pos_relative_w[:, body_indexes] - command.robot_body_pos_w[:, body_indexes], dim=-1)
-    return torch.any(error > threshold, dim=-1)
+    error = command.body_tracking_errors[:, body_indexes, BODY_POS_ERROR_SQ]
+    return torch.any(error > threshold**2, dim=-1)
 
 
 def bad_motion_body_pos_z_only(
@@ -54,5 +49,5 @@ def bad_motion_body_pos_z_only(
     command: MotionCommand = env.command_manager.get_term(command_name)
 
     body_indexes = _get_body_indexes(command, body_names)
-    error = torch.abs(command.body_pos_relative_w[:, body_indexes, -1] - command.robot_body_pos_w[:, body_indexes, -1])
+    error = command.body_tracking_errors[:, body_indexes, BODY_POS_Z_ERROR]
     return torch.any(error > threshold, dim=-1)
@@ -261,7 +261,7 @@ class TerminationsCfg:
     )
     anchor_ori = DoneTerm(
         func=mdp.bad_anchor_ori,
-        params={"asset_cfg": SceneEntityCfg("robot"), "command_name": "motion", "threshold": 0.8},
+        params={"command_name": "motion", "threshold": 0.8},
     )
     ee_body_pos = DoneTerm(
         func=mdp.bad_motion_body_pos_z_only,
@@ -3,15 +3,18 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import numpy as np
 import os
 import torch
+from typing import Literal
 
 import onnx
 
 from isaaclab.envs import ManagerBasedRLEnv
 from isaaclab_rl.rsl_rl.exporter import _OnnxPolicyExporter
 
-from whole_body_tracking.tasks.tracking.mdp import MotionCommand
+from whole_body_tracking.tasks.tracking.mdp import MOTION_FIELDS, MotionCommand
+from whole_body_tracking.utils.reference_stream import write_reference_stream
 
 
 def export_motion_policy_as_onnx(
@@ -21,24 +24,79 @@ def export_motion_policy_as_onnx(
     normalizer: object | None = None,
     filename="policy.onnx",
     verbose=False,
+    reference_mode: Literal["baked", "stream"] = "baked",
+    clip_id: int | None = None,
 ):
+    """Export a motion tracking policy as ONNX.
+
+    With ``reference_mode="baked"`` the reference motion of one clip is stored in the graph, which takes the time step
+    within the clip as input and outputs the actions followed by the reference frame. The clip is selected with
+    ``clip_id``, which may only be omitted for a single-clip motion library. With ``"stream"`` only the network is
+    exported: the graph maps the observations, whose reference features are built by the controller from the frames
+    of :func:`export_motion_reference_stream`, to the actions. Its size does not depend on the motion.
+
+    Raises:
+        ValueError: If the reference motion is baked without ``clip_id`` from a library of several clips.
+    """
     if not os.path.exists(path):
         os.makedirs(path, exist_ok=True)
-    policy_exporter = _OnnxMotionPolicyExporter(env, actor_critic, normalizer, verbose)
+    if reference_mode == "baked":
+        policy_exporter = _OnnxMotionPolicyExporter(env, actor_critic, normalizer, verbose, clip_id)
+    else:
+        policy_exporter = _OnnxPolicyExporter(actor_critic, normalizer, verbose)
     policy_exporter.export(path, filename)
 
 
+def export_motion_reference_stream(
+    env: ManagerBasedRLEnv,
+    path: str,
+    filename="reference.bin",
+    dtype: Literal["float32", "float16"] = "float32",
+):
+    """Export the reference motion of the motion command as a reference-stream file.
+
+    The file holds all clips of the motion library and is read with
+    :class:`~whole_body_tracking.utils.reference_stream.ReferenceStream`.
+    """
+    if not os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+    cmd: MotionCommand = env.command_manager.get_term("motion")
+    write_reference_stream(
+        os.path.join(path, filename),
+        {key: getattr(cmd.motion, key).to("cpu", torch.float32).numpy() for key in MOTION_FIELDS},
+        fps=float(np.asarray(cmd.motion.fps).reshape(-1)[0]),
+        clip_lengths=cmd.motion.clip_lengths.tolist(),
+        dtype=dtype,
+        metadata={
+            "joint_names": env.scene["robot"].data.joint_names,
+            "anchor_body_name": cmd.cfg.anchor_body_name,
+            "body_names": cmd.cfg.body_names,
+        },
+    )
+
+
 class _OnnxMotionPolicyExporter(_OnnxPolicyExporter):
-    def __init__(self, env: ManagerBasedRLEnv, actor_critic, normalizer=None, verbose=False):
+    def __init__(self, env: ManagerBasedRLEnv, actor_critic, normalizer=None, verbose=False, clip_id=None):
         super().__init__(actor_critic, normalizer, verbose)
         cmd: MotionCommand = env.command_manager.get_term("motion")
 
-        self.joint_pos = cmd.motion.joint_pos.to("cpu")
-        self.joint_vel = cmd.motion.joint_vel.to("cpu")
-        self.body_pos_w = cmd.motion.body_pos_w.to("cpu")
-        self.body_quat_w = cmd.motion.body_quat_w.to("cpu")
-        self.body_lin_vel_w = cmd.motion.body_lin_vel_w.to("cpu")
-        self.body_ang_vel_w = cmd.motion.body_ang_vel_w.to("cpu")
+        if clip_id is None:
+            if cmd.motion.num_clips > 1:
+                raise ValueError(
+                    f"Cannot bake a motion library of {cmd.motion.num_clips} clips into the policy: select a clip with"
+                    " 'clip_id' or export with reference_mode='stream'."
+                )
+            clip_id = 0
+        # the frames of the clip only, so that the clamped time step never runs into the next clip
+        start = int(cmd.motion.clip_offsets[clip_id])
+        frames = slice(start, start + int(cmd.motion.clip_lengths[clip_id]))
+
+        self.joint_pos = cmd.motion.joint_pos[frames].to("cpu", torch.float32)
+        self.joint_vel = cmd.motion.joint_vel[frames].to("cpu", torch.float32)
+        self.body_pos_w = cmd.motion.body_pos_w[frames].to("cpu", torch.float32)
+        self.body_quat_w = cmd.motion.body_quat_w[frames].to("cpu", torch.float32)
+        self.body_lin_vel_w = cmd.motion.body_lin_vel_w[frames].to("cpu", torch.float32)
+        self.body_ang_vel_w = cmd.motion.body_ang_vel_w[frames].to("cpu", torch.float32)
         self.time_step_total = self.joint_pos.shape[0]
 
     def forward(self, x, time_step):
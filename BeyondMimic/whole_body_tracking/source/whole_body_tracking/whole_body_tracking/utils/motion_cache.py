@@ -0,0 +1,278 @@
+"""Local cache of the reference motions pulled from a motion registry.
+
+Motions are stored by the sha256 of their npz content under ``<root>/objects/<sha256>/motion.npz``, so identical
+motions published under different names or versions are only kept once. A resolved registry name is recorded under
+``<root>/refs`` together with the registry version it was fetched at. A later fetch only asks the registry for the
+current version of the name and downloads again when that version was never fetched before. In offline mode the
+registry is not contacted at all and the recorded refs are used as is.
+
+All writes go through a process-unique temporary path followed by an atomic rename, so concurrent jobs sharing the
+cache directory (e.g. several seeds launched at once) never read a partially written motion.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import urllib.parse
+
+MOTION_FILE_NAME = "motion.npz"
+"""Name of the motion npz file inside a registry artifact."""
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "whole_body_tracking", "motions")
+"""Cache directory used when neither an explicit root nor ``WBT_MOTION_CACHE`` is given."""
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """Compute the sha256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write_text(path: str, text: str):
+    """Write a text file through a temporary file in the same directory and rename it in place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _split_name(name: str) -> tuple[str, str]:
+    """Split a registry name ``[<path>/]<collection>[:<alias>]`` into the collection and the alias."""
+    collection, _, alias = name.rpartition("/")[2].partition(":")
+    return collection, alias or "latest"
+
+
+class MotionRegistry:
+    """Interface of a backend that publishes and serves named reference motions.
+
+    A name is ``<collection>:<alias>``, optionally prefixed by a backend-specific path. Versions are opaque strings
+    that change whenever the motion behind a name changes.
+    """
+
+    def resolve(self, name: str) -> str:
+        """Return the current version of a motion name without downloading the motion."""
+        raise NotImplementedError
+
+    def download(self, name: str, directory: str) -> str:
+        """Download the motion of a name into ``directory`` and return the path of the npz file."""
+        raise NotImplementedError
+
+    def publish(self, motion_file: str, name: str) -> str:
+        """Publish a motion npz file under a collection name and return its version."""
+        raise NotImplementedError
+
+
+class LocalMotionRegistry(MotionRegistry):
+    """Motion registry backed by a plain (possibly shared) directory.
+
+    The layout is ``<root>/<collection>/<sha256>/motion.npz`` with one text file per alias, ``<root>/<collection>/
+    <alias>``, holding the version it points to. Publishing new content sets the ``latest`` and ``v<N>`` aliases,
+    publishing existing content returns its version and leaves the aliases as they are. Any path prefix of a name is
+    ignored, so wandb registry names resolve against the collection of the same name.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def resolve(self, name: str) -> str:
+        collection, alias = _split_name(name)
+        alias_file = os.path.join(self.root, collection, alias)
+        if os.path.isfile(alias_file):
+            with open(alias_file) as f:
+                return f.read().strip()
+        # aliases can also be given as the version itself
+        if os.path.isfile(os.path.join(self.root, collection, alias, MOTION_FILE_NAME)):
+            return alias
+        raise KeyError(f"Motion '{name}' not found in the local registry: {self.root}")
+
+    def download(self, name: str, directory: str) -> str:
+        collection, _ = _split_name(name)
+        path = os.path.join(directory, MOTION_FILE_NAME)
+        shutil.copyfile(os.path.join(self.root, collection, self.resolve(name), MOTION_FILE_NAME), path)
+        return path
+
+    def publish(self, motion_file: str, name: str) -> str:
+        collection, _ = _split_name(name)
+        version = file_digest(motion_file)
+        version_dir = os.path.join(self.root, collection, version)
+        # republished content keeps its version, the aliases still point to the newest one
+        if os.path.isdir(version_dir):
+            return version
+        os.makedirs(os.path.join(self.root, collection), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=os.path.join(self.root, collection), prefix=".tmp-")
+        shutil.copyfile(motion_file, os.path.join(tmp_dir, MOTION_FILE_NAME))
+        try:
+            os.rename(tmp_dir, version_dir)
+        except OSError:
+            # published concurrently with the same content, the other publisher sets the aliases
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return version
+        num_versions = sum(
+            not entry.startswith(".") and os.path.isdir(os.path.join(self.root, collection, entry))
+            for entry in os.listdir(os.path.join(self.root, collection))
+        )
+        for alias in ("latest", f"v{num_versions - 1}"):
+            _atomic_write_text(os.path.join(self.root, collection, alias), version)
+        return version
+
+
+class WandbMotionRegistry(MotionRegistry):
+    """Motion registry backed by the wandb registry, where each motion is an artifact of type ``motions``."""
+
+    REGISTRY = "motions"
+
+    def __init__(self, project: str = "csv_to_npz"):
+        self.project = project
+        self._api = None
+
+    @property
+    def api(self):
+        if self._api is None:
+            import wandb
+
+            self._api = wandb.Api()
+        return self._api
+
+    def resolve(self, name: str) -> str:
+        return self.api.artifact(name).digest
+
+    def download(self, name: str, directory: str) -> str:
+        return os.path.join(self.api.artifact(name).download(root=directory), MOTION_FILE_NAME)
+
+    def publish(self, motion_file: str, name: str) -> str:
+        import wandb
+
+        collection, _ = _split_name(name)
+        run = wandb.init(project=self.project, name=collection)
+        print(f"[INFO]: Logging motion to wandb: {collection}")
+        # the artifact file name is fixed, the staged copy keeps concurrent publishers apart
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            staged_file = os.path.join(tmp_dir, MOTION_FILE_NAME)
+            shutil.copyfile(motion_file, staged_file)
+            artifact = run.log_artifact(artifact_or_path=staged_file, name=collection, type=self.REGISTRY)
+            run.link_artifact(artifact=artifact, target_path=f"wandb-registry-{self.REGISTRY}/{collection}")
+            artifact.wait()
+        run.finish()
+        print(f"[INFO]: Motion saved to wandb registry: {self.REGISTRY}/{collection}")
+        return artifact.digest
+
+
+class MotionCache:
+    """Content-addressed local cache in front of a :class:`MotionRegistry`.
+
+    Args:
+        root: The cache directory. Defaults to ``WBT_MOTION_CACHE`` or :data:`DEFAULT_CACHE_DIR`.
+        registry: The registry backend. Defaults to a :class:`LocalMotionRegistry` at ``WBT_MOTION_REGISTRY`` when
+            that variable is set, and to the :class:`WandbMotionRegistry` otherwise.
+        offline: Whether to serve motions from the cache only. Defaults to ``WANDB_MODE=offline``.
+    """
+
+    def __init__(self, root: str | None = None, registry: MotionRegistry | None = None, offline: bool | None = None):
+        self.root = root or os.environ.get("WBT_MOTION_CACHE", DEFAULT_CACHE_DIR)
+        if registry is None:
+            registry_dir = os.environ.get("WBT_MOTION_REGISTRY")
+            registry = LocalMotionRegistry(registry_dir) if registry_dir else WandbMotionRegistry()
+        self.registry = registry
+        self.offline = os.environ.get("WANDB_MODE") == "offline" if offline is None else offline
+        for directory in ("objects", "refs", "versions", "tmp"):
+            os.makedirs(os.path.join(self.root, directory), exist_ok=True)
+
+    def fetch(self, name: str) -> str:
+        """Return the local path of a registry motion, downloading it only if its version is not cached.
+
+        Args:
+            name: The registry name. The ``latest`` alias is used when no alias is given.
+
+        Returns:
+            The path of the cached motion npz file.
+
+        Raises:
+            FileNotFoundError: In offline mode, if the name was never fetched before.
+        """
+        name = name if ":" in name else name + ":latest"
+        ref = self._read_ref(name)
+        if self.offline:
+            if ref is None:
+                raise FileNotFoundError(f"Motion '{name}' is not cached in {self.root} and the cache is offline.")
+            print(f"[INFO]: Using cached motion '{name}' (offline): {ref['sha256']}")
+            return self._object_path(ref["sha256"])
+
+        version = self.registry.resolve(name)
+        if ref is not None and ref["version"] == version:
+            print(f"[INFO]: Using cached motion '{name}': {ref['sha256']}")
+            return self._object_path(ref["sha256"])
+
+        # the same version may have been fetched under another name or alias
+        sha256 = self._read_version(version)
+        if sha256 is None:
+            print(f"[INFO]: Downloading motion '{name}' into the cache: {self.root}")
+            tmp_dir = tempfile.mkdtemp(dir=os.path.join(self.root, "tmp"))
+            try:
+                sha256 = self._store(self.registry.download(name, tmp_dir))
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            _atomic_write_text(self._version_path(version), sha256)
+        else:
+            print(f"[INFO]: Using cached motion '{name}': {sha256}")
+        _atomic_write_text(self._ref_path(name), json.dumps({"version": version, "sha256": sha256}))
+        return self._object_path(sha256)
+
+    def add(self, motion_file: str) -> str:
+        """Copy a local motion npz file into the cache and return its cached path."""
+        tmp_dir = tempfile.mkdtemp(dir=os.path.join(self.root, "tmp"))
+        try:
+            tmp_file = os.path.join(tmp_dir, MOTION_FILE_NAME)
+            shutil.copyfile(motion_file, tmp_file)
+            return self._object_path(self._store(tmp_file))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _store(self, motion_file: str) -> str:
+        """Move a motion npz file into the object store and return its content hash."""
+        sha256 = file_digest(motion_file)
+        object_dir = os.path.dirname(self._object_path(sha256))
+        if not os.path.isfile(self._object_path(sha256)):
+            staging_dir = tempfile.mkdtemp(dir=os.path.join(self.root, "tmp"))
+            os.replace(motion_file, os.path.join(staging_dir, MOTION_FILE_NAME))
+            try:
+                os.rename(staging_dir, object_dir)
+            except OSError:
+                # stored concurrently by another process with the same content
+                shutil.rmtree(staging_dir, ignore_errors=True)
+        return sha256
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256, MOTION_FILE_NAME)
+
+    def _ref_path(self, name: str) -> str:
+        return os.path.join(self.root, "refs", urllib.parse.quote(name, safe="") + ".json")
+
+    def _version_path(self, version: str) -> str:
+        return os.path.join(self.root, "versions", urllib.parse.quote(version, safe=""))
+
+    def _read_version(self, version: str) -> str | None:
+        try:
+            with open(self._version_path(version)) as f:
+                sha256 = f.read().strip()
+        except OSError:
+            return None
+        return sha256 if os.path.isfile(self._object_path(sha256)) else None
+
+    def _read_ref(self, name: str) -> dict[str, str] | None:
+        try:
+            with open(self._ref_path(name)) as f:
+                ref = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return ref if os.path.isfile(self._object_path(ref["sha256"])) else None
@@ -6,7 +6,11 @@ from rsl_rl.runners.on_policy_runner import OnPolicyRunner
 from isaaclab_rl.rsl_rl import export_policy_as_onnx
 
 import wandb
-from whole_body_tracking.utils.exporter import attach_onnx_metadata, export_motion_policy_as_onnx
+from whole_body_tracking.utils.exporter import (
+    attach_onnx_metadata,
+    export_motion_policy_as_onnx,
+    export_motion_reference_stream,
+)
 
 
 class MyOnPolicyRunner(OnPolicyRunner):
@@ -24,10 +28,15 @@ class MyOnPolicyRunner(OnPolicyRunner):
 
 class MotionOnPolicyRunner(OnPolicyRunner):
     def __init__(
-        self, env: VecEnv, train_cfg: dict, log_dir: str | None = None, device="cpu", registry_name: str = None
+        self,
+        env: VecEnv,
+        train_cfg: dict,
+        log_dir: str | None = None,
+        device="cpu",
+        registry_name: str | list[str] = None,
     ):
         super().__init__(env, train_cfg, log_dir, device)
-        self.registry_name = registry_name
+        self.registry_name = [registry_name] if isinstance(registry_name, str) else registry_name
 
     def save(self, path: str, infos=None):
         """Save the model and training information."""
@@ -35,16 +44,28 @@ class MotionOnPolicyRunner(OnPolicyRunner):
         if self.logger_type in ["wandb"]:
             policy_path = path.split("model")[0]
             filename = policy_path.split("/")[-2] + ".onnx"
+            # only a single clip can be baked into the policy, the reference motion of a library is streamed
+            reference_stream = self.env.unwrapped.command_manager.get_term("motion").motion.num_clips > 1
             export_motion_policy_as_onnx(
-                self.env.unwrapped, self.alg.policy, normalizer=getattr(self, "obs_normalizer", None), path=policy_path, filename=filename
+                self.env.unwrapped,
+                self.alg.policy,
+                normalizer=getattr(self, "obs_normalizer", None),
+                path=policy_path,
+                filename=filename,
+                reference_mode="stream" if reference_stream else "baked",
             )
             #export_motion_policy_as_onnx(
             #    self.env.unwrapped, self.alg.policy, normalizer=self.obs_normalizer, path=policy_path, filename=filename
             #)
             attach_onnx_metadata(self.env.unwrapped, wandb.run.name, path=policy_path, filename=filename)
             wandb.save(policy_path + filename, base_path=os.path.dirname(policy_path))
+            if reference_stream:
+                reference_filename = filename.replace(".onnx", "_reference.bin")
+                export_motion_reference_stream(self.env.unwrapped, path=policy_path, filename=reference_filename)
+                wandb.save(policy_path + reference_filename, base_path=os.path.dirname(policy_path))
 
-            # link the artifact registry to this run
+            # link the artifact registries to this run
             if self.registry_name is not None:
-                wandb.run.use_artifact(self.registry_name)
+                for registry_name in self.registry_name:
+                    wandb.run.use_artifact(registry_name)
                 self.registry_name = None
@@ -0,0 +1,110 @@
+"""Compact reference-stream file that feeds the reference motion to an exported policy on the robot.
+
+The file holds the reference frames of one or more clips, laid out frame after frame so that one frame is a single
+contiguous read::
+
+    magic (8 bytes) | header length (uint32, little endian) | JSON header | padding | frames
+
+The JSON header describes the fields of a frame (name and shape, in storage order), the storage dtype, the fps, the
+clip lengths and any extra metadata (e.g. joint and body names). The frames start at a 64-byte aligned offset.
+
+This module only depends on numpy and can be copied as is next to the onboard controller.
+"""
+
+from __future__ import annotations
+
+import json
+import numpy as np
+
+MAGIC = b"WBTREF01"
+"""Identifier and format version at the start of a reference-stream file."""
+
+_ALIGNMENT = 64
+
+
+def write_reference_stream(
+    path: str,
+    fields: dict[str, np.ndarray],
+    fps: float,
+    clip_lengths: list[int] | None = None,
+    dtype: str = "float32",
+    metadata: dict | None = None,
+):
+    """Write reference frames to a reference-stream file.
+
+    Args:
+        path: The output file.
+        fields: The per-frame arrays. Shape of each is (num_frames, ...), with the clips concatenated along the first
+            axis.
+        fps: The frame rate of the reference.
+        clip_lengths: The number of frames of each clip. Defaults to a single clip.
+        dtype: The storage dtype. Defaults to float32, float16 halves the file size at a loss of precision.
+        metadata: Extra JSON-serializable entries stored in the header. Defaults to None.
+    """
+    num_frames = len(next(iter(fields.values())))
+    clip_lengths = [num_frames] if clip_lengths is None else [int(length) for length in clip_lengths]
+    if sum(clip_lengths) != num_frames:
+        raise ValueError(f"Clip lengths {clip_lengths} do not add up to the {num_frames} frames.")
+    frames = np.concatenate([np.asarray(value, dtype=dtype).reshape(num_frames, -1) for value in fields.values()], 1)
+
+    header = {
+        "dtype": dtype,
+        "fps": float(fps),
+        "clip_lengths": clip_lengths,
+        "fields": [{"name": name, "shape": list(np.shape(value)[1:])} for name, value in fields.items()],
+        "metadata": metadata or {},
+    }
+    header = json.dumps(header).encode()
+    data_offset = -(-(len(MAGIC) + 4 + len(header)) // _ALIGNMENT) * _ALIGNMENT
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint32(len(header)).tobytes())
+        f.write(header)
+        f.write(b"\0" * (data_offset - f.tell()))
+        f.write(np.ascontiguousarray(frames).tobytes())
+
+
+class ReferenceStream:
+    """Reader of a reference-stream file.
+
+    The frames are memory-mapped, so opening a file is instant and only the frames that are read are paged in.
+
+    Args:
+        path: The reference-stream file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a reference-stream file: {path}")
+            header_length = int(np.frombuffer(f.read(4), dtype=np.uint32)[0])
+            header = json.loads(f.read(header_length))
+        data_offset = -(-(len(MAGIC) + 4 + header_length) // _ALIGNMENT) * _ALIGNMENT
+
+        self.fps: float = header["fps"]
+        self.metadata: dict = header["metadata"]
+        self.clip_lengths = np.asarray(header["clip_lengths"], dtype=np.int64)
+        self.clip_offsets = np.cumsum(self.clip_lengths) - self.clip_lengths
+        self.num_clips = len(self.clip_lengths)
+
+        self._fields: dict[str, tuple[slice, tuple[int, ...]]] = {}
+        start = 0
+        for field in header["fields"]:
+            shape = tuple(field["shape"])
+            size = int(np.prod(shape, dtype=np.int64))
+            self._fields[field["name"]] = (slice(start, start + size), shape)
+            start += size
+        self._frames = np.memmap(
+            path, dtype=header["dtype"], mode="r", offset=data_offset, shape=(int(self.clip_lengths.sum()), start)
+        )
+
+    @property
+    def field_names(self) -> list[str]:
+        """Names of the fields of a frame, in storage order."""
+        return list(self._fields)
+
+    def frame(self, time_step: int, clip_id: int = 0) -> dict[str, np.ndarray]:
+        """Read the float32 reference of a frame, the time step is clamped to the last frame of the clip."""
+        time_step = min(max(time_step, 0), int(self.clip_lengths[clip_id]) - 1)
+        row = np.asarray(self._frames[self.clip_offsets[clip_id] + time_step], dtype=np.float32)
+        return {name: row[columns].reshape(shape) for name, (columns, shape) in self._fields.items()}
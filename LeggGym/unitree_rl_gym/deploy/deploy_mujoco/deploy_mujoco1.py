@@ -4,9 +4,13 @@ import mujoco.viewer
 import mujoco
 import numpy as np
 from legged_gym import LEGGED_GYM_ROOT_DIR
-import torch
 import yaml
 import os
+import sys
+
+# the inference backends are shared with the real robot deploy
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "deploy_real"))
+from common.policy_backend import load_policy
 
 
 def get_gravity_orientation(quaternion):
@@ -94,7 +98,9 @@ if __name__ == "__main__":
     m.opt.timestep = simulation_dt
 
     # load policy
-    policy = torch.jit.load(policy_path)
+    policy = load_policy(
+        policy_path, num_obs, num_actions, config.get("policy_backend", "torchscript"), config.get("policy_threads", 1)
+    )
 
     with mujoco.viewer.launch_passive(m, d) as viewer:
         # Close the viewer automatically after simulation_duration wall-seconds.
@@ -135,9 +141,8 @@ if __name__ == "__main__":
                 obs[9 + num_actions : 9 + 2 * num_actions] = dqj
                 obs[9 + 2 * num_actions : 9 + 3 * num_actions] = action
                 obs[9 + 3 * num_actions : 9 + 3 * num_actions + 2] = np.array([sin_phase, cos_phase])
-                obs_tensor = torch.from_numpy(obs).unsqueeze(0)
                 # policy inference
-                action = policy(obs_tensor).detach().numpy().squeeze()
+                action[:] = policy(obs)
                 # transform action to target_dof_pos
                 target_dof_pos = action * action_scale + default_angles
 
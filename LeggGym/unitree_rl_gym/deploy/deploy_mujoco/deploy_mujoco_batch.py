@@ -0,0 +1,244 @@
+"""Headless batch sim2sim evaluation of a policy in MuJoCo.
+
+Runs one rollout per combination of the perturbation grid in the ``eval`` section of the config and per seed, spread
+over a process pool. There is no viewer and no real-time pacing, every rollout runs as fast as the CPU allows. The
+per-rollout survival, velocity tracking errors and torque statistics are written to a csv file.
+
+    python deploy/deploy_mujoco/deploy_mujoco_batch.py g1.yaml --output sim2sim.csv --min_survival 0.9
+
+Supported perturbations (any subset, each a list of values):
+
+- ``friction_scale``: scale of the sliding friction of every geom.
+- ``mass_scale``: scale of the mass and inertia of every body.
+- ``kp_scale`` / ``kd_scale``: scale of the PD gains.
+- ``action_latency``: number of simulation steps before a new target is applied.
+- ``cmd``: the velocity command ``[vx, vy, wz]``, defaults to ``cmd_init``.
+"""
+
+import argparse
+import collections
+import csv
+import itertools
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import mujoco
+import numpy as np
+import yaml
+
+from legged_gym import LEGGED_GYM_ROOT_DIR
+
+from deploy_mujoco import get_gravity_orientation, pd_control
+
+# the inference backends are shared with the real robot deploy
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "deploy_real"))
+from common.policy_backend import load_policy
+
+PERTURBATIONS = ("friction_scale", "mass_scale", "kp_scale", "kd_scale", "action_latency", "cmd")
+
+# per-process state of the pool workers
+_config = None
+_model = None
+_nominal = None
+_policy = None
+
+
+def load_config(config_file: str) -> dict:
+    with open(f"{LEGGED_GYM_ROOT_DIR}/deploy/deploy_mujoco/configs/{config_file}", "r") as f:
+        config = yaml.load(f, Loader=yaml.FullLoader)
+    config["policy_path"] = config["policy_path"].replace("{LEGGED_GYM_ROOT_DIR}", LEGGED_GYM_ROOT_DIR)
+    config["xml_path"] = config["xml_path"].replace("{LEGGED_GYM_ROOT_DIR}", LEGGED_GYM_ROOT_DIR)
+    return config
+
+
+def make_rollouts(config: dict) -> list:
+    """Expand the perturbation grid and the seeds into the list of rollouts."""
+    eval_cfg = config.get("eval", {})
+    grid = eval_cfg.get("grid", {})
+    unknown = set(grid) - set(PERTURBATIONS)
+    if unknown:
+        raise ValueError(f"Unknown perturbations {sorted(unknown)}, expected any of {PERTURBATIONS}.")
+    names = list(grid)
+    rollouts = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in range(eval_cfg.get("num_seeds", 1)):
+            rollouts.append({"rollout": len(rollouts), "seed": seed, **dict(zip(names, values))})
+    return rollouts
+
+
+def _init_worker(config: dict):
+    global _config, _model, _nominal, _policy
+    _config = config
+    _model = mujoco.MjModel.from_xml_path(config["xml_path"])
+    _model.opt.timestep = config["simulation_dt"]
+    _nominal = {
+        "geom_friction": _model.geom_friction.copy(),
+        "body_mass": _model.body_mass.copy(),
+        "body_inertia": _model.body_inertia.copy(),
+    }
+    # the pool already runs one rollout per core
+    _policy = load_policy(
+        config["policy_path"], config["num_obs"], config["num_actions"], config.get("policy_backend", "torchscript")
+    )
+
+
+def _torque_limits(m: mujoco.MjModel) -> np.ndarray:
+    """Torque limit of every actuator from its control range and the force range of its joint, inf if unlimited."""
+    limits = np.full(m.nu, np.inf)
+    for i in range(m.nu):
+        if m.actuator_ctrllimited[i]:
+            limits[i] = np.abs(m.actuator_ctrlrange[i]).max()
+        joint = m.actuator_trnid[i, 0]
+        if m.jnt_actfrclimited[joint]:
+            limits[i] = min(limits[i], np.abs(m.jnt_actfrcrange[joint]).max())
+    return limits
+
+
+def run_rollout(rollout: dict) -> dict:
+    config, m = _config, _model
+    eval_cfg = config.get("eval", {})
+    simulation_dt = config["simulation_dt"]
+    control_decimation = config["control_decimation"]
+    num_actions = config["num_actions"]
+    default_angles = np.array(config["default_angles"], dtype=np.float32)
+    ang_vel_scale = config["ang_vel_scale"]
+    dof_pos_scale = config["dof_pos_scale"]
+    dof_vel_scale = config["dof_vel_scale"]
+    action_scale = config["action_scale"]
+    cmd_scale = np.array(config["cmd_scale"], dtype=np.float32)
+
+    # apply the perturbations to the nominal model
+    m.geom_friction[:] = _nominal["geom_friction"]
+    m.geom_friction[:, 0] *= rollout.get("friction_scale", 1.0)
+    m.body_mass[:] = _nominal["body_mass"] * rollout.get("mass_scale", 1.0)
+    m.body_inertia[:] = _nominal["body_inertia"] * rollout.get("mass_scale", 1.0)
+    kps = np.array(config["kps"], dtype=np.float32) * rollout.get("kp_scale", 1.0)
+    kds = np.array(config["kds"], dtype=np.float32) * rollout.get("kd_scale", 1.0)
+    latency = int(rollout.get("action_latency", 0))
+    cmd = np.array(rollout.get("cmd", config["cmd_init"]), dtype=np.float32)
+    torque_limits = _torque_limits(m)
+
+    d = mujoco.MjData(m)
+    rng = np.random.default_rng(rollout["seed"])
+    d.qpos[7:] += rng.uniform(-1.0, 1.0, num_actions) * eval_cfg.get("init_noise", 0.0)
+    mujoco.mj_forward(m, d)
+    fall_height = d.qpos[2] * eval_cfg.get("fall_height_ratio", 0.5)
+    _policy.reset()
+
+    action = np.zeros(num_actions, dtype=np.float32)
+    target_dof_pos = default_angles.copy()
+    obs = np.zeros(config["num_obs"], dtype=np.float32)
+    # targets waiting for the action latency, with the simulation step they apply at
+    pending = collections.deque()
+    inv_quat = np.zeros(4)
+    lin_vel = np.zeros(3)
+
+    num_steps = int(eval_cfg.get("duration", config["simulation_duration"]) / simulation_dt)
+    lin_vel_error = ang_vel_error = 0.0
+    num_control_steps = 0
+    abs_torque_sum = 0.0
+    max_torque = 0.0
+    num_saturated = 0
+    fallen = False
+    counter = 0
+    start_time = time.perf_counter()
+    while counter < num_steps:
+        while pending and pending[0][0] <= counter:
+            target_dof_pos = pending.popleft()[1]
+        tau = pd_control(target_dof_pos, d.qpos[7:], kps, np.zeros_like(kds), d.qvel[6:], kds)
+        d.ctrl[:] = tau
+        mujoco.mj_step(m, d)
+        # the simulator clamps the applied torque to the limits
+        abs_tau = np.abs(tau)
+        applied = np.minimum(abs_tau, torque_limits)
+        abs_torque_sum += applied.sum()
+        max_torque = max(max_torque, applied.max())
+        num_saturated += np.count_nonzero(abs_tau >= torque_limits)
+
+        counter += 1
+        if counter % control_decimation == 0:
+            qj = d.qpos[7:]
+            dqj = d.qvel[6:]
+            quat = d.qpos[3:7]
+            omega = d.qvel[3:6]
+            gravity_orientation = get_gravity_orientation(quat)
+            if d.qpos[2] < fall_height or gravity_orientation[2] > -0.5:
+                fallen = True
+                break
+
+            # velocity tracking in the base frame, the free joint linear velocity is in the world frame
+            mujoco.mju_negQuat(inv_quat, quat)
+            mujoco.mju_rotVecQuat(lin_vel, d.qvel[0:3], inv_quat)
+            lin_vel_error += float(np.linalg.norm(lin_vel[:2] - cmd[:2]))
+            ang_vel_error += abs(float(omega[2] - cmd[2]))
+            num_control_steps += 1
+
+            period = 0.8
+            count = counter * simulation_dt
+            phase = count % period / period
+            obs[:3] = omega * ang_vel_scale
+            obs[3:6] = gravity_orientation
+            obs[6:9] = cmd * cmd_scale
+            obs[9 : 9 + num_actions] = (qj - default_angles) * dof_pos_scale
+            obs[9 + num_actions : 9 + 2 * num_actions] = dqj * dof_vel_scale
+            obs[9 + 2 * num_actions : 9 + 3 * num_actions] = action
+            obs[9 + 3 * num_actions : 9 + 3 * num_actions + 2] = (np.sin(2 * np.pi * phase), np.cos(2 * np.pi * phase))
+            action[:] = _policy(obs)
+            pending.append((counter + latency, action * action_scale + default_angles))
+
+    return {
+        **rollout,
+        "survived": not fallen,
+        "survival_time": counter * simulation_dt,
+        "lin_vel_error": lin_vel_error / max(num_control_steps, 1),
+        "ang_vel_error": ang_vel_error / max(num_control_steps, 1),
+        "mean_abs_torque": float(abs_torque_sum) / max(counter * m.nu, 1),
+        "max_abs_torque": float(max_torque),
+        "torque_saturation": int(num_saturated) / max(counter * m.nu, 1),
+        "realtime_factor": counter * simulation_dt / (time.perf_counter() - start_time),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("config_file", type=str, help="config file name in the config folder")
+    parser.add_argument("--output", type=str, default="sim2sim.csv", help="csv file of the per-rollout results")
+    parser.add_argument("--num_workers", type=int, default=None, help="number of processes, defaults to the cores")
+    parser.add_argument(
+        "--min_survival", type=float, default=None, help="exit with an error below this survival rate"
+    )
+    args = parser.parse_args()
+
+    config = load_config(args.config_file)
+    rollouts = make_rollouts(config)
+    # fail here on a broken model, a pool restarts failing worker initializers forever
+    mujoco.MjModel.from_xml_path(config["xml_path"])
+    num_workers = min(args.num_workers or os.cpu_count(), len(rollouts))
+    print(f"[INFO] Running {len(rollouts)} rollouts on {num_workers} processes.")
+
+    results = []
+    start = time.time()
+    # spawn, the policy backends do not survive a fork
+    with mp.get_context("spawn").Pool(num_workers, initializer=_init_worker, initargs=(config,)) as pool:
+        for result in pool.imap_unordered(run_rollout, rollouts):
+            results.append(result)
+            print(
+                f"[INFO] {len(results)}/{len(rollouts)} rollouts ({time.time() - start:.1f} s): "
+                + ", ".join(f"{name}={result[name]}" for name in result if name in PERTURBATIONS)
+                + f" -> survived={result['survived']}, lin_vel_error={result['lin_vel_error']:.3f}"
+            )
+    results.sort(key=lambda result: result["rollout"])
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+    survival_rate = np.mean([result["survived"] for result in results])
+    print(f"[INFO] Survival rate: {survival_rate:.3f}")
+    print(f"[INFO] Mean velocity tracking error: {np.mean([result['lin_vel_error'] for result in results]):.3f} m/s")
+    print(f"[INFO] Results of {len(results)} rollouts saved to {args.output} in {time.time() - start:.1f} s")
+    if args.min_survival is not None and survival_rate < args.min_survival:
+        sys.exit(f"Survival rate {survival_rate:.3f} is below {args.min_survival}.")
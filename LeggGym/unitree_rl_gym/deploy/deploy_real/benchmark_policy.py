@@ -0,0 +1,74 @@
+"""Micro-benchmark of the policy inference backends on the policy of a deploy config.
+
+Every backend runs the same policy on the same random observations, one at a time as in the control loop, and the
+load time and the p50/p99 latency of a call are reported. The outputs are compared against the TorchScript backend.
+
+    python benchmark_policy.py g1.yaml
+    python benchmark_policy.py ../deploy_mujoco/configs/g1.yaml --backends onnx onnx_int8 --iterations 20000
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import yaml
+
+from legged_gym import LEGGED_GYM_ROOT_DIR
+
+from common.policy_backend import BACKENDS, load_policy
+
+
+def benchmark(policy, observations: np.ndarray, warmup: int = 100) -> np.ndarray:
+    for obs in observations[:warmup]:
+        policy(obs)
+    policy.reset()
+    latencies = np.empty(len(observations), dtype=np.float64)
+    for i, obs in enumerate(observations):
+        start = time.perf_counter_ns()
+        policy(obs)
+        latencies[i] = time.perf_counter_ns() - start
+    return latencies * 1e-3
+
+
+def run_all(policy, observations: np.ndarray) -> np.ndarray:
+    policy.reset()
+    return np.stack([policy(obs).copy() for obs in observations])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("config", type=str, help="config file, or its name in the configs folder")
+    parser.add_argument("--backends", type=str, nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--iterations", type=int, default=10000, help="number of timed policy calls per backend")
+    parser.add_argument("--threads", type=int, default=1, help="number of CPU threads of the backends")
+    args = parser.parse_args()
+
+    config_path = args.config
+    if not os.path.isfile(config_path):
+        config_path = f"{LEGGED_GYM_ROOT_DIR}/deploy/deploy_real/configs/{args.config}"
+    with open(config_path, "r") as f:
+        config = yaml.load(f, Loader=yaml.FullLoader)
+    policy_path = config["policy_path"].replace("{LEGGED_GYM_ROOT_DIR}", LEGGED_GYM_ROOT_DIR)
+    num_obs, num_actions = config["num_obs"], config["num_actions"]
+
+    rng = np.random.default_rng(0)
+    observations = rng.standard_normal((args.iterations, num_obs)).astype(np.float32)
+    reference = None
+
+    print(f"Policy: {policy_path}")
+    print(f"{'backend':<14}{'load [s]':>10}{'mean [us]':>12}{'p50 [us]':>12}{'p99 [us]':>12}{'max err':>12}")
+    for backend in args.backends:
+        start = time.perf_counter()
+        policy = load_policy(policy_path, num_obs, num_actions, backend, args.threads)
+        load_time = time.perf_counter() - start
+
+        latencies = benchmark(policy, observations)
+        actions = run_all(policy, observations[:100])
+        if backend == "torchscript":
+            reference = actions
+        error = "-" if reference is None else f"{np.abs(actions - reference).max():.2e}"
+        print(
+            f"{backend:<14}{load_time:>10.2f}{latencies.mean():>12.1f}{np.percentile(latencies, 50):>12.1f}"
+            f"{np.percentile(latencies, 99):>12.1f}{error:>12}"
+        )
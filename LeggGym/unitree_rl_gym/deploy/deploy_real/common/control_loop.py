@@ -0,0 +1,142 @@
+import json
+import time
+
+import numpy as np
+
+
+class TimingHistogram:
+    """Fixed-bin histogram of durations in seconds, cheap enough to update every control tick."""
+
+    def __init__(self, max_time: float, bin_width: float = 50e-6):
+        self.bin_width = bin_width
+        self.num_bins = int(np.ceil(max_time / bin_width))
+        # the last bin collects everything above max_time
+        self.counts = np.zeros(self.num_bins + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float):
+        self.counts[min(int(duration / self.bin_width), self.num_bins)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, q: float) -> float:
+        """Upper edge of the bin holding the q-th percentile, capped at the largest recorded duration."""
+        if self.count == 0:
+            return 0.0
+        idx = int(np.searchsorted(np.cumsum(self.counts), q / 100.0 * self.count))
+        return self.max if idx >= self.num_bins else min((idx + 1) * self.bin_width, self.max)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class ControlLoop:
+    """Fixed-rate loop scheduled on absolute deadlines of a monotonic clock.
+
+    Every tick starts on the grid ``start + k * period``, so the time spent in a tick does not shift the following
+    ones. The loop sleeps until shortly before the deadline and spins for the rest to absorb the wake-up latency of
+    the OS. A tick finishing after its deadline is an overrun; the next tick then starts right away, and when whole
+    periods were missed they are skipped so the loop realigns with the grid instead of trying to catch up.
+
+    Work inside a tick is split into phases with :meth:`mark`, each recorded in its own histogram together with the
+    total work time of a tick and the measured period.
+    """
+
+    def __init__(self, period: float, spin_time: float = 0.5e-3, bin_width: float = 50e-6):
+        self.period = period
+        self.spin_time = spin_time
+        self.bin_width = bin_width
+        self.histograms = {}
+        self.num_ticks = 0
+        self.num_overruns = 0
+        self.num_skipped = 0
+        self._deadline = None
+        self._tick_start = None
+        self._last_mark = None
+
+    def mark(self, phase: str):
+        """Record the time since the previous mark, or since the tick started, under a phase name."""
+        now = time.monotonic()
+        if self._last_mark is not None:
+            self._record(phase, now - self._last_mark)
+        self._last_mark = now
+
+    def wait(self) -> int:
+        """End the current tick and block until the next deadline.
+
+        Returns:
+            The number of ticks skipped because of an overrun, usually 0.
+        """
+        now = time.monotonic()
+        if self._deadline is None:
+            # the first call starts the grid
+            self._deadline = now
+        elif self._tick_start is not None:
+            self._record("tick", now - self._tick_start)
+
+        self._deadline += self.period
+        skipped = 0
+        if now > self._deadline:
+            self.num_overruns += 1
+            # whole periods already missed are dropped to stay on the grid
+            skipped = int((now - self._deadline) / self.period)
+            self._deadline += skipped * self.period
+            self.num_skipped += skipped
+        else:
+            remaining = self._deadline - now - self.spin_time
+            if remaining > 0:
+                time.sleep(remaining)
+            while time.monotonic() < self._deadline:
+                pass
+
+        now = time.monotonic()
+        if self._tick_start is not None:
+            self._record("period", now - self._tick_start)
+        self._tick_start = now
+        self._last_mark = now
+        self.num_ticks += 1
+        return skipped
+
+    def summary(self) -> str:
+        lines = [
+            f"Control loop: {self.num_ticks} ticks at {1.0 / self.period:.1f} Hz, "
+            f"{self.num_overruns} overruns, {self.num_skipped} skipped ticks"
+        ]
+        lines.append(f"{'phase':<12}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}  [ms]")
+        for phase, hist in self.histograms.items():
+            lines.append(
+                f"{phase:<12}{hist.mean() * 1e3:>10.3f}{hist.percentile(50) * 1e3:>10.3f}"
+                f"{hist.percentile(99) * 1e3:>10.3f}{hist.max * 1e3:>10.3f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str):
+        """Write the counters and the histograms to a json file."""
+        data = {
+            "period": self.period,
+            "bin_width": self.bin_width,
+            "num_ticks": self.num_ticks,
+            "num_overruns": self.num_overruns,
+            "num_skipped": self.num_skipped,
+            "phases": {
+                phase: {
+                    "count": hist.count,
+                    "mean": hist.mean(),
+                    "max": hist.max,
+                    "counts": hist.counts.tolist(),
+                }
+                for phase, hist in self.histograms.items()
+            },
+        }
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def _record(self, phase: str, duration: float):
+        hist = self.histograms.get(phase)
+        if hist is None:
+            hist = self.histograms[phase] = TimingHistogram(2 * self.period, self.bin_width)
+        hist.record(duration)
@@ -0,0 +1,123 @@
+"""Stand-ins for the unitree_sdk2py LowCmd/LowState messages and channels, to run the deploy code without a robot.
+
+The messages have the fields of the hg message type that the deploy code reads and writes. :class:`FakeRobot` hands
+out a publisher and a subscriber connected in process: every written command updates the robot state through
+``on_command``, which by default echoes the commanded positions back, and the new state is passed to the subscribers.
+"""
+
+import numpy as np
+
+
+class FakeMotorCmd:
+    def __init__(self):
+        self.mode = 0
+        self.q = 0.0
+        self.qd = 0.0
+        self.kp = 0.0
+        self.kd = 0.0
+        self.tau = 0.0
+
+
+class FakeMotorState:
+    def __init__(self):
+        self.mode = 0
+        self.q = 0.0
+        self.dq = 0.0
+        self.ddq = 0.0
+        self.tau_est = 0.0
+
+
+class FakeImuState:
+    def __init__(self):
+        self.quaternion = [1.0, 0.0, 0.0, 0.0]
+        self.gyroscope = [0.0, 0.0, 0.0]
+        self.accelerometer = [0.0, 0.0, 0.0]
+        self.rpy = [0.0, 0.0, 0.0]
+
+
+class FakeLowCmd:
+    def __init__(self, num_motors: int = 35):
+        self.mode_pr = 0
+        self.mode_machine = 0
+        self.motor_cmd = [FakeMotorCmd() for _ in range(num_motors)]
+        self.crc = 0
+
+
+class FakeLowState:
+    def __init__(self, num_motors: int = 35):
+        self.tick = 0
+        self.mode_pr = 0
+        self.mode_machine = 0
+        self.imu_state = FakeImuState()
+        self.motor_state = [FakeMotorState() for _ in range(num_motors)]
+        self.wireless_remote = bytes(40)
+        self.crc = 0
+
+
+def echo_command(low_cmd: FakeLowCmd, low_state: FakeLowState):
+    """Default robot model: every motor reaches its commanded position instantly."""
+    for cmd, state in zip(low_cmd.motor_cmd, low_state.motor_state):
+        state.q = cmd.q
+        state.dq = 0.0
+
+
+class FakeChannelPublisher:
+    """Drop-in for ``ChannelPublisher`` that forwards written commands to :class:`FakeRobot`."""
+
+    def __init__(self, robot: "FakeRobot"):
+        self.robot = robot
+
+    def Init(self):
+        pass
+
+    def Write(self, msg):
+        self.robot.receive(msg)
+        return True
+
+
+class FakeChannelSubscriber:
+    """Drop-in for ``ChannelSubscriber`` whose handler is called by :class:`FakeRobot` with every new state."""
+
+    def __init__(self, robot: "FakeRobot"):
+        self.robot = robot
+
+    def Init(self, handler, queue_len: int = 0):
+        self.robot.handlers.append(handler)
+
+
+class FakeRobot:
+    """In-process robot that answers every command with a new LowState.
+
+    Args:
+        num_motors: The number of motor entries of the messages.
+        on_command: Function updating the state from a received command. Defaults to :func:`echo_command`.
+    """
+
+    def __init__(self, num_motors: int = 35, on_command=echo_command):
+        self.low_state = FakeLowState(num_motors)
+        self.on_command = on_command
+        self.handlers = []
+        self.num_commands = 0
+
+    def publisher(self) -> FakeChannelPublisher:
+        return FakeChannelPublisher(self)
+
+    def subscriber(self) -> FakeChannelSubscriber:
+        return FakeChannelSubscriber(self)
+
+    def set_joint_state(self, motor_idx, q, dq=None):
+        """Set the measured state of some motors, e.g. to start from a random pose."""
+        dq = np.zeros(len(motor_idx)) if dq is None else dq
+        for i, q_i, dq_i in zip(motor_idx, np.asarray(q, dtype=np.float64).tolist(), np.asarray(dq).tolist()):
+            self.low_state.motor_state[i].q = q_i
+            self.low_state.motor_state[i].dq = dq_i
+
+    def publish_state(self):
+        self.low_state.tick += 1
+        for handler in self.handlers:
+            handler(self.low_state)
+
+    def receive(self, low_cmd):
+        self.num_commands += 1
+        self.on_command(low_cmd, self.low_state)
+        self.publish_state()
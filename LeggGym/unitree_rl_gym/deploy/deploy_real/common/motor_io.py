@@ -0,0 +1,64 @@
+from operator import itemgetter
+
+import numpy as np
+
+
+class MotorIO:
+    """Index-mapped motor I/O between numpy arrays in joint order and the per-motor fields of LowCmd/LowState.
+
+    The motor command entries of ``low_cmd`` are looked up once and written with plain Python floats, instead of
+    indexing the message, numpy scalars and config lists motor by motor. The gains, velocity and feed-forward torque
+    fields only change with :meth:`set_gains`, so they are written once after it and every other command only writes
+    the target positions. The motor states are gathered into preallocated float32 arrays.
+
+    Code that modifies the same command entries behind this class's back, e.g. ``create_zero_cmd``, must be followed
+    by :meth:`set_gains` before the next :meth:`write`.
+
+    Args:
+        low_cmd: The command message that is sent to the robot. Its motor command entries are kept by reference.
+        motor_idx: The motor index of every joint, e.g. ``leg_joint2motor_idx``.
+    """
+
+    def __init__(self, low_cmd, motor_idx):
+        self.motor_idx = list(motor_idx)
+        self.num_motors = len(self.motor_idx)
+        self._motor_cmds = [low_cmd.motor_cmd[i] for i in self.motor_idx]
+        self._select = itemgetter(*self.motor_idx) if self.num_motors > 1 else lambda seq: (seq[self.motor_idx[0]],)
+
+        self.q = np.zeros(self.num_motors, dtype=np.float32)
+        self.dq = np.zeros(self.num_motors, dtype=np.float32)
+        self._kp = [0.0] * self.num_motors
+        self._kd = [0.0] * self.num_motors
+        self._gains_written = False
+
+    def read(self, low_state):
+        """Gather the joint positions and velocities of a LowState message into :attr:`q` and :attr:`dq`.
+
+        The arrays are overwritten in place on every call and returned for convenience.
+        """
+        q, dq = self.q, self.dq
+        for i, state in enumerate(self._select(low_state.motor_state)):
+            q[i] = state.q
+            dq[i] = state.dq
+        return q, dq
+
+    def set_gains(self, kp, kd):
+        """Set the PD gains, written with zero velocity and torque along with the next command."""
+        self._kp = np.asarray(kp, dtype=np.float64).reshape(self.num_motors).tolist()
+        self._kd = np.asarray(kd, dtype=np.float64).reshape(self.num_motors).tolist()
+        self._gains_written = False
+
+    def write(self, q):
+        """Scatter target positions in joint order into the command message."""
+        q = np.asarray(q, dtype=np.float64).reshape(self.num_motors).tolist()
+        if self._gains_written:
+            for cmd, q_i in zip(self._motor_cmds, q):
+                cmd.q = q_i
+            return
+        for cmd, q_i, kp_i, kd_i in zip(self._motor_cmds, q, self._kp, self._kd):
+            cmd.q = q_i
+            cmd.qd = 0.0
+            cmd.kp = kp_i
+            cmd.kd = kd_i
+            cmd.tau = 0.0
+        self._gains_written = True
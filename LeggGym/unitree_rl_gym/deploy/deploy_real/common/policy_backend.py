@@ -0,0 +1,198 @@
+"""Inference backends for the exported policies of the deploy scripts.
+
+A backend is created with :func:`load_policy` from the ``policy_backend`` entry of the deploy config:
+
+- ``torchscript``: the exported TorchScript file, run with torch.
+- ``onnx``: ONNX Runtime on the CPU, without importing torch.
+- ``onnx_int8``: ONNX Runtime on a copy of the model with int8 dynamically quantized weights.
+
+Every backend owns preallocated observation and action buffers, so a call copies the observation in, runs the
+network and returns the same action array every time. The ONNX backends bind these buffers to the session once, and
+the recurrent state of LSTM policies is kept in bound buffers too. The ONNX files are exported from the TorchScript
+file by :func:`export_onnx`, which is done once and cached next to it when the ``.onnx`` file does not exist yet.
+"""
+
+import inspect
+import os
+
+import numpy as np
+
+BACKENDS = ("torchscript", "onnx", "onnx_int8")
+
+
+class PolicyBackend:
+    """Common interface of the inference backends.
+
+    Args:
+        num_obs: The size of the observation.
+        num_actions: The size of the action.
+    """
+
+    def __init__(self, num_obs: int, num_actions: int):
+        self.num_obs = num_obs
+        self.num_actions = num_actions
+        self.obs = np.zeros((1, num_obs), dtype=np.float32)
+        self.action = np.zeros((1, num_actions), dtype=np.float32)
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        """Compute the action of an observation, the returned array is overwritten by the next call."""
+        self.obs[0] = obs
+        self._run()
+        return self.action[0]
+
+    def reset(self):
+        """Clear the recurrent state, if any."""
+        pass
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class TorchScriptBackend(PolicyBackend):
+    def __init__(self, path: str, num_obs: int, num_actions: int, num_threads: int = 1):
+        super().__init__(num_obs, num_actions)
+        import torch
+
+        torch.set_num_threads(num_threads)
+        self._torch = torch
+        self.module = torch.jit.load(path, map_location="cpu").eval()
+        # the observation tensor shares the memory of the observation buffer
+        self._obs_tensor = torch.from_numpy(self.obs)
+        self._action_tensor = torch.from_numpy(self.action)
+
+    def reset(self):
+        if hasattr(self.module, "reset_memory"):
+            self.module.reset_memory()
+
+    def _run(self):
+        with self._torch.inference_mode():
+            self._action_tensor.copy_(self.module(self._obs_tensor))
+
+
+class OnnxBackend(PolicyBackend):
+    """ONNX Runtime backend with the input, output and recurrent state buffers bound once.
+
+    Models exported by :func:`export_onnx` from LSTM policies take the hidden and cell states as extra inputs
+    ``h_in``/``c_in`` and return the next ones as ``h_out``/``c_out``.
+    """
+
+    def __init__(self, path: str, num_obs: int, num_actions: int, num_threads: int = 1):
+        super().__init__(num_obs, num_actions)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+        inputs = {arg.name: arg for arg in self.session.get_inputs()}
+        self._states = {}
+        for name in ("h", "c"):
+            if f"{name}_in" in inputs:
+                shape = inputs[f"{name}_in"].shape
+                # current state read by the model, next state written by it
+                self._states[name] = (np.zeros(shape, dtype=np.float32), np.zeros(shape, dtype=np.float32))
+
+        self._binding = self.session.io_binding()
+        self._bind_array(self._binding.bind_input, "obs", self.obs)
+        self._bind_array(self._binding.bind_output, "actions", self.action)
+        for name, (current, upcoming) in self._states.items():
+            self._bind_array(self._binding.bind_input, f"{name}_in", current)
+            self._bind_array(self._binding.bind_output, f"{name}_out", upcoming)
+
+    def reset(self):
+        for current, _ in self._states.values():
+            current[:] = 0.0
+
+    @staticmethod
+    def _bind_array(bind, name: str, array: np.ndarray):
+        bind(name, "cpu", 0, np.float32, list(array.shape), array.ctypes.data)
+
+    def _run(self):
+        self.session.run_with_iobinding(self._binding)
+        for current, upcoming in self._states.values():
+            current[:] = upcoming
+
+
+def export_onnx(torchscript_path: str, onnx_path: str, num_obs: int):
+    """Export a TorchScript policy of ``legged_gym.utils.export_policy_as_jit`` to ONNX.
+
+    The recurrent state of LSTM policies becomes explicit inputs and outputs, see :class:`OnnxBackend`.
+    """
+    import torch
+
+    module = torch.jit.load(torchscript_path, map_location="cpu").eval()
+    obs = torch.zeros(1, num_obs)
+    # TorchScript modules need the TorchScript-based exporter, the default since torch 2.9 is the dynamo one
+    kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    if hasattr(module, "hidden_state"):
+        # a loaded scripted LSTM only keeps its overloads, so the exported one is rebuilt from its weights
+        weights = module.memory.state_dict()
+        num_layers = sum(name.startswith("weight_ih_l") for name in weights)
+        hidden_size, input_size = weights["weight_ih_l0"].shape[0] // 4, weights["weight_ih_l0"].shape[1]
+        memory = torch.nn.LSTM(input_size, hidden_size, num_layers)
+        memory.load_state_dict(weights)
+
+        class StatelessLSTMPolicy(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.memory = memory
+                self.actor = module.actor
+
+            def forward(self, obs, h, c):
+                out, (h, c) = self.memory(obs.unsqueeze(0), (h, c))
+                return self.actor(out.squeeze(0)), h, c
+
+        state = torch.zeros_like(module.hidden_state)
+        torch.onnx.export(
+            torch.jit.script(StatelessLSTMPolicy()),
+            (obs, state, state.clone()),
+            onnx_path,
+            input_names=["obs", "h_in", "c_in"],
+            output_names=["actions", "h_out", "c_out"],
+            opset_version=17,
+            **kwargs,
+        )
+    else:
+        torch.onnx.export(
+            module, (obs,), onnx_path, input_names=["obs"], output_names=["actions"], opset_version=17, **kwargs
+        )
+
+
+def quantize_onnx(onnx_path: str, quantized_path: str):
+    """Quantize the weights of an ONNX model to int8, activations are quantized dynamically at run time."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+
+
+def load_policy(
+    path: str, num_obs: int, num_actions: int, backend: str = "torchscript", num_threads: int = 1
+) -> PolicyBackend:
+    """Create the inference backend of a policy.
+
+    Args:
+        path: The TorchScript policy file, or directly an ``.onnx`` file for the ONNX backends.
+        num_obs: The size of the observation.
+        num_actions: The size of the action.
+        backend: One of :data:`BACKENDS`. Defaults to ``torchscript``.
+        num_threads: The number of CPU threads used by the backend. Defaults to 1.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Invalid policy backend '{backend}', expected one of {BACKENDS}.")
+    if backend == "torchscript":
+        return TorchScriptBackend(path, num_obs, num_actions, num_threads)
+
+    onnx_path = path if path.endswith(".onnx") else os.path.splitext(path)[0] + ".onnx"
+    if not os.path.isfile(onnx_path):
+        print(f"Exporting the policy to {onnx_path}")
+        export_onnx(path, onnx_path, num_obs)
+    if backend == "onnx_int8":
+        quantized_path = os.path.splitext(onnx_path)[0] + ".int8.onnx"
+        if not os.path.isfile(quantized_path):
+            print(f"Quantizing the policy to {quantized_path}")
+            quantize_onnx(onnx_path, quantized_path)
+        onnx_path = quantized_path
+    return OnnxBackend(onnx_path, num_obs, num_actions, num_threads)
@@ -21,6 +21,8 @@ class Config:
             self.lowstate_topic = config["lowstate_topic"]
 
             self.policy_path = config["policy_path"].replace("{LEGGED_GYM_ROOT_DIR}", LEGGED_GYM_ROOT_DIR)
+            self.policy_backend = config.get("policy_backend", "torchscript")
+            self.policy_threads = config.get("policy_threads", 1)
 
             self.leg_joint2motor_idx = config["leg_joint2motor_idx"]
             self.kps = config["kps"]
@@ -2,7 +2,6 @@ from legged_gym import LEGGED_GYM_ROOT_DIR
 from typing import Union
 import numpy as np
 import time
-import torch
 
 from unitree_sdk2py.core.channel import ChannelPublisher, ChannelFactoryInitialize
 from unitree_sdk2py.core.channel import ChannelSubscriber, ChannelFactoryInitialize
@@ -14,6 +13,9 @@ from unitree_sdk2py.idl.unitree_hg.msg.dds_ import LowState_ as LowStateHG
 from unitree_sdk2py.idl.unitree_go.msg.dds_ import LowState_ as LowStateGo
 from unitree_sdk2py.utils.crc import CRC
 
+from common.control_loop import ControlLoop
+from common.motor_io import MotorIO
+from common.policy_backend import load_policy
 from common.command_helper import create_damping_cmd, create_zero_cmd, init_cmd_hg, init_cmd_go, MotorMode
 from common.rotation_helper import get_gravity_orientation, transform_imu_data
 from common.remote_controller import RemoteController, KeyMap
@@ -21,22 +23,44 @@ from config import Config
 
 
 class Controller:
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, robot=None) -> None:
+        """Set up the policy and the robot communication.
+
+        Args:
+            config: The deploy config.
+            robot: An in-process stand-in of the robot, e.g. ``common.fake_dds.FakeRobot``, used instead of DDS.
+        """
         self.config = config
         self.remote_controller = RemoteController()
+        # the fake messages of an in-process robot have no wire layout to checksum
+        self.crc = CRC() if robot is None else None
 
         # Initialize the policy network
-        self.policy = torch.jit.load(config.policy_path)
+        self.policy = load_policy(
+            config.policy_path, config.num_obs, config.num_actions, config.policy_backend, config.policy_threads
+        )
         # Initializing process variables
-        self.qj = np.zeros(config.num_actions, dtype=np.float32)
-        self.dqj = np.zeros(config.num_actions, dtype=np.float32)
         self.action = np.zeros(config.num_actions, dtype=np.float32)
         self.target_dof_pos = config.default_angles.copy()
         self.obs = np.zeros(config.num_obs, dtype=np.float32)
         self.cmd = np.array([0.0, 0, 0])
         self.counter = 0
+        # every loop below ticks on the same deadline grid
+        self.loop = ControlLoop(config.control_dt)
+
+        if robot is not None:
+            from common.fake_dds import FakeLowCmd
+
+            self.low_cmd = FakeLowCmd()
+            self.low_state = robot.low_state
+            self.mode_pr_ = MotorMode.PR
+            self.mode_machine_ = 0
 
-        if config.msg_type == "hg":
+            self.lowcmd_publisher_ = robot.publisher()
+            self.lowstate_subscriber = robot.subscriber()
+            self.lowstate_subscriber.Init(self.LowStateHgHandler, 10)
+
+        elif config.msg_type == "hg":
             # g1 and h1_2 use the hg msg type
             self.low_cmd = unitree_hg_msg_dds__LowCmd_()
             self.low_state = unitree_hg_msg_dds__LowState_()
@@ -64,14 +88,23 @@ class Controller:
             raise ValueError("Invalid msg_type")
 
         # wait for the subscriber to receive data
+        if robot is not None:
+            robot.publish_state()
         self.wait_for_low_state()
 
         # Initialize the command msg
-        if config.msg_type == "hg":
+        if config.msg_type == "hg" or robot is not None:
             init_cmd_hg(self.low_cmd, self.mode_machine_, self.mode_pr_)
         elif config.msg_type == "go":
             init_cmd_go(self.low_cmd, weak_motor=self.config.weak_motor)
 
+        self.leg_io = MotorIO(self.low_cmd, config.leg_joint2motor_idx)
+        self.arm_waist_io = MotorIO(self.low_cmd, config.arm_waist_joint2motor_idx)
+        self.set_gains()
+        # the leg state is read in place
+        self.qj = self.leg_io.q
+        self.dqj = self.leg_io.dq
+
     def LowStateHgHandler(self, msg: LowStateHG):
         self.low_state = msg
         self.mode_machine_ = self.low_state.mode_machine
@@ -81,8 +114,14 @@ class Controller:
         self.low_state = msg
         self.remote_controller.set(self.low_state.wireless_remote)
 
+    def set_gains(self):
+        # written along with the next command of each motor group
+        self.leg_io.set_gains(self.config.kps, self.config.kds)
+        self.arm_waist_io.set_gains(self.config.arm_waist_kps, self.config.arm_waist_kds)
+
     def send_cmd(self, cmd: Union[LowCmdGo, LowCmdHG]):
-        cmd.crc = CRC().Crc(cmd)
+        if self.crc is not None:
+            cmd.crc = self.crc.Crc(cmd)
         self.lowcmd_publisher_.Write(cmd)
 
     def wait_for_low_state(self):
@@ -96,66 +135,41 @@ class Controller:
         while self.remote_controller.button[KeyMap.start] != 1:
             create_zero_cmd(self.low_cmd)
             self.send_cmd(self.low_cmd)
-            time.sleep(self.config.control_dt)
+            self.loop.wait()
+        # the zero cmd cleared the gains
+        self.set_gains()
 
     def move_to_default_pos(self):
         print("Moving to default pos.")
         # move time 2s
         total_time = 2
         num_step = int(total_time / self.config.control_dt)
-        
-        dof_idx = self.config.leg_joint2motor_idx + self.config.arm_waist_joint2motor_idx
-        kps = self.config.kps + self.config.arm_waist_kps
-        kds = self.config.kds + self.config.arm_waist_kds
-        default_pos = np.concatenate((self.config.default_angles, self.config.arm_waist_target), axis=0)
-        dof_size = len(dof_idx)
-        
+
         # record the current pos
-        init_dof_pos = np.zeros(dof_size, dtype=np.float32)
-        for i in range(dof_size):
-            init_dof_pos[i] = self.low_state.motor_state[dof_idx[i]].q
-        
+        init_leg_pos = self.leg_io.read(self.low_state)[0].copy()
+        init_arm_waist_pos = self.arm_waist_io.read(self.low_state)[0].copy()
+
         # move to default pos
         for i in range(num_step):
             alpha = i / num_step
-            for j in range(dof_size):
-                motor_idx = dof_idx[j]
-                target_pos = default_pos[j]
-                self.low_cmd.motor_cmd[motor_idx].q = init_dof_pos[j] * (1 - alpha) + target_pos * alpha
-                self.low_cmd.motor_cmd[motor_idx].qd = 0
-                self.low_cmd.motor_cmd[motor_idx].kp = kps[j]
-                self.low_cmd.motor_cmd[motor_idx].kd = kds[j]
-                self.low_cmd.motor_cmd[motor_idx].tau = 0
+            self.leg_io.write(init_leg_pos * (1 - alpha) + self.config.default_angles * alpha)
+            self.arm_waist_io.write(init_arm_waist_pos * (1 - alpha) + self.config.arm_waist_target * alpha)
             self.send_cmd(self.low_cmd)
-            time.sleep(self.config.control_dt)
+            self.loop.wait()
 
     def default_pos_state(self):
         print("Enter default pos state.")
         print("Waiting for the Button A signal...")
         while self.remote_controller.button[KeyMap.A] != 1:
-            for i in range(len(self.config.leg_joint2motor_idx)):
-                motor_idx = self.config.leg_joint2motor_idx[i]
-                self.low_cmd.motor_cmd[motor_idx].q = self.config.default_angles[i]
-                self.low_cmd.motor_cmd[motor_idx].qd = 0
-                self.low_cmd.motor_cmd[motor_idx].kp = self.config.kps[i]
-                self.low_cmd.motor_cmd[motor_idx].kd = self.config.kds[i]
-                self.low_cmd.motor_cmd[motor_idx].tau = 0
-            for i in range(len(self.config.arm_waist_joint2motor_idx)):
-                motor_idx = self.config.arm_waist_joint2motor_idx[i]
-                self.low_cmd.motor_cmd[motor_idx].q = self.config.arm_waist_target[i]
-                self.low_cmd.motor_cmd[motor_idx].qd = 0
-                self.low_cmd.motor_cmd[motor_idx].kp = self.config.arm_waist_kps[i]
-                self.low_cmd.motor_cmd[motor_idx].kd = self.config.arm_waist_kds[i]
-                self.low_cmd.motor_cmd[motor_idx].tau = 0
+            self.leg_io.write(self.config.default_angles)
+            self.arm_waist_io.write(self.config.arm_waist_target)
             self.send_cmd(self.low_cmd)
-            time.sleep(self.config.control_dt)
+            self.loop.wait()
 
     def run(self):
         self.counter += 1
         # Get the current joint position and velocity
-        for i in range(len(self.config.leg_joint2motor_idx)):
-            self.qj[i] = self.low_state.motor_state[self.config.leg_joint2motor_idx[i]].q
-            self.dqj[i] = self.low_state.motor_state[self.config.leg_joint2motor_idx[i]].dq
+        self.leg_io.read(self.low_state)
 
         # imu_state quaternion: w, x, y, z
         quat = self.low_state.imu_state.quaternion
@@ -167,6 +181,7 @@ class Controller:
             waist_yaw = self.low_state.motor_state[self.config.arm_waist_joint2motor_idx[0]].q
             waist_yaw_omega = self.low_state.motor_state[self.config.arm_waist_joint2motor_idx[0]].dq
             quat, ang_vel = transform_imu_data(waist_yaw=waist_yaw, waist_yaw_omega=waist_yaw_omega, imu_quat=quat, imu_omega=ang_vel)
+        self.loop.mark("state_read")
 
         # create observation
         gravity_orientation = get_gravity_orientation(quat)
@@ -194,35 +209,26 @@ class Controller:
         self.obs[9 + num_actions * 2 : 9 + num_actions * 3] = self.action
         self.obs[9 + num_actions * 3] = sin_phase
         self.obs[9 + num_actions * 3 + 1] = cos_phase
+        self.loop.mark("obs_build")
 
         # Get the action from the policy network
-        obs_tensor = torch.from_numpy(self.obs).unsqueeze(0)
-        self.action = self.policy(obs_tensor).detach().numpy().squeeze()
+        self.action[:] = self.policy(self.obs)
+        self.loop.mark("inference")
         
         # transform action to target_dof_pos
         target_dof_pos = self.config.default_angles + self.action * self.config.action_scale
 
         # Build low cmd
-        for i in range(len(self.config.leg_joint2motor_idx)):
-            motor_idx = self.config.leg_joint2motor_idx[i]
-            self.low_cmd.motor_cmd[motor_idx].q = target_dof_pos[i]
-            self.low_cmd.motor_cmd[motor_idx].qd = 0
-            self.low_cmd.motor_cmd[motor_idx].kp = self.config.kps[i]
-            self.low_cmd.motor_cmd[motor_idx].kd = self.config.kds[i]
-            self.low_cmd.motor_cmd[motor_idx].tau = 0
-
-        for i in range(len(self.config.arm_waist_joint2motor_idx)):
-            motor_idx = self.config.arm_waist_joint2motor_idx[i]
-            self.low_cmd.motor_cmd[motor_idx].q = self.config.arm_waist_target[i]
-            self.low_cmd.motor_cmd[motor_idx].qd = 0
-            self.low_cmd.motor_cmd[motor_idx].kp = self.config.arm_waist_kps[i]
-            self.low_cmd.motor_cmd[motor_idx].kd = self.config.arm_waist_kds[i]
-            self.low_cmd.motor_cmd[motor_idx].tau = 0
+        self.leg_io.write(target_dof_pos)
+        self.arm_waist_io.write(self.config.arm_waist_target)
+        self.loop.mark("cmd_pack")
 
         # send the command
         self.send_cmd(self.low_cmd)
+        self.loop.mark("send")
 
-        time.sleep(self.config.control_dt)
+        # wait for the next deadline, skipped ticks still advance the gait phase
+        self.counter += self.loop.wait()
 
 
 if __name__ == "__main__":
@@ -231,6 +237,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("net", type=str, help="network interface")
     parser.add_argument("config", type=str, help="config file name in the configs folder", default="g1.yaml")
+    parser.add_argument("--timing_log", type=str, default=None, help="json file to dump the control loop timings to")
     args = parser.parse_args()
 
     # Load config
@@ -262,4 +269,8 @@ if __name__ == "__main__":
     # Enter the damping state
     create_damping_cmd(controller.low_cmd)
     controller.send_cmd(controller.low_cmd)
+    print(controller.loop.summary())
+    if args.timing_log is not None:
+        controller.loop.dump(args.timing_log)
+        print(f"Timings saved to {args.timing_log}")
     print("Exit")
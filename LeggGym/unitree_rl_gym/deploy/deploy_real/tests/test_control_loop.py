@@ -0,0 +1,148 @@
+"""Tests of the deploy control loop and motor I/O against the in-process robot of ``common.fake_dds``.
+
+Run from the repository root with ``python -m pytest deploy/deploy_real/tests``.
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+# the deploy code imports its helpers as the top-level ``common`` package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common.control_loop import ControlLoop  # noqa: E402
+from common.fake_dds import FakeLowCmd, FakeRobot  # noqa: E402
+from common.motor_io import MotorIO  # noqa: E402
+
+# a joint order that differs from the motor order, as in the deploy configs
+MOTOR_IDX = [4, 0, 7, 2, 9]
+
+
+@pytest.fixture
+def robot():
+    return FakeRobot()
+
+
+@pytest.fixture
+def low_cmd():
+    return FakeLowCmd()
+
+
+def connect(robot, low_cmd):
+    """Connect a MotorIO and a LowState receiver to the robot, as done by the Controller."""
+    received = []
+    robot.subscriber().Init(received.append, 10)
+    publisher = robot.publisher()
+    publisher.Init()
+    return MotorIO(low_cmd, MOTOR_IDX), publisher, received
+
+
+def test_command_write_through(robot, low_cmd):
+    """Targets in joint order reach the mapped motor commands, with the gains written once after set_gains."""
+    io, publisher, received = connect(robot, low_cmd)
+    kp, kd = np.arange(1.0, 6.0), np.arange(0.1, 0.6, 0.1)
+    io.set_gains(kp, kd)
+    target = np.array([0.5, -0.25, 1.0, 0.125, -1.5], dtype=np.float32)
+    io.write(target)
+    assert publisher.Write(low_cmd)
+
+    for joint, motor in enumerate(MOTOR_IDX):
+        cmd = low_cmd.motor_cmd[motor]
+        assert cmd.q == pytest.approx(target[joint])
+        assert cmd.kp == pytest.approx(kp[joint])
+        assert cmd.kd == pytest.approx(kd[joint])
+        assert cmd.qd == 0.0 and cmd.tau == 0.0
+    # motors outside of the map are not touched
+    assert all(low_cmd.motor_cmd[i].q == 0.0 and low_cmd.motor_cmd[i].kp == 0.0 for i in (1, 3, 5, 6, 8))
+    # the robot received the command and published a new state
+    assert robot.num_commands == 1
+    assert len(received) == 1 and received[0].tick == 1
+
+    # the following commands only write the targets
+    low_cmd.motor_cmd[MOTOR_IDX[0]].kp = 0.0
+    io.write(target + 1.0)
+    assert low_cmd.motor_cmd[MOTOR_IDX[0]].kp == 0.0
+    assert low_cmd.motor_cmd[MOTOR_IDX[0]].q == pytest.approx(target[0] + 1.0)
+    # until the gains are set again, e.g. after a zero command cleared them
+    io.set_gains(kp, kd)
+    io.write(target)
+    assert low_cmd.motor_cmd[MOTOR_IDX[0]].kp == pytest.approx(kp[0])
+
+
+def test_state_read_back(robot, low_cmd):
+    """States are gathered in joint order into preallocated float32 arrays."""
+    io, publisher, received = connect(robot, low_cmd)
+    q = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+    dq = np.array([-1.0, -2.0, -3.0, -4.0, -5.0])
+    robot.set_joint_state(MOTOR_IDX, q, dq)
+    robot.publish_state()
+
+    q_read, dq_read = io.read(received[-1])
+    assert q_read is io.q and dq_read is io.dq
+    assert q_read.dtype == np.float32
+    np.testing.assert_allclose(q_read, q, rtol=1e-6)
+    np.testing.assert_allclose(dq_read, dq, rtol=1e-6)
+
+    # commanded positions are echoed back by the default robot model
+    io.set_gains(np.ones(5), np.ones(5))
+    io.write(-q)
+    publisher.Write(low_cmd)
+    io.read(received[-1])
+    np.testing.assert_allclose(io.q, -q, rtol=1e-6)
+    np.testing.assert_allclose(io.dq, np.zeros(5))
+
+
+def test_loop_timing_and_termination(robot, low_cmd, tmp_path):
+    """The loop runs the requested number of ticks on the period grid, driving the robot once per tick."""
+    io, publisher, received = connect(robot, low_cmd)
+    io.set_gains(np.ones(5), np.ones(5))
+    period, num_ticks = 2e-3, 50
+    loop = ControlLoop(period)
+
+    loop.wait()
+    start = time.monotonic()
+    for step in range(num_ticks):
+        io.read(robot.low_state)
+        loop.mark("state_read")
+        io.write(np.full(5, step, dtype=np.float32))
+        loop.mark("cmd_pack")
+        publisher.Write(low_cmd)
+        loop.mark("send")
+        loop.wait()
+    elapsed = time.monotonic() - start
+
+    # the first wait starts the grid, every other one ends a tick
+    assert loop.num_ticks == num_ticks + 1
+    assert robot.num_commands == num_ticks and len(received) == num_ticks
+    np.testing.assert_allclose(io.read(received[-1])[0], np.full(5, num_ticks - 1))
+    # the ticks do not drift off the grid, skipped ticks on a loaded machine shorten the run by whole periods
+    assert elapsed >= (num_ticks - loop.num_skipped) * period - 1e-4
+    assert elapsed < num_ticks * period + 0.5
+    for phase in ("state_read", "cmd_pack", "send", "tick", "period"):
+        assert phase in loop.histograms
+    assert loop.histograms["send"].count == num_ticks
+    assert loop.histograms["period"].count == num_ticks
+
+    loop.dump(str(tmp_path / "timings.json"))
+    with open(tmp_path / "timings.json") as f:
+        assert json.load(f)["num_ticks"] == num_ticks + 1
+    assert "overruns" in loop.summary()
+
+
+def test_loop_overrun_skips_missed_ticks():
+    """A tick longer than several periods is an overrun, and the missed periods are skipped instead of caught up."""
+    period = 5e-3
+    loop = ControlLoop(period)
+    loop.wait()
+    time.sleep(3.5 * period)
+    skipped = loop.wait()
+    assert loop.num_overruns == 1
+    assert skipped >= 1 and loop.num_skipped == skipped
+    # the next tick is on the grid again and waits for its deadline
+    start = time.monotonic()
+    assert loop.wait() == 0
+    assert 0.0 < time.monotonic() - start <= period + 1e-3
@@ -13,12 +13,16 @@ from typing import Tuple, Dict
 
 from legged_gym import LEGGED_GYM_ROOT_DIR
 from legged_gym.envs.base.base_task import BaseTask
-from legged_gym.utils.math import wrap_to_pi
+from legged_gym.utils.math import quat_apply_yaw, wrap_to_pi
+from legged_gym.utils.terrain import Terrain
 from legged_gym.utils.isaacgym_utils import get_euler_xyz as get_euler_xyz_in_tensor
 from legged_gym.utils.helpers import class_to_dict
 from .legged_robot_config import LeggedRobotCfg
 
 class LeggedRobot(BaseTask):
+    # whether compute_observations appends the measured heights to the configured observations
+    observe_heights = True
+
     def __init__(self, cfg: LeggedRobotCfg, sim_params, physics_engine, sim_device, headless):
         """ Parses the provided config file,
             calls create_sim() (which creates, simulation and environments),
@@ -39,6 +43,10 @@ class LeggedRobot(BaseTask):
         self.init_done = False
         self._parse_cfg(self.cfg)
         super().__init__(self.cfg, sim_params, physics_engine, sim_device, headless)
+        if self.num_height_obs > 0:
+            # cfg.env.num_observations only counts the proprioceptive observations
+            self.num_obs += self.num_height_obs
+            self.obs_buf = torch.zeros(self.num_envs, self.num_obs, device=self.device, dtype=torch.float)
 
         if not self.headless:
             self.set_camera(self.cfg.viewer.pos, self.cfg.viewer.lookat)
@@ -57,8 +65,14 @@ class LeggedRobot(BaseTask):
         self.actions = torch.clip(actions, -clip_actions, clip_actions).to(self.device)
         # step physics and render each frame
         self.render()
+        if self.fused_pd:
+            # the targets are constant over the substeps, only the PD law is evaluated per substep
+            torch.add(self.default_dof_pos, self.actions, alpha=self.action_scale, out=self.pd_targets)
         for _ in range(self.cfg.control.decimation):
-            self.torques = self._compute_torques(self.actions).view(self.torques.shape)
+            if self.fused_pd:
+                self._compute_fused_pd_torques()
+            else:
+                self.torques = self._compute_torques(self.actions).view(self.torques.shape)
             self.gym.set_dof_actuation_force_tensor(self.sim, gymtorch.unwrap_tensor(self.torques))
             self.gym.simulate(self.sim)
             if self.cfg.env.test:
@@ -136,6 +150,10 @@ class LeggedRobot(BaseTask):
         if len(env_ids) == 0:
             return
         
+        # update curriculum
+        if self.cfg.terrain.curriculum:
+            self._update_terrain_curriculum(env_ids)
+
         # reset robot states
         self._reset_dofs(env_ids)
         self._reset_root_states(env_ids)
@@ -154,6 +172,10 @@ class LeggedRobot(BaseTask):
         for key in self.episode_sums.keys():
             self.extras["episode"]['rew_' + key] = torch.mean(self.episode_sums[key][env_ids]) / self.max_episode_length_s
             self.episode_sums[key][env_ids] = 0.
+        if self.cfg.rewards.profile_terms:
+            self._log_reward_timings()
+        if self.cfg.terrain.curriculum:
+            self.extras["episode"]["terrain_level"] = torch.mean(self.terrain_levels.float())
         if self.cfg.commands.curriculum:
             self.extras["episode"]["max_command_x"] = self.command_ranges["lin_vel_x"][1]
         # send timeout info to the algorithm
@@ -163,14 +185,16 @@ class LeggedRobot(BaseTask):
     def compute_reward(self):
         """ Compute rewards
             Calls each reward function which had a non-zero scale (processed in self._prepare_reward_function())
-            adds each terms to the episode sums and to the total reward
+            into the columns of one (num_envs, num_terms) tensor, then computes the total reward with one matrix-vector
+            product and adds the scaled terms to the episode sums in one op.
         """
-        self.rew_buf[:] = 0.
-        for i in range(len(self.reward_functions)):
-            name = self.reward_names[i]
-            rew = self.reward_functions[i]() * self.reward_scales[name]
-            self.rew_buf += rew
-            self.episode_sums[name] += rew
+        if self.cfg.rewards.profile_terms:
+            self._compute_reward_terms_profiled()
+        else:
+            self._reward_terms_fn()
+        num_terms = len(self.reward_functions)
+        torch.mv(self.reward_terms, self.reward_scales_vec, out=self.rew_buf)
+        self.episode_sums_buf[:, :num_terms].addcmul_(self.reward_terms, self.reward_scales_vec)
         if self.cfg.rewards.only_positive_rewards:
             self.rew_buf[:] = torch.clip(self.rew_buf[:], min=0.)
         # add termination reward after clipping
@@ -178,6 +202,35 @@ class LeggedRobot(BaseTask):
             rew = self._reward_termination() * self.reward_scales["termination"]
             self.rew_buf += rew
             self.episode_sums["termination"] += rew
+
+    def _compute_reward_terms(self):
+        """ Writes the unscaled reward terms into self.reward_terms, compiled by torch.compile if cfg.rewards.compile_terms
+        """
+        for i in range(len(self.reward_functions)):
+            self.reward_terms[:, i] = self.reward_functions[i]()
+
+    def _compute_reward_terms_profiled(self):
+        """ Same as self._compute_reward_terms(), timing each term. The device is synchronized around every term.
+        """
+        for i in range(len(self.reward_functions)):
+            if self.device != 'cpu':
+                torch.cuda.synchronize(self.device)
+            start = time.perf_counter()
+            self.reward_terms[:, i] = self.reward_functions[i]()
+            if self.device != 'cpu':
+                torch.cuda.synchronize(self.device)
+            self.reward_timings[self.reward_names[i]] += time.perf_counter() - start
+        self.reward_timing_steps += 1
+
+    def _log_reward_timings(self):
+        """ Logs the mean duration of every reward term since the last call [ms] and restarts the timing
+        """
+        if self.reward_timing_steps == 0:
+            return
+        for name in self.reward_timings.keys():
+            self.extras["episode"]['time_rew_' + name] = 1000. * self.reward_timings[name] / self.reward_timing_steps
+            self.reward_timings[name] = 0.
+        self.reward_timing_steps = 0
     
     def compute_observations(self):
         """ Computes observations
@@ -191,6 +244,9 @@ class LeggedRobot(BaseTask):
                                     self.actions
                                     ),dim=-1)
         # add perceptive inputs if not blind
+        if self.num_height_obs > 0:
+            heights = torch.clip(self.root_states[:, 2].unsqueeze(1) - 0.5 - self.measured_heights, -1, 1.) * self.obs_scales.height_measurements
+            self.obs_buf = torch.cat((self.obs_buf, heights), dim=-1)
         # add noise if needed
         if self.add_noise:
             self.obs_buf += (2 * torch.rand_like(self.obs_buf) - 1) * self.noise_scale_vec
@@ -200,7 +256,17 @@ class LeggedRobot(BaseTask):
         """
         self.up_axis_idx = 2 # 2 for z, 1 for y -> adapt gravity accordingly
         self.sim = self.gym.create_sim(self.sim_device_id, self.graphics_device_id, self.physics_engine, self.sim_params)
-        self._create_ground_plane()
+        mesh_type = self.cfg.terrain.mesh_type
+        if mesh_type in ['heightfield', 'trimesh']:
+            self.terrain = Terrain(self.cfg.terrain, self.num_envs)
+        if mesh_type=='plane':
+            self._create_ground_plane()
+        elif mesh_type=='heightfield':
+            self._create_heightfield()
+        elif mesh_type=='trimesh':
+            self._create_trimesh()
+        elif mesh_type not in [None, 'none']:
+            raise ValueError("Terrain mesh type not recognised. Allowed types are [None, plane, heightfield, trimesh]")
         self._create_envs()
 
     def set_camera(self, position, lookat):
@@ -224,16 +290,9 @@ class LeggedRobot(BaseTask):
             [List[gymapi.RigidShapeProperties]]: Modified rigid shape properties
         """
         if self.cfg.domain_rand.randomize_friction:
-            if env_id==0:
-                # prepare friction randomization
-                friction_range = self.cfg.domain_rand.friction_range
-                num_buckets = 64
-                bucket_ids = torch.randint(0, num_buckets, (self.num_envs, 1))
-                friction_buckets = torch_rand_float(friction_range[0], friction_range[1], (num_buckets,1), device='cpu')
-                self.friction_coeffs = friction_buckets[bucket_ids]
-
+            friction = self._env_frictions[env_id]
             for s in range(len(props)):
-                props[s].friction = self.friction_coeffs[env_id]
+                props[s].friction = friction
         return props
 
     def _process_dof_props(self, props, env_id):
@@ -273,9 +332,28 @@ class LeggedRobot(BaseTask):
         #     print(f"Total mass {sum} (before randomization)")
         # randomize base mass
         if self.cfg.domain_rand.randomize_base_mass:
-            rng = self.cfg.domain_rand.added_mass_range
-            props[0].mass += np.random.uniform(rng[0], rng[1])
+            props[0].mass += self._env_added_masses[env_id]
         return props
+
+    def _sample_domain_rand(self):
+        """ Samples the randomized properties and start positions of all environments at once, before they are created.
+            The per-env callbacks then only look their values up.
+        """
+        if self.cfg.domain_rand.randomize_friction:
+            # prepare friction randomization
+            friction_range = self.cfg.domain_rand.friction_range
+            num_buckets = 64
+            bucket_ids = torch.randint(0, num_buckets, (self.num_envs, 1))
+            friction_buckets = torch_rand_float(friction_range[0], friction_range[1], (num_buckets,1), device='cpu')
+            self.friction_coeffs = friction_buckets[bucket_ids]
+            self._env_frictions = self.friction_coeffs.flatten().tolist()
+        if self.cfg.domain_rand.randomize_base_mass:
+            rng = self.cfg.domain_rand.added_mass_range
+            self._env_added_masses = np.random.uniform(rng[0], rng[1], self.num_envs).tolist()
+        # start positions within 1m of the env origins
+        start_pos = self.env_origins.clone()
+        start_pos[:, :2] += torch_rand_float(-1., 1., (self.num_envs, 2), device=self.device)
+        self._env_start_pos = start_pos.cpu().tolist()
     
     def _post_physics_step_callback(self):
         """ Callback called before computing terminations, rewards, and observations
@@ -289,6 +367,9 @@ class LeggedRobot(BaseTask):
             heading = torch.atan2(forward[:, 1], forward[:, 0])
             self.commands[:, 2] = torch.clip(0.5*wrap_to_pi(self.commands[:, 3] - heading), -1., 1.)
 
+        if self.measure_heights:
+            self.measured_heights[:] = self._get_heights()
+
     def _resample_commands(self, env_ids):
         """ Randommly select commands of some environments
 
@@ -329,6 +410,44 @@ class LeggedRobot(BaseTask):
             raise NameError(f"Unknown controller type: {control_type}")
         return torch.clip(torques, -self.torque_limits, self.torque_limits)
 
+    def _pd_torques_static(self):
+        """ P controller of _compute_torques() on static buffers: reads self.pd_targets, self.dof_pos and self.dof_vel,
+            writes self.torques in place
+        """
+        torch.sub(self.pd_targets, self.dof_pos, out=self._pd_error)
+        self._pd_error.mul_(self.p_gains).addcmul_(self.d_gains, self.dof_vel, value=-1.)
+        torch.clamp(self._pd_error, -self.torque_limits, self.torque_limits, out=self.torques)
+
+    def _init_fused_pd(self):
+        """ Prepares the fused PD path of cfg.control.fused_pd. On the GPU the PD law is captured once in a CUDA graph,
+            which replays its kernels on the same buffers without going through Python.
+            Only the P controller of the base class is supported, otherwise the regular path is kept.
+        """
+        self.fused_pd = self.cfg.control.fused_pd
+        if not self.fused_pd:
+            return
+        if self.cfg.control.control_type != "P" or type(self)._compute_torques is not LeggedRobot._compute_torques:
+            print("Fused PD torques only support the P controller of LeggedRobot, using the regular path")
+            self.fused_pd = False
+            return
+        self.action_scale = self.cfg.control.action_scale
+        self.pd_targets = self.default_dof_pos.repeat(self.num_envs, 1)
+        self._pd_error = torch.zeros_like(self.torques)
+        self._compute_fused_pd_torques = self._pd_torques_static
+        if self.device == 'cpu':
+            return
+        # warm up on a side stream before the capture, as required by CUDA graphs
+        stream = torch.cuda.Stream(self.device)
+        stream.wait_stream(torch.cuda.current_stream(self.device))
+        with torch.cuda.stream(stream):
+            for _ in range(3):
+                self._pd_torques_static()
+        torch.cuda.current_stream(self.device).wait_stream(stream)
+        self._pd_graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._pd_graph):
+            self._pd_torques_static()
+        self._compute_fused_pd_torques = self._pd_graph.replay
+
     def _reset_dofs(self, env_ids):
         """ Resets DOF position and velocities of selected environmments
         Positions are randomly selected within 0.5:1.5 x default positions.
@@ -381,8 +500,28 @@ class LeggedRobot(BaseTask):
                                                     gymtorch.unwrap_tensor(self.root_states),
                                                     gymtorch.unwrap_tensor(env_ids_int32), len(env_ids_int32))
 
-   
-    
+    def _update_terrain_curriculum(self, env_ids):
+        """ Implements the game-inspired curriculum.
+
+        Args:
+            env_ids (List[int]): ids of environments being reset
+        """
+        # Implement Terrain curriculum
+        if not self.init_done:
+            # don't change on initial reset
+            return
+        distance = torch.norm(self.root_states[env_ids, :2] - self.env_origins[env_ids, :2], dim=1)
+        # robots that walked far enough progress to harder terains
+        move_up = distance > self.terrain.env_length / 2
+        # robots that walked less than half of their required distance go to simpler terrains
+        move_down = (distance < torch.norm(self.commands[env_ids, :2], dim=1)*self.max_episode_length_s*0.5) * ~move_up
+        self.terrain_levels[env_ids] += 1 * move_up - 1 * move_down
+        # Robots that solve the last level are sent to a random one
+        self.terrain_levels[env_ids] = torch.where(self.terrain_levels[env_ids]>=self.max_terrain_level,
+                                                   torch.randint_like(self.terrain_levels[env_ids], self.max_terrain_level),
+                                                   torch.clip(self.terrain_levels[env_ids], 0)) # (the minumum level is zero)
+        self.env_origins[env_ids] = self.terrain_origins[self.terrain_levels[env_ids], self.terrain_types[env_ids]]
+
     def update_command_curriculum(self, env_ids):
         """ Implements a curriculum of increasing commands
 
@@ -416,6 +555,8 @@ class LeggedRobot(BaseTask):
         noise_vec[12:12+self.num_actions] = noise_scales.dof_pos * noise_level * self.obs_scales.dof_pos
         noise_vec[12+self.num_actions:12+2*self.num_actions] = noise_scales.dof_vel * noise_level * self.obs_scales.dof_vel
         noise_vec[12+2*self.num_actions:12+3*self.num_actions] = 0. # previous actions
+        if self.num_height_obs > 0:
+            noise_vec[12+3*self.num_actions:] = noise_scales.height_measurements * noise_level * self.obs_scales.height_measurements
 
         return noise_vec
 
@@ -461,7 +602,8 @@ class LeggedRobot(BaseTask):
         self.base_lin_vel = quat_rotate_inverse(self.base_quat, self.root_states[:, 7:10])
         self.base_ang_vel = quat_rotate_inverse(self.base_quat, self.root_states[:, 10:13])
         self.projected_gravity = quat_rotate_inverse(self.base_quat, self.gravity_vec)
-      
+        self.height_points = self._init_height_points()
+        self.measured_heights = torch.zeros(self.num_envs, self.num_height_points, dtype=torch.float, device=self.device, requires_grad=False)
 
         # joint positions offsets and PD gains
         self.default_dof_pos = torch.zeros(self.num_dof, dtype=torch.float, device=self.device, requires_grad=False)
@@ -481,6 +623,7 @@ class LeggedRobot(BaseTask):
                 if self.cfg.control.control_type in ["P", "V"]:
                     print(f"PD gain of joint {name} were not defined, setting them to zero")
         self.default_dof_pos = self.default_dof_pos.unsqueeze(0)
+        self._init_fused_pd()
 
     def _prepare_reward_function(self):
         """ Prepares a list of reward functions, whcih will be called to compute the total reward.
@@ -503,9 +646,19 @@ class LeggedRobot(BaseTask):
             name = '_reward_' + name
             self.reward_functions.append(getattr(self, name))
 
-        # reward episode sums
-        self.episode_sums = {name: torch.zeros(self.num_envs, dtype=torch.float, device=self.device, requires_grad=False)
-                             for name in self.reward_scales.keys()}
+        # stacked unscaled terms and their scales, the termination reward is added separately after clipping
+        self.reward_terms = torch.zeros(self.num_envs, len(self.reward_functions), dtype=torch.float, device=self.device, requires_grad=False)
+        self.reward_scales_vec = torch.tensor([self.reward_scales[name] for name in self.reward_names], dtype=torch.float, device=self.device)
+        self._reward_terms_fn = self._compute_reward_terms
+        if self.cfg.rewards.compile_terms:
+            self._reward_terms_fn = torch.compile(self._compute_reward_terms)
+        self.reward_timings = {name: 0. for name in self.reward_names}
+        self.reward_timing_steps = 0
+
+        # reward episode sums, views of the columns of one buffer so that all terms are accumulated at once
+        sum_names = self.reward_names + [name for name in self.reward_scales.keys() if name not in self.reward_names]
+        self.episode_sums_buf = torch.zeros(self.num_envs, len(sum_names), dtype=torch.float, device=self.device, requires_grad=False)
+        self.episode_sums = {name: self.episode_sums_buf[:, i] for i, name in enumerate(sum_names)}
 
     def _create_ground_plane(self):
         """ Adds a ground plane to the simulation, sets friction and restitution based on the cfg.
@@ -517,6 +670,46 @@ class LeggedRobot(BaseTask):
         plane_params.restitution = self.cfg.terrain.restitution
         self.gym.add_ground(self.sim, plane_params)
 
+    def _create_heightfield(self):
+        """ Adds a heightfield terrain to the simulation, sets parameters based on the cfg.
+        """
+        hf_params = gymapi.HeightFieldParams()
+        hf_params.column_scale = self.terrain.cfg.horizontal_scale
+        hf_params.row_scale = self.terrain.cfg.horizontal_scale
+        hf_params.vertical_scale = self.terrain.cfg.vertical_scale
+        hf_params.nbRows = self.terrain.tot_cols
+        hf_params.nbColumns = self.terrain.tot_rows
+        hf_params.transform.p.x = -self.terrain.cfg.border_size
+        hf_params.transform.p.y = -self.terrain.cfg.border_size
+        hf_params.transform.p.z = 0.0
+        hf_params.static_friction = self.cfg.terrain.static_friction
+        hf_params.dynamic_friction = self.cfg.terrain.dynamic_friction
+        hf_params.restitution = self.cfg.terrain.restitution
+
+        self.gym.add_heightfield(self.sim, self.terrain.heightsamples, hf_params)
+        self._set_height_samples()
+
+    def _create_trimesh(self):
+        """ Adds a triangle mesh terrain to the simulation, sets parameters based on the cfg.
+        """
+        tm_params = gymapi.TriangleMeshParams()
+        tm_params.nb_vertices = self.terrain.vertices.shape[0]
+        tm_params.nb_triangles = self.terrain.triangles.shape[0]
+
+        tm_params.transform.p.x = -self.terrain.cfg.border_size
+        tm_params.transform.p.y = -self.terrain.cfg.border_size
+        tm_params.transform.p.z = 0.0
+        tm_params.static_friction = self.cfg.terrain.static_friction
+        tm_params.dynamic_friction = self.cfg.terrain.dynamic_friction
+        tm_params.restitution = self.cfg.terrain.restitution
+        self.gym.add_triangle_mesh(self.sim, self.terrain.vertices.flatten(order='C'), self.terrain.triangles.flatten(order='C'), tm_params)
+        self._set_height_samples()
+
+    def _set_height_samples(self):
+        """ Copies the terrain heights to the device, converted to meters once so that sampling them needs no rescaling.
+        """
+        self.height_samples = torch.tensor(self.terrain.heightsamples, dtype=torch.float, device=self.device) * self.terrain.cfg.vertical_scale
+
     def _create_envs(self):
         """ Creates environments:
              1. loads the robot URDF/MJCF asset,
@@ -526,6 +719,8 @@ class LeggedRobot(BaseTask):
                 2.3 create actor with these properties and add them to the env
              3. Store indices of different bodies of the robot
         """
+        timings = {}
+        start = time.perf_counter()
         asset_path = self.cfg.asset.file.format(LEGGED_GYM_ROOT_DIR=LEGGED_GYM_ROOT_DIR)
         asset_root = os.path.dirname(asset_path)
         asset_file = os.path.basename(asset_path)
@@ -570,27 +765,60 @@ class LeggedRobot(BaseTask):
         start_pose.p = gymapi.Vec3(*self.base_init_state[:3])
 
         self._get_env_origins()
+        timings["load asset"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self._sample_domain_rand()
+        # the callbacks only need to run per env if they are overridden or randomize something
+        per_env_shape_props = self.cfg.domain_rand.randomize_friction or type(self)._process_rigid_shape_props is not LeggedRobot._process_rigid_shape_props
+        per_env_dof_props = type(self)._process_dof_props is not LeggedRobot._process_dof_props
+        per_env_body_props = self.cfg.domain_rand.randomize_base_mass or type(self)._process_rigid_body_props is not LeggedRobot._process_rigid_body_props
+        dof_props = self._process_dof_props(dof_props_asset, 0)
+        if not per_env_shape_props:
+            rigid_shape_props = self._process_rigid_shape_props(rigid_shape_props_asset, 0)
+            self.gym.set_asset_rigid_shape_properties(robot_asset, rigid_shape_props)
+        timings["sample domain randomization"] = time.perf_counter() - start
+
         env_lower = gymapi.Vec3(0., 0., 0.)
         env_upper = gymapi.Vec3(0., 0., 0.)
+        envs_per_row = int(np.sqrt(self.num_envs))
         self.actor_handles = []
         self.envs = []
+        for key in ["create envs", "rigid shape props", "create actors", "dof props", "rigid body props"]:
+            timings[key] = 0.
         for i in range(self.num_envs):
             # create env instance
-            env_handle = self.gym.create_env(self.sim, env_lower, env_upper, int(np.sqrt(self.num_envs)))
-            pos = self.env_origins[i].clone()
-            pos[:2] += torch_rand_float(-1., 1., (2,1), device=self.device).squeeze(1)
-            start_pose.p = gymapi.Vec3(*pos)
-                
-            rigid_shape_props = self._process_rigid_shape_props(rigid_shape_props_asset, i)
-            self.gym.set_asset_rigid_shape_properties(robot_asset, rigid_shape_props)
+            t0 = time.perf_counter()
+            env_handle = self.gym.create_env(self.sim, env_lower, env_upper, envs_per_row)
+            start_pose.p = gymapi.Vec3(*self._env_start_pos[i])
+            t1 = time.perf_counter()
+            if per_env_shape_props:
+                rigid_shape_props = self._process_rigid_shape_props(rigid_shape_props_asset, i)
+                self.gym.set_asset_rigid_shape_properties(robot_asset, rigid_shape_props)
+            t2 = time.perf_counter()
             actor_handle = self.gym.create_actor(env_handle, robot_asset, start_pose, self.cfg.asset.name, i, self.cfg.asset.self_collisions, 0)
-            dof_props = self._process_dof_props(dof_props_asset, i)
+            t3 = time.perf_counter()
+            if per_env_dof_props and i > 0:
+                dof_props = self._process_dof_props(dof_props_asset, i)
             self.gym.set_actor_dof_properties(env_handle, actor_handle, dof_props)
-            body_props = self.gym.get_actor_rigid_body_properties(env_handle, actor_handle)
-            body_props = self._process_rigid_body_props(body_props, i)
-            self.gym.set_actor_rigid_body_properties(env_handle, actor_handle, body_props, recomputeInertia=True)
+            t4 = time.perf_counter()
+            if per_env_body_props:
+                body_props = self.gym.get_actor_rigid_body_properties(env_handle, actor_handle)
+                body_props = self._process_rigid_body_props(body_props, i)
+                self.gym.set_actor_rigid_body_properties(env_handle, actor_handle, body_props, recomputeInertia=True)
+            t5 = time.perf_counter()
             self.envs.append(env_handle)
             self.actor_handles.append(actor_handle)
+            timings["create envs"] += t1 - t0
+            timings["rigid shape props"] += t2 - t1
+            timings["create actors"] += t3 - t2
+            timings["dof props"] += t4 - t3
+            timings["rigid body props"] += t5 - t4
+
+        total = sum(timings.values())
+        print(f"Created {self.num_envs} environments in {total:.2f} s:")
+        for key, duration in timings.items():
+            print(f" - {key}: {duration:.2f} s")
 
         self.feet_indices = torch.zeros(len(feet_names), dtype=torch.long, device=self.device, requires_grad=False)
         for i in range(len(feet_names)):
@@ -608,24 +836,100 @@ class LeggedRobot(BaseTask):
         """ Sets environment origins. On rough terrain the origins are defined by the terrain platforms.
             Otherwise create a grid.
         """
-      
-        self.custom_origins = False
-        self.env_origins = torch.zeros(self.num_envs, 3, device=self.device, requires_grad=False)
-        # create a grid of robots
-        num_cols = np.floor(np.sqrt(self.num_envs))
-        num_rows = np.ceil(self.num_envs / num_cols)
-        xx, yy = torch.meshgrid(torch.arange(num_rows), torch.arange(num_cols))
-        spacing = self.cfg.env.env_spacing
-        self.env_origins[:, 0] = spacing * xx.flatten()[:self.num_envs]
-        self.env_origins[:, 1] = spacing * yy.flatten()[:self.num_envs]
-        self.env_origins[:, 2] = 0.
+        if self.cfg.terrain.mesh_type in ["heightfield", "trimesh"]:
+            self.custom_origins = True
+            self.env_origins = torch.zeros(self.num_envs, 3, device=self.device, requires_grad=False)
+            # put robots at the origins defined by the terrain
+            max_init_level = self.cfg.terrain.max_init_terrain_level
+            if not self.cfg.terrain.curriculum: max_init_level = self.cfg.terrain.num_rows - 1
+            self.terrain_levels = torch.randint(0, max_init_level+1, (self.num_envs,), device=self.device)
+            self.terrain_types = torch.div(torch.arange(self.num_envs, device=self.device), (self.num_envs/self.cfg.terrain.num_cols), rounding_mode='floor').to(torch.long)
+            self.max_terrain_level = self.cfg.terrain.num_rows
+            self.terrain_origins = torch.from_numpy(self.terrain.env_origins).to(self.device).to(torch.float)
+            self.env_origins[:] = self.terrain_origins[self.terrain_levels, self.terrain_types]
+        else:
+            self.custom_origins = False
+            self.env_origins = torch.zeros(self.num_envs, 3, device=self.device, requires_grad=False)
+            # create a grid of robots
+            num_cols = np.floor(np.sqrt(self.num_envs))
+            num_rows = np.ceil(self.num_envs / num_cols)
+            xx, yy = torch.meshgrid(torch.arange(num_rows), torch.arange(num_cols))
+            spacing = self.cfg.env.env_spacing
+            self.env_origins[:, 0] = spacing * xx.flatten()[:self.num_envs]
+            self.env_origins[:, 1] = spacing * yy.flatten()[:self.num_envs]
+            self.env_origins[:, 2] = 0.
+
+    def _init_height_points(self):
+        """ Returns points at which the height measurments are sampled (in base frame)
+
+        Returns:
+            [torch.Tensor]: Tensor of shape (num_envs, self.num_height_points, 3)
+        """
+        y = torch.tensor(self.cfg.terrain.measured_points_y, device=self.device, requires_grad=False)
+        x = torch.tensor(self.cfg.terrain.measured_points_x, device=self.device, requires_grad=False)
+        grid_x, grid_y = torch.meshgrid(x, y, indexing='ij')
+
+        self.num_height_points = grid_x.numel()
+        points = torch.zeros(self.num_envs, self.num_height_points, 3, device=self.device, requires_grad=False)
+        points[:, :, 0] = grid_x.flatten()
+        points[:, :, 1] = grid_y.flatten()
+        return points
+
+    def _get_heights(self, env_ids=None):
+        """ Samples heights of the terrain at required points around each robot.
+            The points are offset by the base's position and rotated by the base's yaw.
+            All envs x points are bilinearly interpolated in the heightfield in one batched gather.
+
+        Args:
+            env_ids (List[int], optional): Subset of environments for which to return the heights. Defaults to None.
+
+        Raises:
+            NameError: If the terrain mesh type is 'none'
+
+        Returns:
+            [torch.Tensor]: Terrain heights of shape (num_envs, self.num_height_points) [m]
+        """
+        if self.cfg.terrain.mesh_type == 'plane':
+            num_envs = self.num_envs if env_ids is None else len(env_ids)
+            return torch.zeros(num_envs, self.num_height_points, device=self.device, requires_grad=False)
+        elif self.cfg.terrain.mesh_type == 'none':
+            raise NameError("Can't measure height with terrain mesh type 'none'")
+
+        if env_ids is not None:
+            points = quat_apply_yaw(self.base_quat[env_ids].repeat(1, self.num_height_points), self.height_points[env_ids]) + (self.root_states[env_ids, :3]).unsqueeze(1)
+        else:
+            points = quat_apply_yaw(self.base_quat.repeat(1, self.num_height_points), self.height_points) + (self.root_states[:, :3]).unsqueeze(1)
+
+        # continuous heightfield coordinates, clamped so that the 2x2 neighbourhood stays inside the map
+        num_rows, num_cols = self.height_samples.shape
+        px = ((points[:, :, 0] + self.terrain.cfg.border_size) / self.terrain.cfg.horizontal_scale).clip(0, num_rows - 1.001)
+        py = ((points[:, :, 1] + self.terrain.cfg.border_size) / self.terrain.cfg.horizontal_scale).clip(0, num_cols - 1.001)
+        x0 = px.long()
+        y0 = py.long()
+        wx = px - x0
+        wy = py - y0
+
+        samples = self.height_samples.view(-1)
+        idx = x0 * num_cols + y0
+        h00 = samples[idx]
+        h01 = samples[idx + 1]
+        h10 = samples[idx + num_cols]
+        h11 = samples[idx + num_cols + 1]
+        heights = torch.lerp(torch.lerp(h00, h01, wy), torch.lerp(h10, h11, wy), wx)
+        return heights
 
     def _parse_cfg(self, cfg):
         self.dt = self.cfg.control.decimation * self.sim_params.dt
         self.obs_scales = self.cfg.normalization.obs_scales
         self.reward_scales = class_to_dict(self.cfg.rewards.scales)
         self.command_ranges = class_to_dict(self.cfg.commands.ranges)
-     
+        if self.cfg.terrain.mesh_type not in ['heightfield', 'trimesh']:
+            self.cfg.terrain.curriculum = False
+        # there is nothing to measure on a plane
+        self.measure_heights = self.cfg.terrain.measure_heights and self.cfg.terrain.mesh_type in ['heightfield', 'trimesh']
+        self.num_height_obs = 0
+        if self.measure_heights and self.observe_heights:
+            self.num_height_obs = len(self.cfg.terrain.measured_points_x) * len(self.cfg.terrain.measured_points_y)
 
         self.max_episode_length_s = self.cfg.env.episode_length_s
         self.max_episode_length = np.ceil(self.max_episode_length_s / self.dt)
@@ -649,6 +953,8 @@ class LeggedRobot(BaseTask):
     def _reward_base_height(self):
         # Penalize base height away from target
         base_height = self.root_states[:, 2]
+        if self.measure_heights:
+            base_height = base_height - torch.mean(self.measured_heights, dim=1)
         return torch.square(base_height - self.cfg.rewards.base_height_target)
     
     def _reward_torques(self):
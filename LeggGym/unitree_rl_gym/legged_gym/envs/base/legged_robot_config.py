@@ -35,6 +35,8 @@ class LeggedRobotCfg(BaseConfig):
         terrain_proportions = [0.1, 0.1, 0.35, 0.25, 0.2]
         # trimesh only:
         slope_treshold = 0.75 # slopes above this threshold will be corrected to vertical surfaces
+        num_workers = 8 # processes generating the sub-terrains, 0 or 1 to generate them in the main process
+        cache_dir = '{LEGGED_GYM_ROOT_DIR}/logs/terrain_cache' # generated sub-terrains and meshes, None to disable the cache
 
     class commands:
         curriculum = False
@@ -66,6 +68,8 @@ class LeggedRobotCfg(BaseConfig):
         action_scale = 0.5
         # decimation: Number of control action updates @ sim DT per policy DT
         decimation = 4
+        # compute the P torques of all decimation substeps in static buffers, replayed as a CUDA graph on the GPU
+        fused_pd = False
 
     class asset:
         file = ""
@@ -123,6 +127,8 @@ class LeggedRobotCfg(BaseConfig):
         soft_torque_limit = 1.
         base_height_target = 1.
         max_contact_force = 100. # forces above this value are penalized
+        compile_terms = False # compile the evaluation of all reward terms with torch.compile to fuse their small kernels
+        profile_terms = False # time every reward term (synchronizes the device) and log its mean duration per episode
 
     class normalization:
         class obs_scales:
@@ -6,6 +6,8 @@ from isaacgym import gymtorch, gymapi, gymutil
 import torch
 
 class H1Robot(LeggedRobot):
+    # the observations are proprioceptive only, heights are just measured for the rewards
+    observe_heights = False
     
     def _get_noise_scale_vec(self, cfg):
         """ Sets a vector used to scale the noise added to the observations.
@@ -96,12 +98,10 @@ class H1Robot(LeggedRobot):
 
         
     def _reward_contact(self):
-        res = torch.zeros(self.num_envs, dtype=torch.float, device=self.device)
-        for i in range(self.feet_num):
-            is_stance = self.leg_phase[:, i] < 0.55
-            contact = self.contact_forces[:, self.feet_indices[i], 2] > 1
-            res += ~(contact ^ is_stance)
-        return res
+        # reward the feet whose contact state matches their gait phase
+        is_stance = self.leg_phase < 0.55
+        contact = self.contact_forces[:, self.feet_indices, 2] > 1
+        return torch.sum(~(contact ^ is_stance), dim=1, dtype=torch.float)
     
     def _reward_feet_swing_height(self):
         contact = torch.norm(self.contact_forces[:, self.feet_indices, :3], dim=2) > 1.
@@ -0,0 +1,80 @@
+""" Measures the env-steps/s of env.step() with and without the fused PD path (cfg.control.fused_pd).
+
+Every (num_envs, fused_pd) configuration runs in its own process, since a process can only create one simulation.
+Random actions are used, no policy is needed:
+
+    python legged_gym/scripts/benchmark_step.py --task=g1 --headless --num_envs_list 1024 4096 8192
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import isaacgym
+from legged_gym.envs import *
+from legged_gym.utils import get_args, task_registry
+import torch
+
+
+def run(args, bench_args):
+    env_cfg, _ = task_registry.get_cfgs(name=args.task)
+    env_cfg.control.fused_pd = bench_args.fused_pd
+    env_cfg.env.test = False
+    env_cfg.domain_rand.push_robots = False
+    env, _ = task_registry.make_env(name=args.task, args=args, env_cfg=env_cfg)
+
+    actions = torch.zeros(env.num_envs, env.num_actions, device=env.device)
+    for i in range(bench_args.warmup_steps + bench_args.steps):
+        if i == bench_args.warmup_steps:
+            if env.device != 'cpu':
+                torch.cuda.synchronize()
+            start = time.perf_counter()
+        actions.uniform_(-1., 1.)
+        env.step(actions)
+    if env.device != 'cpu':
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+    print(f"ENV_STEPS_PER_SEC {env.num_envs * bench_args.steps / elapsed:.1f}")
+
+
+def sweep(bench_args, gym_argv):
+    results = {}
+    for num_envs in bench_args.num_envs_list:
+        for fused_pd in [False, True]:
+            cmd = [sys.executable, os.path.abspath(__file__), "--worker", "--steps", str(bench_args.steps),
+                   "--warmup_steps", str(bench_args.warmup_steps), *gym_argv, "--num_envs", str(num_envs)]
+            if fused_pd:
+                cmd.append("--fused_pd")
+            out = subprocess.run(cmd, capture_output=True, text=True)
+            lines = [line for line in out.stdout.splitlines() if line.startswith("ENV_STEPS_PER_SEC")]
+            if out.returncode != 0 or not lines:
+                print(out.stdout[-2000:], out.stderr[-2000:])
+                raise RuntimeError(f"Benchmark failed for num_envs={num_envs}, fused_pd={fused_pd}")
+            results[num_envs, fused_pd] = float(lines[-1].split()[1])
+            print(f"num_envs={num_envs} fused_pd={fused_pd}: {results[num_envs, fused_pd]:.0f} env-steps/s")
+
+    print(f"\n{'num_envs':>10}{'regular':>14}{'fused_pd':>14}{'speedup':>10}")
+    for num_envs in bench_args.num_envs_list:
+        regular, fused = results[num_envs, False], results[num_envs, True]
+        print(f"{num_envs:>10}{regular:>14.0f}{fused:>14.0f}{fused / regular:>10.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--num_envs_list", type=int, nargs="+", default=[1024, 4096, 8192])
+    parser.add_argument("--steps", type=int, default=500, help="number of timed env steps")
+    parser.add_argument("--warmup_steps", type=int, default=50)
+    parser.add_argument("--fused_pd", action="store_true", default=False)
+    parser.add_argument("--worker", action="store_true", default=False, help="run a single configuration")
+    # the remaining arguments are the usual legged_gym ones
+    bench_args, gym_argv = parser.parse_known_args()
+    if bench_args.worker:
+        sys.argv = sys.argv[:1] + gym_argv
+        run(get_args(), bench_args)
+    else:
+        # the number of environments is set by --num_envs_list
+        if "--num_envs" in gym_argv:
+            i = gym_argv.index("--num_envs")
+            del gym_argv[i:i + 2]
+        sweep(bench_args, [arg for arg in gym_argv if not arg.startswith("--num_envs=")])
@@ -39,12 +39,38 @@ def play(args):
         export_policy_as_jit(ppo_runner.alg.actor_critic, path)
         print('Exported policy as jit script to: ', path)
 
+    if LOG_STATES:
+        log_dir = os.path.join(LEGGED_GYM_ROOT_DIR, 'logs', train_cfg.runner.experiment_name, 'play_logs')
+        logger = Logger(env.dt, log_dir=log_dir, capacity=int(env.max_episode_length))
+
     for i in range(10*int(env.max_episode_length)):
         actions = policy(obs.detach())
         obs, _, rews, dones, infos = env.step(actions.detach())
 
+        if LOG_STATES:
+            # device tensors of all envs, nothing here waits for the GPU
+            logger.log_states({
+                'dof_pos': env.dof_pos,
+                'dof_vel': env.dof_vel,
+                'dof_torque': env.torques,
+                'command': env.commands[:, :3],
+                'base_lin_vel': env.base_lin_vel,
+                'base_ang_vel': env.base_ang_vel,
+                'contact_forces_z': env.contact_forces[:, env.feet_indices, 2],
+            })
+            if 'episode' in infos:
+                logger.log_rewards(infos['episode'], torch.sum(dones))
+            if (i + 1) % int(env.max_episode_length) == 0:
+                logger.end_episode()
+
+    if LOG_STATES:
+        logger.close()
+        logger.print_rewards()
+        print('Saved the state logs to: ', log_dir)
+
 if __name__ == '__main__':
     EXPORT_POLICY = True
+    LOG_STATES = False
     RECORD_FRAMES = False
     MOVE_CAMERA = False
     args = get_args()
@@ -1,39 +1,170 @@
+import importlib.util
+import os
+import queue
+import threading
+
 import numpy as np
+import torch
 from collections import defaultdict
 from multiprocessing import Process, Value
 
 class Logger:
-    def __init__(self, dt):
-        self.state_log = defaultdict(list)
-        self.rew_log = defaultdict(list)
+    """ Logs state and reward traces of play and evaluation runs without synchronizing with the device.
+
+        States are written into preallocated ring buffers on the device of the logged tensors, reward sums are
+        accumulated on the device as well. When a ring buffer is full, or when an episode ends, the logged rows are copied
+        in bulk to pinned host memory, and a background thread waits for the copy and writes one compressed file per
+        episode to log_dir. Nothing in log_states()/log_rewards() waits for the device.
+
+    Args:
+        dt (float): Time step of the logged traces [s]
+        log_dir (str, optional): Directory of the episode files, None to only keep the reward sums. Defaults to None.
+        capacity (int, optional): Number of steps of the ring buffers. Defaults to 1000.
+        file_format (str, optional): "npz" or "parquet". Defaults to "npz". The format is never selected
+            automatically, parquet files are only written when "parquet" is passed, which requires pandas and pyarrow.
+    """
+    def __init__(self, dt, log_dir=None, capacity=1000, file_format="npz"):
+        if file_format not in ["npz", "parquet"]:
+            raise ValueError(f"Unknown file format '{file_format}', expected 'npz' or 'parquet'")
+        if file_format == "parquet":
+            # fail here rather than in the writer thread
+            missing = [name for name in ["pandas", "pyarrow"] if importlib.util.find_spec(name) is None]
+            if missing:
+                raise ImportError(f"Writing parquet files requires pandas and pyarrow, missing: {', '.join(missing)}")
         self.dt = dt
+        self.log_dir = log_dir
+        self.capacity = capacity
+        self.file_format = file_format
+        self.state_buffers = {}
+        self.state_counts = {}
+        self.rew_log = {}
         self.num_episodes = 0
+        self.num_saved_episodes = 0
         self.plot_process = None
 
+        self._jobs = queue.Queue()
+        self._writer = None
+        if self.log_dir is not None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
     def log_state(self, key, value):
-        self.state_log[key].append(value)
+        if not isinstance(value, torch.Tensor):
+            value = torch.as_tensor(value, dtype=torch.float)
+        if key not in self.state_buffers:
+            self.state_buffers[key] = torch.zeros(self.capacity, *value.shape, dtype=value.dtype, device=value.device)
+            self.state_counts[key] = 0
+        elif self.state_counts[key] == self.capacity:
+            self._flush_states()
+        self.state_buffers[key][self.state_counts[key]] = value
+        self.state_counts[key] += 1
 
     def log_states(self, dict):
         for key, value in dict.items():
             self.log_state(key, value)
 
     def log_rewards(self, dict, num_episodes):
+        """ Accumulates the episode rewards of the extras, num_episodes can be a device tensor as well
+        """
         for key, value in dict.items():
-            if 'rew' in key:
-                self.rew_log[key].append(value.item() * num_episodes)
+            if key.startswith('rew_'):
+                self.rew_log[key] = self.rew_log.get(key, 0.) + value * num_episodes
         self.num_episodes += num_episodes
 
+    def end_episode(self):
+        """ Writes the states logged since the previous episode to the next episode file, in the background
+        """
+        self._flush_states()
+        if self._writer is not None:
+            path = os.path.join(self.log_dir, f"episode_{self.num_saved_episodes:05d}.{self.file_format}")
+            self._jobs.put(("end", path))
+        self.num_saved_episodes += 1
+
     def reset(self):
-        self.state_log.clear()
-        self.rew_log.clear()   
+        self.state_buffers.clear()
+        self.state_counts.clear()
+        self.rew_log.clear()
+        self.num_episodes = 0
+
+    def close(self):
+        """ Waits until all episode files are written
+        """
+        if self._writer is not None:
+            self._jobs.put(None)
+            self._writer.join()
+            self._writer = None
 
     def print_rewards(self):
         print("Average rewards per second:")
+        num_episodes = float(self.num_episodes)
         for key, values in self.rew_log.items():
-            mean = np.sum(np.array(values)) / self.num_episodes
+            mean = float(values) / num_episodes
             print(f" - {key}: {mean}")
-        print(f"Total number of episodes: {self.num_episodes}")
-    
+        print(f"Total number of episodes: {int(num_episodes)}")
+
+    def _flush_states(self):
+        """ Starts the copy of the logged rows to pinned host memory and hands them to the writer thread
+        """
+        if self._writer is None:
+            for key in self.state_counts.keys():
+                self.state_counts[key] = 0
+            return
+        chunk = {}
+        for key, buffer in self.state_buffers.items():
+            count = self.state_counts[key]
+            if count == 0:
+                continue
+            if buffer.is_cuda:
+                chunk[key] = torch.empty((count, *buffer.shape[1:]), dtype=buffer.dtype, pin_memory=True)
+                chunk[key].copy_(buffer[:count], non_blocking=True)
+            else:
+                chunk[key] = buffer[:count].clone()
+            self.state_counts[key] = 0
+        if not chunk:
+            return
+        event = None
+        if torch.cuda.is_available() and any(buffer.is_cuda for buffer in self.state_buffers.values()):
+            event = torch.cuda.Event()
+            event.record()
+        self._jobs.put(("chunk", event, chunk))
+
+    def _write_loop(self):
+        chunks = defaultdict(list)
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job[0] == "chunk":
+                _, event, chunk = job
+                if event is not None:
+                    event.synchronize()
+                for key, value in chunk.items():
+                    chunks[key].append(value.numpy())
+            else:
+                states = {key: np.concatenate(values) for key, values in chunks.items()}
+                chunks.clear()
+                self._write_episode(job[1], states)
+
+    def _write_episode(self, path, states):
+        if self.file_format == "npz":
+            np.savez_compressed(path, dt=self.dt, **states)
+            return
+        import pandas as pd
+
+        columns = {}
+        for key, values in states.items():
+            values = values.reshape(len(values), -1)
+            if values.shape[1] == 1:
+                columns[key] = values[:, 0]
+            else:
+                columns.update({f"{key}_{i}": values[:, i] for i in range(values.shape[1])})
+        frame = pd.DataFrame(columns)
+        frame.insert(0, "time", np.arange(len(frame)) * self.dt)
+        frame.to_parquet(path, compression="zstd")
+
     def __del__(self):
-        if self.plot_process is not None:
-            self.plot_process.kill()
\ No newline at end of file
+        if getattr(self, "plot_process", None) is not None:
+            self.plot_process.kill()
+        if getattr(self, "_writer", None) is not None:
+            self.close()
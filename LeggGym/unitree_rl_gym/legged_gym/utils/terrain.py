@@ -1,10 +1,19 @@
+import hashlib
+import multiprocessing as mp
+import os
+import time
+
 import numpy as np
 from numpy.random import choice
 from scipy import interpolate
 
 from isaacgym import terrain_utils
+from legged_gym import LEGGED_GYM_ROOT_DIR
 from legged_gym.envs.base.legged_robot_config import LeggedRobotCfg
 
+# bump when the generation of the sub-terrains changes, to invalidate the cached ones
+CACHE_VERSION = 1
+
 class Terrain:
     def __init__(self, cfg: LeggedRobotCfg.terrain, num_robots) -> None:
 
@@ -27,6 +36,9 @@ class Terrain:
         self.tot_cols = int(cfg.num_cols * self.width_per_env_pixels) + 2 * self.border
         self.tot_rows = int(cfg.num_rows * self.length_per_env_pixels) + 2 * self.border
 
+        self.cache_dir = cfg.cache_dir.format(LEGGED_GYM_ROOT_DIR=LEGGED_GYM_ROOT_DIR) if cfg.cache_dir else None
+
+        start = time.time()
         self.height_field_raw = np.zeros((self.tot_rows , self.tot_cols), dtype=np.int16)
         if cfg.curriculum:
             self.curiculum()
@@ -37,29 +49,122 @@ class Terrain:
         
         self.heightsamples = self.height_field_raw
         if self.type=="trimesh":
-            self.vertices, self.triangles = terrain_utils.convert_heightfield_to_trimesh(   self.height_field_raw,
-                                                                                            self.cfg.horizontal_scale,
-                                                                                            self.cfg.vertical_scale,
-                                                                                            self.cfg.slope_treshold)
+            self.vertices, self.triangles = self._convert_to_trimesh()
+        print(f"Terrain of {cfg.num_rows}x{cfg.num_cols} sub-terrains created in {time.time() - start:.2f} s")
     
     def randomized_terrain(self):
+        sub_terrains = []
         for k in range(self.cfg.num_sub_terrains):
             # Env coordinates in the world
             (i, j) = np.unravel_index(k, (self.cfg.num_rows, self.cfg.num_cols))
 
             choice = np.random.uniform(0, 1)
             difficulty = np.random.choice([0.5, 0.75, 0.9])
-            terrain = self.make_terrain(choice, difficulty)
-            self.add_terrain_to_map(terrain, i, j)
+            sub_terrains.append((i, j, choice, difficulty))
+        self._add_sub_terrains(sub_terrains)
         
     def curiculum(self):
+        sub_terrains = []
         for j in range(self.cfg.num_cols):
             for i in range(self.cfg.num_rows):
                 difficulty = i / self.cfg.num_rows
                 choice = j / self.cfg.num_cols + 0.001
+                sub_terrains.append((i, j, choice, difficulty))
+        self._add_sub_terrains(sub_terrains)
+
+    def _add_sub_terrains(self, sub_terrains):
+        """ Generates the sub-terrains and adds them to the map.
+            Every sub-terrain is keyed by its type, difficulty, random seed and scales. The ones found in the cache are
+            loaded, the others are generated in a pool of cfg.num_workers processes and added to the cache.
+
+        Args:
+            sub_terrains (List[Tuple]): (row, col, choice, difficulty) of every sub-terrain
+        """
+        # the seeds are drawn from the global generator, so a seeded run generates the same sub-terrains again
+        seeds = np.random.randint(0, 2**31 - 1, len(sub_terrains))
+        jobs = [(self._terrain_type(choice), difficulty, int(seed)) for (_, _, choice, difficulty), seed in zip(sub_terrains, seeds)]
+        height_fields = [self._load_cached(self._cache_path(job, ".npy")) for job in jobs]
+
+        missing = [k for k, height_field in enumerate(height_fields) if height_field is None]
+        args = [(*jobs[k], self.width_per_env_pixels, self.cfg.horizontal_scale, self.cfg.vertical_scale) for k in missing]
+        num_workers = min(self.cfg.num_workers, len(missing))
+        if num_workers > 1:
+            # spawn, the terrain is built after the sim is created and a forked worker would inherit its CUDA and
+            # PhysX state, make_sub_terrain and its arguments are picklable
+            with mp.get_context("spawn").Pool(num_workers) as pool:
+                generated = pool.starmap(make_sub_terrain, args, chunksize=max(1, len(args) // (4 * num_workers)))
+        else:
+            generated = [make_sub_terrain(*arg) for arg in args]
+        for k, height_field in zip(missing, generated):
+            height_fields[k] = height_field
+            self._save_cached(self._cache_path(jobs[k], ".npy"), height_field)
+
+        for (i, j, _, _), height_field in zip(sub_terrains, height_fields):
+            self.add_terrain_to_map(height_field, i, j)
+        if missing:
+            print(f"Generated {len(missing)} sub-terrains, loaded {len(sub_terrains) - len(missing)} from the cache")
+
+    def _terrain_type(self, choice):
+        """ Maps a choice in [0, 1] to the type of terrain according to cfg.terrain_proportions.
+        """
+        # the types after the last given proportion are never chosen
+        proportions = self.proportions + [self.proportions[-1]] * max(0, 7 - len(self.proportions))
+        if choice < proportions[0]:
+            return "pyramid_slope_down" if choice < proportions[0] / 2 else "pyramid_slope_up"
+        elif choice < proportions[1]:
+            return "rough_slope"
+        elif choice < proportions[3]:
+            return "stairs_down" if choice < proportions[2] else "stairs_up"
+        elif choice < proportions[4]:
+            return "discrete_obstacles"
+        elif choice < proportions[5]:
+            return "stepping_stones"
+        elif choice < proportions[6]:
+            return "gap"
+        else:
+            return "pit"
 
-                terrain = self.make_terrain(choice, difficulty)
-                self.add_terrain_to_map(terrain, i, j)
+    def _cache_path(self, key, extension):
+        if self.cache_dir is None:
+            return None
+        key = (CACHE_VERSION, *key, self.width_per_env_pixels, self.cfg.horizontal_scale, self.cfg.vertical_scale)
+        return os.path.join(self.cache_dir, hashlib.sha1(repr(key).encode()).hexdigest() + extension)
+
+    @staticmethod
+    def _load_cached(path):
+        if path is None or not os.path.isfile(path):
+            return None
+        return np.load(path, allow_pickle=False)
+
+    @staticmethod
+    def _save_cached(path, data):
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write then rename, so that concurrent launches never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            if isinstance(data, dict):
+                np.savez(f, **data)
+            else:
+                np.save(f, data)
+        os.replace(tmp_path, path)
+
+    def _convert_to_trimesh(self):
+        """ Converts the whole heightfield to a triangle mesh, cached by the hash of the heightfield.
+        """
+        digest = hashlib.sha1(self.height_field_raw.tobytes()).hexdigest()
+        path = self._cache_path(("trimesh", digest, self.height_field_raw.shape, self.cfg.slope_treshold), ".npz")
+        cached = self._load_cached(path)
+        if cached is not None:
+            with cached:
+                return cached["vertices"], cached["triangles"]
+        vertices, triangles = terrain_utils.convert_heightfield_to_trimesh(   self.height_field_raw,
+                                                                            self.cfg.horizontal_scale,
+                                                                            self.cfg.vertical_scale,
+                                                                            self.cfg.slope_treshold)
+        self._save_cached(path, {"vertices": vertices, "triangles": triangles})
+        return vertices, triangles
 
     def selected_terrain(self):
         terrain_type = self.cfg.terrain_kwargs.pop('type')
@@ -74,7 +179,7 @@ class Terrain:
                               horizontal_scale=self.horizontal_scale)
 
             eval(terrain_type)(terrain, **self.cfg.terrain_kwargs.terrain_kwargs)
-            self.add_terrain_to_map(terrain, i, j)
+            self.add_terrain_to_map(terrain.height_field_raw, i, j)
     
     def make_terrain(self, choice, difficulty):
         terrain = terrain_utils.SubTerrain(   "terrain",
@@ -82,39 +187,10 @@ class Terrain:
                                 length=self.width_per_env_pixels,
                                 vertical_scale=self.cfg.vertical_scale,
                                 horizontal_scale=self.cfg.horizontal_scale)
-        slope = difficulty * 0.4
-        step_height = 0.05 + 0.18 * difficulty
-        discrete_obstacles_height = 0.05 + difficulty * 0.2
-        stepping_stones_size = 1.5 * (1.05 - difficulty)
-        stone_distance = 0.05 if difficulty==0 else 0.1
-        gap_size = 1. * difficulty
-        pit_depth = 1. * difficulty
-        if choice < self.proportions[0]:
-            if choice < self.proportions[0]/ 2:
-                slope *= -1
-            terrain_utils.pyramid_sloped_terrain(terrain, slope=slope, platform_size=3.)
-        elif choice < self.proportions[1]:
-            terrain_utils.pyramid_sloped_terrain(terrain, slope=slope, platform_size=3.)
-            terrain_utils.random_uniform_terrain(terrain, min_height=-0.05, max_height=0.05, step=0.005, downsampled_scale=0.2)
-        elif choice < self.proportions[3]:
-            if choice<self.proportions[2]:
-                step_height *= -1
-            terrain_utils.pyramid_stairs_terrain(terrain, step_width=0.31, step_height=step_height, platform_size=3.)
-        elif choice < self.proportions[4]:
-            num_rectangles = 20
-            rectangle_min_size = 1.
-            rectangle_max_size = 2.
-            terrain_utils.discrete_obstacles_terrain(terrain, discrete_obstacles_height, rectangle_min_size, rectangle_max_size, num_rectangles, platform_size=3.)
-        elif choice < self.proportions[5]:
-            terrain_utils.stepping_stones_terrain(terrain, stone_size=stepping_stones_size, stone_distance=stone_distance, max_height=0., platform_size=4.)
-        elif choice < self.proportions[6]:
-            gap_terrain(terrain, gap_size=gap_size, platform_size=3.)
-        else:
-            pit_terrain(terrain, depth=pit_depth, platform_size=4.)
-        
+        build_sub_terrain(terrain, self._terrain_type(choice), difficulty)
         return terrain
 
-    def add_terrain_to_map(self, terrain, row, col):
+    def add_terrain_to_map(self, height_field_raw, row, col):
         i = row
         j = col
         # map coordinate system
@@ -122,17 +198,66 @@ class Terrain:
         end_x = self.border + (i + 1) * self.length_per_env_pixels
         start_y = self.border + j * self.width_per_env_pixels
         end_y = self.border + (j + 1) * self.width_per_env_pixels
-        self.height_field_raw[start_x: end_x, start_y:end_y] = terrain.height_field_raw
+        self.height_field_raw[start_x: end_x, start_y:end_y] = height_field_raw
 
         env_origin_x = (i + 0.5) * self.env_length
         env_origin_y = (j + 0.5) * self.env_width
-        x1 = int((self.env_length/2. - 1) / terrain.horizontal_scale)
-        x2 = int((self.env_length/2. + 1) / terrain.horizontal_scale)
-        y1 = int((self.env_width/2. - 1) / terrain.horizontal_scale)
-        y2 = int((self.env_width/2. + 1) / terrain.horizontal_scale)
-        env_origin_z = np.max(terrain.height_field_raw[x1:x2, y1:y2])*terrain.vertical_scale
+        x1 = int((self.env_length/2. - 1) / self.cfg.horizontal_scale)
+        x2 = int((self.env_length/2. + 1) / self.cfg.horizontal_scale)
+        y1 = int((self.env_width/2. - 1) / self.cfg.horizontal_scale)
+        y2 = int((self.env_width/2. + 1) / self.cfg.horizontal_scale)
+        env_origin_z = np.max(height_field_raw[x1:x2, y1:y2])*self.cfg.vertical_scale
         self.env_origins[i, j] = [env_origin_x, env_origin_y, env_origin_z]
 
+TERRAIN_TYPES = ("pyramid_slope_down", "pyramid_slope_up", "rough_slope", "stairs_down", "stairs_up",
+                 "discrete_obstacles", "stepping_stones", "gap", "pit")
+
+def build_sub_terrain(terrain, terrain_type, difficulty):
+    slope = difficulty * 0.4
+    step_height = 0.05 + 0.18 * difficulty
+    discrete_obstacles_height = 0.05 + difficulty * 0.2
+    stepping_stones_size = 1.5 * (1.05 - difficulty)
+    stone_distance = 0.05 if difficulty==0 else 0.1
+    gap_size = 1. * difficulty
+    pit_depth = 1. * difficulty
+    if terrain_type in ["pyramid_slope_down", "pyramid_slope_up"]:
+        if terrain_type == "pyramid_slope_down":
+            slope *= -1
+        terrain_utils.pyramid_sloped_terrain(terrain, slope=slope, platform_size=3.)
+    elif terrain_type == "rough_slope":
+        terrain_utils.pyramid_sloped_terrain(terrain, slope=slope, platform_size=3.)
+        terrain_utils.random_uniform_terrain(terrain, min_height=-0.05, max_height=0.05, step=0.005, downsampled_scale=0.2)
+    elif terrain_type in ["stairs_down", "stairs_up"]:
+        if terrain_type == "stairs_down":
+            step_height *= -1
+        terrain_utils.pyramid_stairs_terrain(terrain, step_width=0.31, step_height=step_height, platform_size=3.)
+    elif terrain_type == "discrete_obstacles":
+        num_rectangles = 20
+        rectangle_min_size = 1.
+        rectangle_max_size = 2.
+        terrain_utils.discrete_obstacles_terrain(terrain, discrete_obstacles_height, rectangle_min_size, rectangle_max_size, num_rectangles, platform_size=3.)
+    elif terrain_type == "stepping_stones":
+        terrain_utils.stepping_stones_terrain(terrain, stone_size=stepping_stones_size, stone_distance=stone_distance, max_height=0., platform_size=4.)
+    elif terrain_type == "gap":
+        gap_terrain(terrain, gap_size=gap_size, platform_size=3.)
+    elif terrain_type == "pit":
+        pit_terrain(terrain, depth=pit_depth, platform_size=4.)
+    else:
+        raise ValueError(f"Unknown terrain type '{terrain_type}', expected one of {TERRAIN_TYPES}")
+
+def make_sub_terrain(terrain_type, difficulty, seed, width, horizontal_scale, vertical_scale):
+    """ Generates the heightfield of one sub-terrain, with its own random seed so that it does not depend on the
+        process or on the order it is generated in.
+    """
+    np.random.seed(seed)
+    terrain = terrain_utils.SubTerrain(   "terrain",
+                            width=width,
+                            length=width,
+                            vertical_scale=vertical_scale,
+                            horizontal_scale=horizontal_scale)
+    build_sub_terrain(terrain, terrain_type, difficulty)
+    return terrain.height_field_raw.astype(np.int16)
+
 def gap_terrain(terrain, gap_size, platform_size=1.):
     gap_size = int(gap_size / terrain.horizontal_scale)
     platform_size = int(platform_size / terrain.horizontal_scale)